@@ -0,0 +1,92 @@
+"""Measures the cost of hydrating submissions and reading their tracked state, both
+the time per attribute access and the memory used per entity. Also counts the
+submissions that created a __dict__, which should never happen since every field is
+in a slot.
+
+    python -m benchmarks.entity_hydration [submissions] [rounds]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from bevy import Context
+
+from soc.database.models.submissions import SubmissionModel
+from soc.entities.submissions import Status, Submission, SubmissionStatus
+
+
+def has_instance_dict(submission: Submission) -> bool:
+    """Checks whether the submission created its __dict__ without creating it."""
+    slots = [getattr(submission, slot) for slot in Submission.__slots__]
+    return any(
+        type(referent) is dict and all(referent is not value for value in slots)
+        for referent in gc.get_referents(submission)
+    )
+
+
+def main(num_submissions: int = 10_000, rounds: int = 20):
+    submission_type = Context.factory().bind(Submission)
+    now = datetime.utcnow()
+    models = [
+        SubmissionModel(
+            id=i,
+            type="code",
+            link="https://beginner.codes",
+            description="Hello",
+            description_html="<p>Hello</p>",
+            user_id=i,
+            challenge_id=1,
+            created=now,
+        )
+        for i in range(num_submissions)
+    ]
+    statuses = [
+        SubmissionStatus(Status.CREATED, i, i, i, now) for i in range(len(models))
+    ]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    baseline = tracemalloc.get_traced_memory()[0]
+    submissions = [
+        submission_type.from_db_model(model, status, {})
+        for model, status in zip(models, statuses)
+    ]
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(
+        f"hydrate {num_submissions} submissions: {elapsed * 1000:.2f}ms, "
+        f"{used / num_submissions:.0f} bytes per submission"
+    )
+
+    reads = [
+        ("description", lambda submission: submission.description),
+        ("status", lambda submission: submission.status),
+        ("changed", lambda submission: submission.changed),
+    ]
+    for name, read in reads:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for submission in submissions:
+                read(submission)
+
+        elapsed = time.perf_counter() - start
+        print(f"read {name}: {elapsed / (rounds * num_submissions) * 1e9:.0f}ns")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for submission in submissions:
+            submission.description = "Changed"
+
+    elapsed = time.perf_counter() - start
+    print(f"write description: {elapsed / (rounds * num_submissions) * 1e9:.0f}ns")
+    print(
+        f"instance dicts created: {sum(map(has_instance_dict, submissions))}, "
+        f"{sys.getsizeof(submissions[0])} bytes per instance"
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
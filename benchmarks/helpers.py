@@ -0,0 +1,45 @@
+import os
+import statistics
+import tempfile
+from types import SimpleNamespace
+
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+from soc.events import Events
+
+
+async def create_context() -> Context:
+    """Creates a context with a fresh database. The database is a temporary SQLite
+    file unless SOC_BENCH_DATABASE_URI is set."""
+    uri = os.environ.get("SOC_BENCH_DATABASE_URI")
+    if not uri:
+        uri = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.sqlite"
+
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri=uri), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.drop_all)
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    context.create(Events, cache=True)
+    return context
+
+
+def report(name: str, timings: list[float]):
+    """Prints the latency percentiles of the timings, given in seconds."""
+    timings = sorted(timings)
+    percentile = lambda p: timings[min(len(timings) - 1, int(len(timings) * p))]
+    print(
+        f"{name}: n={len(timings)} "
+        f"mean={statistics.mean(timings) * 1000:.2f}ms "
+        f"p50={percentile(0.5) * 1000:.2f}ms "
+        f"p95={percentile(0.95) * 1000:.2f}ms "
+        f"p99={percentile(0.99) * 1000:.2f}ms "
+        f"max={timings[-1] * 1000:.2f}ms"
+    )
@@ -0,0 +1,57 @@
+"""Compares serializing submissions one awaitable at a time with resolving them
+concurrently. The submissions aren't hydrated, so every submission needs its vote
+counts and author loaded from the database.
+
+    python -m benchmarks.serialization_latency [submissions] [rounds] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from benchmarks.helpers import create_context, report
+from soc.config.models.serialization import SerializationSettings
+from soc.database import Database
+from soc.serialization import Serializer
+
+
+async def main(num_submissions: int = 50, rounds: int = 20, concurrency: int = 8):
+    context = await create_context()
+    db = context.get(Database)
+    author = await db.users.create("Author", "", "author@beginner.codes")
+    users = [
+        await db.users.create(f"User {i}", "", f"user{i}@beginner.codes")
+        for i in range(num_submissions)
+    ]
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), author
+    )
+    for user in users:
+        submission = await db.challenges.create_submission(
+            "code", "https://beginner.codes", "*Hello*", challenge, user
+        )
+        await db.challenges.add_vote_to_submission(submission, author, "emoji-cat")
+
+    for name, limit in [
+        ("sequential", 1),
+        (f"concurrent ({concurrency})", concurrency),
+    ]:
+        branch = context.branch()
+        branch.add(SimpleNamespace(concurrency=limit), use_as=SerializationSettings)
+        serializer = branch.get(Serializer)
+        timings = []
+        for _ in range(rounds):
+            submissions = await branch.get(Database).challenges.get_submissions(
+                challenge.id
+            )
+            start = time.perf_counter()
+            await serializer.serialize(submissions, expand_user=True)
+            timings.append(time.perf_counter() - start)
+
+        report(f"serialize {num_submissions} submissions {name}", timings)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*map(int, sys.argv[1:])))
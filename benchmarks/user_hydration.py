@@ -0,0 +1,73 @@
+"""Compares creating users from database rows with & without pydantic validation,
+then measures loading every user from the database.
+
+    python -m benchmarks.user_hydration [users] [rounds]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.helpers import create_context, report
+from soc.database import Database
+from soc.database.models.users import UserModel
+from soc.entities.users import User
+
+
+async def main(num_users: int = 50_000, rounds: int = 5):
+    context = await create_context()
+    rows = [
+        {
+            "username": f"User {i}",
+            "email": f"user{i}@beginner.codes",
+            "password": "",
+            "joined": datetime.utcnow(),
+            "banned": False,
+        }
+        for i in range(num_users)
+    ]
+    async with context.get(AsyncEngine).begin() as conn:
+        await conn.execute(UserModel.__table__.insert(), rows)
+
+    user_type = context.bind(User)
+    models = [UserModel(id=i, **row) for i, row in enumerate(rows, start=1)]
+    hydrators = [
+        ("validated", lambda model: user_type(**_fields(model))),
+        ("from_db_model", user_type.from_db_model),
+    ]
+    for name, hydrate in hydrators:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for model in models:
+                hydrate(model)
+
+            timings.append(time.perf_counter() - start)
+
+        report(f"hydrate {num_users} users {name}", timings)
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await context.get(Database).users.get_all()
+        timings.append(time.perf_counter() - start)
+
+    report(f"users.get_all with {num_users} users", timings)
+
+
+def _fields(model: UserModel):
+    return {
+        "id": model.id,
+        "username": model.username,
+        "email": model.email,
+        "password": model.password,
+        "avatar": model.avatar,
+        "joined": model.joined,
+        "banned": model.banned,
+    }
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*map(int, sys.argv[1:])))
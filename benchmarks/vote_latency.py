@@ -0,0 +1,77 @@
+"""Measures vote latency when many users click the same vote buttons at once.
+Every user double clicks each emoji, so half of the votes are duplicates that
+must be ignored.
+
+    python -m benchmarks.vote_latency [users] [submissions] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.future import select
+
+from benchmarks.helpers import create_context, report
+from soc.database import Database
+from soc.database.models.votes import VoteModel
+
+EMOJI = ["emoji-cat", "emoji-dog", "emoji-fire"]
+
+
+async def main(num_users: int = 50, num_submissions: int = 10, concurrency: int = 20):
+    context = await create_context()
+    db = context.get(Database)
+    author = await db.users.create("Author", "", "author@beginner.codes")
+    users = [
+        await db.users.create(f"User {i}", "", f"user{i}@beginner.codes")
+        for i in range(num_users)
+    ]
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), author
+    )
+    submissions = [
+        await db.challenges.create_submission(
+            "code", "https://beginner.codes", "", challenge, author
+        )
+        for _ in range(num_submissions)
+    ]
+
+    clicks = [
+        (submission, user, emoji)
+        for user in users
+        for submission in submissions
+        for emoji in EMOJI
+        for _ in range(2)
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def click(submission, user, emoji):
+        async with semaphore:
+            start = time.perf_counter()
+            await context.get(Database).challenges.add_vote_to_submission(
+                submission, user, emoji
+            )
+            timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(click(*args) for args in clicks))
+    elapsed = time.perf_counter() - start
+
+    async with context.get(AsyncEngine).connect() as conn:
+        votes = (await conn.execute(select(func.count(VoteModel.id)))).scalar()
+
+    report("add_vote_to_submission", timings)
+    print(
+        f"{len(clicks)} clicks in {elapsed:.2f}s ({len(clicks) / elapsed:.0f}/s), "
+        f"{votes} votes stored, {len(clicks) // 2} expected"
+    )
+    counts = await db.challenges.get_submission_vote_counts(submissions[0])
+    print(f"Vote counts for the first submission: {counts}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,75 @@
+"""Add indexes for hot queries
+
+Revision ID: 259c0c6284ea
+Revises: eb4c6289ac76
+Create Date: 2026-10-18 11:26:50.914372
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "259c0c6284ea"
+down_revision = "eb4c6289ac76"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Duplicate votes have to go before the unique index can be created, the vote
+    # counters are then rebuilt so they match what remains
+    op.execute(
+        """
+        DELETE FROM "Votes" WHERE id NOT IN (
+            SELECT MIN(id) FROM "Votes" GROUP BY submission, user_id, emoji
+        )
+        """
+    )
+    op.execute('DELETE FROM "VoteCounts"')
+    op.execute(
+        """
+        INSERT INTO "VoteCounts" (submission_id, emoji, votes)
+        SELECT submission, emoji, COUNT(*) FROM "Votes"
+        WHERE submission IS NOT NULL
+        GROUP BY submission, emoji
+        """
+    )
+    op.execute('DELETE FROM "VoteTotals"')
+    op.execute(
+        """
+        INSERT INTO "VoteTotals" (challenge_id, user_id, votes)
+        SELECT s.challenge_id, s.user_id, COUNT(*) FROM "Votes" v
+        JOIN "Submissions" s ON s.id = v.submission
+        WHERE s.challenge_id IS NOT NULL AND s.user_id IS NOT NULL
+        GROUP BY s.challenge_id, s.user_id
+        """
+    )
+
+    op.create_index(
+        "ix_Votes_submission_user_id_emoji",
+        "Votes",
+        ["submission", "user_id", "emoji"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_SubmissionStatusModel_submission_id_updated",
+        "SubmissionStatusModel",
+        ["submission_id", "updated"],
+    )
+    op.create_index("ix_Challenges_start_end", "Challenges", ["start", "end"])
+    op.create_index("ix_Roles_user_id", "Roles", ["user_id"])
+    op.create_index("ix_Settings_name", "Settings", ["name"])
+    op.create_index("ix_Users_username", "Users", ["username"])
+
+
+def downgrade():
+    op.drop_index("ix_Users_username", table_name="Users")
+    op.drop_index("ix_Settings_name", table_name="Settings")
+    op.drop_index("ix_Roles_user_id", table_name="Roles")
+    op.drop_index("ix_Challenges_start_end", table_name="Challenges")
+    op.drop_index(
+        "ix_SubmissionStatusModel_submission_id_updated",
+        table_name="SubmissionStatusModel",
+    )
+    op.drop_index("ix_Votes_submission_user_id_emoji", table_name="Votes")
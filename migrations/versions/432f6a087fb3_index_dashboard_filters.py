@@ -0,0 +1,26 @@
+"""Index dashboard filters
+
+Revision ID: 432f6a087fb3
+Revises: c41e7a9b2d5f
+Create Date: 2026-10-18 16:42:09.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "432f6a087fb3"
+down_revision = "c41e7a9b2d5f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_Users_banned_id", "Users", ["banned", "id"])
+    op.create_index("ix_Roles_type_user_id", "Roles", ["type", "user_id"])
+
+
+def downgrade():
+    op.drop_index("ix_Roles_type_user_id", table_name="Roles")
+    op.drop_index("ix_Users_banned_id", table_name="Users")
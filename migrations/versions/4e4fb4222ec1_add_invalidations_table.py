@@ -0,0 +1,39 @@
+"""Add invalidations table
+
+Revision ID: 4e4fb4222ec1
+Revises: e16cf7e622bc
+Create Date: 2026-10-18 19:26:40.803517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4e4fb4222ec1"
+down_revision = "e16cf7e622bc"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "Invalidations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.Unicode(length=1024), nullable=False),
+        sa.Column(
+            "created",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_Invalidations_created"), "Invalidations", ["created"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_Invalidations_created"), table_name="Invalidations")
+    op.drop_table("Invalidations")
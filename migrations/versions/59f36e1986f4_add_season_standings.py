@@ -0,0 +1,63 @@
+"""Add season standings
+
+Revision ID: 59f36e1986f4
+Revises: 8ebb069f0850
+Create Date: 2026-10-18 13:52:44.610293
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "59f36e1986f4"
+down_revision = "8ebb069f0850"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "StandingSnapshots",
+        sa.Column("challenge_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("votes", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["challenge_id"], ["Challenges.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["Users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("challenge_id", "user_id"),
+    )
+    op.create_table(
+        "SeasonStandings",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("votes", sa.Integer(), nullable=False),
+        sa.Column("challenges", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["Users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index("ix_SeasonStandings_votes", "SeasonStandings", ["votes"])
+
+    # Challenges that have already ended are frozen by the site once it starts
+    with op.batch_alter_table("Challenges") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "standings_frozen",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.false(),
+            )
+        )
+        batch_op.create_index(
+            "ix_Challenges_standings_frozen_end", ["standings_frozen", "end"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("Challenges") as batch_op:
+        batch_op.drop_index("ix_Challenges_standings_frozen_end")
+        batch_op.drop_column("standings_frozen")
+
+    op.drop_index("ix_SeasonStandings_votes", table_name="SeasonStandings")
+    op.drop_table("SeasonStandings")
+    op.drop_table("StandingSnapshots")
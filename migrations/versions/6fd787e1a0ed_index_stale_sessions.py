@@ -0,0 +1,24 @@
+"""Index stale sessions
+
+Revision ID: 6fd787e1a0ed
+Revises: 4e4fb4222ec1
+Create Date: 2026-10-18 20:12:33.615092
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "6fd787e1a0ed"
+down_revision = "4e4fb4222ec1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_Sessions_user_id_created", "Sessions", ["user_id", "created"])
+
+
+def downgrade():
+    op.drop_index("ix_Sessions_user_id_created", table_name="Sessions")
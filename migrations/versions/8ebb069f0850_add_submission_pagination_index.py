@@ -0,0 +1,28 @@
+"""Add submission pagination index
+
+Revision ID: 8ebb069f0850
+Revises: 259c0c6284ea
+Create Date: 2026-10-18 12:41:07.218336
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8ebb069f0850"
+down_revision = "259c0c6284ea"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_Submissions_challenge_id_created_id",
+        "Submissions",
+        ["challenge_id", "created", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_Submissions_challenge_id_created_id", table_name="Submissions")
@@ -0,0 +1,36 @@
+"""Store rendered descriptions
+
+Revision ID: c41e7a9b2d5f
+Revises: 59f36e1986f4
+Create Date: 2026-10-18 15:07:21.384017
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c41e7a9b2d5f"
+down_revision = "59f36e1986f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The descriptions are rendered in batches by the site when it starts, rows that
+    # haven't been rendered yet are rendered when they're read
+    for table_name in ("Challenges", "Submissions"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(
+                sa.Column("description_html", sa.Unicode(), nullable=True)
+            )
+            batch_op.add_column(
+                sa.Column("markdown_version", sa.Unicode(length=32), nullable=True)
+            )
+
+
+def downgrade():
+    for table_name in ("Challenges", "Submissions"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("markdown_version")
+            batch_op.drop_column("description_html")
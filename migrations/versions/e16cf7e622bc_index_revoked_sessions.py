@@ -0,0 +1,24 @@
+"""Index revoked sessions
+
+Revision ID: e16cf7e622bc
+Revises: 432f6a087fb3
+Create Date: 2026-10-18 18:03:51.274930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e16cf7e622bc"
+down_revision = "432f6a087fb3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_Sessions_revoked_created", "Sessions", ["revoked", "created"])
+
+
+def downgrade():
+    op.drop_index("ix_Sessions_revoked_created", table_name="Sessions")
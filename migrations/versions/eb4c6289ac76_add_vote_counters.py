@@ -0,0 +1,64 @@
+"""Add vote counters
+
+Revision ID: eb4c6289ac76
+Revises: fa864aaacb0f
+Create Date: 2026-10-18 10:03:17.540219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "eb4c6289ac76"
+down_revision = "fa864aaacb0f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "VoteCounts",
+        sa.Column("submission_id", sa.Integer(), nullable=False),
+        sa.Column("emoji", sa.Unicode(length=128), nullable=False),
+        sa.Column("votes", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["submission_id"], ["Submissions.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("submission_id", "emoji"),
+    )
+    op.create_table(
+        "VoteTotals",
+        sa.Column("challenge_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("votes", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["challenge_id"], ["Challenges.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["Users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("challenge_id", "user_id"),
+    )
+
+    # Backfill the counters from the existing votes
+    op.execute(
+        """
+        INSERT INTO "VoteCounts" (submission_id, emoji, votes)
+        SELECT submission, emoji, COUNT(*) FROM "Votes"
+        WHERE submission IS NOT NULL
+        GROUP BY submission, emoji
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO "VoteTotals" (challenge_id, user_id, votes)
+        SELECT s.challenge_id, s.user_id, COUNT(*) FROM "Votes" v
+        JOIN "Submissions" s ON s.id = v.submission
+        WHERE s.challenge_id IS NOT NULL AND s.user_id IS NOT NULL
+        GROUP BY s.challenge_id, s.user_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("VoteTotals")
+    op.drop_table("VoteCounts")
@@ -0,0 +1,84 @@
+"""Denormalize the current submission status
+
+Revision ID: fa864aaacb0f
+Revises: df6f2bf16b39
+Create Date: 2026-10-18 09:12:41.208113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "fa864aaacb0f"
+down_revision = "df6f2bf16b39"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("Submissions") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "created",
+                sa.DateTime(),
+                server_default=sa.text("(CURRENT_TIMESTAMP)"),
+                nullable=True,
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "status",
+                sa.Unicode(length=32),
+                server_default="NONE",
+                nullable=False,
+            )
+        )
+        batch_op.add_column(sa.Column("status_id", sa.Integer(), nullable=True))
+        batch_op.create_index(
+            "ix_Submissions_challenge_id_status", ["challenge_id", "status"]
+        )
+
+    # Backfill the projection from the existing status history
+    op.execute(
+        """
+        UPDATE "Submissions"
+        SET status_id = (
+            SELECT s.id FROM "SubmissionStatusModel" s
+            WHERE s.submission_id = "Submissions".id
+            ORDER BY s.updated DESC, s.id DESC
+            LIMIT 1
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE "Submissions"
+        SET status = (
+            SELECT s.status FROM "SubmissionStatusModel" s
+            WHERE s.id = "Submissions".status_id
+        )
+        WHERE status_id IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        UPDATE "Submissions"
+        SET created = (
+            SELECT MIN(s.updated) FROM "SubmissionStatusModel" s
+            WHERE s.submission_id = "Submissions".id AND s.status = 'CREATED'
+        )
+        WHERE EXISTS (
+            SELECT 1 FROM "SubmissionStatusModel" s
+            WHERE s.submission_id = "Submissions".id AND s.status = 'CREATED'
+        )
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("Submissions") as batch_op:
+        batch_op.drop_index("ix_Submissions_challenge_id_status")
+        batch_op.drop_column("status_id")
+        batch_op.drop_column("status")
+        batch_op.drop_column("created")
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from soc.auth_helpers import bearer_token, require_roles, validate_bearer_token
 from soc.context import create_app, inject
 from soc.database import Database
+from soc.database.session_cache import SessionCache
 from soc.database.settings import Settings
 from soc.discord import Discord
 from soc.entities.sessions import Session
@@ -92,6 +93,14 @@ async def update_submission_status(
     )
 
 
+@admin_api.get(
+    "/metrics/session-cache",
+    dependencies=[Depends(validate_bearer_token), Depends(require_roles("ADMIN"))],
+)
+async def get_session_cache_metrics(cache: SessionCache = inject(SessionCache)):
+    return cache.metrics
+
+
 def _run_alembic() -> (str, bool):
     process = subprocess.Popen(
         ["alembic", "upgrade", "head"], stdout=subprocess.PIPE, stderr=subprocess.PIPE
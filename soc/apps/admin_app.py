@@ -1,6 +1,6 @@
 from typing import Any
 
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncEngine
 
@@ -16,6 +16,8 @@ from soc.controllers.authentication import Authentication
 from soc.database import Database
 from soc.database.models.base import BaseModel
 from soc.database.settings import Settings
+from soc.entities.submissions import Status
+from soc.serialization import Serializer
 from soc.templates.jinja import Jinja2
 from soc.templates.response import TemplateResponse
 
@@ -30,11 +32,17 @@ admin_app.mount("/api/v1", admin_api)
     dependencies=[Depends(require_roles("ADMIN", "MOD"))],
 )
 async def dashboard(
-    page: int = Query(1, gt=0),
-    num: int = Query(25, gt=0),
+    cursor: str | None = None,
+    num: int = Query(25, gt=0, le=100),
+    banned: bool | None = None,
+    role: str | None = None,
     db: Database = inject(Database),
 ):
-    start = (page - 1) * num
+    try:
+        page = await db.users.get_page(cursor, num, banned=banned, role=role)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
     scope = {
         "users": [
             {
@@ -43,8 +51,13 @@ async def dashboard(
                 "roles": await user.get_roles(),
                 "banned": user.banned,
             }
-            for user in await db.users.get_all(start, num)
-        ]
+            for user in page.users
+        ],
+        "next_cursor": page.next_cursor,
+        "total": page.total,
+        "num": num,
+        "banned": banned,
+        "role": role,
     }
     return "admin/dashboard.html", scope
 
@@ -70,10 +83,9 @@ async def manage_db(session: dict[str, Any] = Depends(session_cookie)):
     ],
 )
 async def challenges(db: Database = inject(Database)):
+    summaries = await db.challenges.get_summaries()
     return "admin/challenges.html", {
-        "challenges": [
-            await challenge.to_dict() for challenge in await db.challenges.get_all()
-        ]
+        "challenges": [challenge.to_dict() for challenge in summaries]
     }
 
 
@@ -95,11 +107,53 @@ async def create_challenge(db: Database = inject(Database)):
     ],
     name="admin-view-challenge",
 )
-async def show_challenge(challenge_id: int, db: Database = inject(Database)):
+async def show_challenge(
+    challenge_id: int,
+    status: Status | None = None,
+    db: Database = inject(Database),
+):
+    challenge = await db.challenges.get(challenge_id)
+    page = await db.challenges.get_submission_page(challenge, status=status)
     return "admin/challenge.html", {
-        "challenge": await (await db.challenges.get(challenge_id)).to_dict(
-            expand_submissions=True
+        "challenge": await challenge.to_dict(
+            expand_submissions=True, include_voters=False
+        ),
+        "next_cursor": page.next_cursor,
+        "status": status,
+    }
+
+
+@admin_app.get(
+    "/challenges/{challenge_id}/submissions",
+    response_class=TemplateResponse,
+    dependencies=[
+        Depends(validate_session_cookie),
+        Depends(require_roles("ADMIN", "MOD")),
+    ],
+)
+async def show_submissions_page(
+    challenge_id: int,
+    cursor: str,
+    status: Status | None = None,
+    db: Database = inject(Database),
+    serializer: Serializer = inject(Serializer),
+):
+    try:
+        page = await db.challenges.get_submission_page(
+            challenge_id, cursor, status=status
         )
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+    return "admin/submission-rows.html", {
+        "challenge": {
+            "id": challenge_id,
+            "submissions": await serializer.serialize(
+                page.submissions, expand_user=True
+            ),
+        },
+        "next_cursor": page.next_cursor,
+        "status": status,
     }
 
 
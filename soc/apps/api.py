@@ -1,13 +1,19 @@
-from fastapi import Depends, Form, HTTPException
+import dataclasses
+from typing import Literal
+
+from fastapi import Depends, Form, HTTPException, Query
 from fastapi.security import OAuth2PasswordRequestForm
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
 
 from soc.auth_helpers import bearer_token, validate_bearer_token
 from soc.context import create_app, inject
 from soc.controllers.authentication import Authentication
 from soc.database import Database
 from soc.entities.sessions import Session
+from soc.entities.submissions import Status
 from soc.rate_limiting import RateLimitMiddleware
+from soc.serialization import Serializer
+from soc.vote_buffer import VoteBuffer
 
 api_app = create_app()
 api_app.middleware("http")(RateLimitMiddleware(api_app))
@@ -25,10 +31,32 @@ async def register_user(
 
 @api_app.get("/challenges", dependencies=[Depends(validate_bearer_token)])
 async def get_challenges(db: Database = inject(Database)):
+    summaries = await db.challenges.get_summaries()
+    return {"challenges": [challenge.to_dict() for challenge in summaries]}
+
+
+@api_app.get(
+    "/challenges/{challenge_id}/submissions",
+    dependencies=[Depends(validate_bearer_token)],
+)
+async def get_submissions(
+    challenge_id: int,
+    cursor: str | None = None,
+    limit: int = Query(20, gt=0, le=100),
+    status: Status | None = None,
+    db: Database = inject(Database),
+    serializer: Serializer = inject(Serializer),
+):
+    try:
+        page = await db.challenges.get_submission_page(
+            challenge_id, cursor, limit, status=status
+        )
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
     return {
-        "challenges": [
-            await challenge.to_dict() for challenge in await db.challenges.get_all()
-        ]
+        "submissions": await serializer.serialize(page.submissions),
+        "next_cursor": page.next_cursor,
     }
 
 
@@ -77,7 +105,23 @@ async def add_vote(
     vote: VotePayload,
     session: Session = Depends(bearer_token),
     db: Database = inject(Database),
+    vote_buffer: VoteBuffer = inject(VoteBuffer),
 ):
+    if vote_buffer.enabled:
+        try:
+            await db.challenges.check_votes(session.user_id, [submission_id])
+        except ValueError as exc:
+            raise HTTPException(400, str(exc))
+
+        vote_buffer.add(submission_id, session.user_id, vote.emoji)
+        return
+
+    if await db.challenges.add_vote_to_submission(
+        submission_id, session.user_id, vote.emoji
+    ):
+        return
+
+    # Nothing was added, find out why
     submission = await db.challenges.get_submission(submission_id)
     if not submission:
         raise HTTPException(400, f"No such submission")
@@ -85,8 +129,6 @@ async def add_vote(
     if session.user_id == submission.user_id:
         raise HTTPException(400, "You cannot vote for your own submissions.")
 
-    await submission.add_vote(session.user_id, vote.emoji)
-
 
 @api_app.delete(
     "/challenges/{challenge_id}/submissions/{submission_id}/vote",
@@ -97,7 +139,17 @@ async def delete_vote(
     vote: VotePayload,
     session: Session = Depends(bearer_token),
     db: Database = inject(Database),
+    vote_buffer: VoteBuffer = inject(VoteBuffer),
 ):
+    if vote_buffer.enabled:
+        try:
+            await db.challenges.check_votes(session.user_id, [submission_id])
+        except ValueError as exc:
+            raise HTTPException(400, str(exc))
+
+        vote_buffer.remove(submission_id, session.user_id, vote.emoji)
+        return
+
     submission = await db.challenges.get_submission(submission_id)
     if not submission:
         raise HTTPException(400, f"No such submission")
@@ -105,12 +157,67 @@ async def delete_vote(
     await submission.remove_vote(session.user_id, vote.emoji)
 
 
+class BatchVoteOperation(BaseModel):
+    submission_id: int
+    emoji: str
+    op: Literal["add", "remove"]
+
+
+class BatchVotePayload(BaseModel):
+    votes: conlist(BatchVoteOperation, min_items=1, max_items=100)
+
+
+@api_app.post("/votes/batch", dependencies=[Depends(validate_bearer_token)])
+async def apply_votes(
+    batch: BatchVotePayload,
+    session: Session = Depends(bearer_token),
+    db: Database = inject(Database),
+    vote_buffer: VoteBuffer = inject(VoteBuffer),
+):
+    # Later operations on the same submission & emoji replace earlier ones
+    votes = {(vote.submission_id, vote.emoji): vote.op == "add" for vote in batch.votes}
+    if vote_buffer.enabled:
+        try:
+            await db.challenges.check_votes(
+                session.user_id, {submission_id for submission_id, _ in votes}
+            )
+        except ValueError as exc:
+            raise HTTPException(400, str(exc))
+
+        for (submission_id, emoji), add in votes.items():
+            if add:
+                vote_buffer.add(submission_id, session.user_id, emoji)
+            else:
+                vote_buffer.remove(submission_id, session.user_id, emoji)
+
+        return {"queued": len(votes)}
+
+    try:
+        added, removed = await db.challenges.apply_votes(session.user_id, votes)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+
+    return {"added": added, "removed": removed}
+
+
 @api_app.get("/challenges/active", dependencies=[Depends(validate_bearer_token)])
 async def get_active_challenge(db: Database = inject(Database)):
     active_challenge = await db.challenges.get_active()
     return {"challenge": await active_challenge.to_dict() if active_challenge else None}
 
 
+@api_app.get("/standings", dependencies=[Depends(validate_bearer_token)])
+async def get_season_standings(
+    limit: int = Query(10, gt=0, le=100), db: Database = inject(Database)
+):
+    return {
+        "standings": [
+            dataclasses.asdict(standing)
+            for standing in await db.standings.get_season(limit)
+        ]
+    }
+
+
 @api_app.post("/authenticate")
 async def authenticate_user(
     data: OAuth2PasswordRequestForm = Depends(),
@@ -1,7 +1,9 @@
+import asyncio
 from collections import defaultdict
+from datetime import datetime, timedelta
 
 from bevy import Context
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.ext.asyncio import AsyncEngine
@@ -11,13 +13,27 @@ from soc.apps.admin_app import admin_app
 from soc.apps.api import api_app
 from soc.apps.auth import auth_app
 from soc.auth_helpers import session_cookie
+from soc.config.models.authentication import AuthenticationSettings
 from soc.context import create_app, create_context, inject
 from soc.database import Database
+from soc.database.challenge_cache import ChallengeCache
+from soc.database.revoked_sessions import RevokedSessions
+from soc.database.role_cache import RoleCache
+from soc.database.session_cache import SessionCache
+from soc.database.settings_cache import SettingsCache
+from soc.database.standings_cache import StandingsCache
 from soc.emoji import Emoji
 from soc.entities.sessions import Session
+from soc.entities.submissions import Status
 from soc.events import Events
+from soc.invalidation import InvalidationBus
+from soc.leaderboard import Leaderboards
+from soc.season import SeasonStandings
+from soc.serialization import Serializer
+from soc.session_compaction import SessionCompactor
 from soc.templates.jinja import Jinja2
 from soc.templates.response import TemplateResponse
+from soc.vote_buffer import VoteBuffer
 
 
 site = create_app()
@@ -33,33 +49,133 @@ async def on_start():
     context.create(Announcements, cache=True)
     context.create(AsyncEngine, cache=True)
     context.create(Events, cache=True)
+    context.create(ChallengeCache, cache=True)
+    context.create(RoleCache, cache=True)
+    context.create(SessionCache, cache=True)
+    context.create(RevokedSessions, cache=True)
+    context.create(Leaderboards, cache=True)
+    context.create(VoteBuffer, cache=True)
+    context.create(SeasonStandings, cache=True)
+    context.create(Serializer, cache=True)
+    context.create(SettingsCache, cache=True)
+    context.create(StandingsCache, cache=True)
+    context.create(SessionCompactor, cache=True)
     context.add(site, use_as=FastAPI)
+    await _start_invalidation_bus(context)
+    site.state.rerender_task = asyncio.create_task(
+        _rerender_markdown(context.get(Database))
+    )
+    site.state.revoked_sessions_task = asyncio.create_task(
+        _load_revoked_sessions(
+            context.get(Database),
+            context.get(RevokedSessions),
+            context.get(AuthenticationSettings),
+        )
+    )
+
+
+async def _start_invalidation_bus(context: Context):
+    """Drops the changes made by the other replicas from this replica's caches. The
+    changes missed while the bus was disconnected aren't known, so everything is
+    dropped when it reconnects."""
+    bus = context.get(InvalidationBus)
+    revoked_sessions = context.get(RevokedSessions)
+    session_cache = context.get(SessionCache)
+    bus.on("challenges", context.get(ChallengeCache).invalidate)
+    bus.on("roles", context.get(RoleCache).invalidate)
+    bus.on("sessions", session_cache.invalidate)
+    bus.on("revoked_sessions", revoked_sessions.add)
+    bus.on("revoked_sessions", session_cache.invalidate)
+    bus.on("settings", context.get(SettingsCache).invalidate)
+    bus.on("standings", context.get(StandingsCache).invalidate)
+    bus.on("votes", context.get(Leaderboards).on_remote_votes_changed)
+    bus.on_reset(context.get(ChallengeCache).invalidate)
+    bus.on_reset(context.get(RoleCache).clear)
+    bus.on_reset(session_cache.clear)
+    bus.on_reset(context.get(SettingsCache).clear)
+    bus.on_reset(context.get(StandingsCache).invalidate)
+    bus.on_reset(context.get(Leaderboards).reconcile)
+    bus.on_reset(
+        lambda: _load_revoked_sessions(
+            context.get(Database), revoked_sessions, context.get(AuthenticationSettings)
+        )
+    )
+    try:
+        await bus.start()
+    except Exception as exc:
+        print(f"Failed to start the invalidation bus {exc=}")
+
+
+async def _rerender_markdown(db: Database):
+    """Renders any descriptions left behind by an older renderer version, runs in the
+    background so startup isn't delayed."""
+    try:
+        if rendered := await db.challenges.rerender_markdown():
+            print(f"Rendered the markdown of {rendered} challenges & submissions")
+    except Exception as exc:
+        print(f"Failed to render the markdown {exc=}")
+
+
+async def _load_revoked_sessions(
+    db: Database, revoked_sessions: RevokedSessions, settings: AuthenticationSettings
+):
+    """Loads the revoked sessions that could still have signed tokens that haven't
+    expired. Until they're loaded every signed session is checked against its row."""
+    if not settings.signed_sessions:
+        return
+
+    since = datetime.utcnow() - timedelta(seconds=settings.session_lifetime)
+    try:
+        revoked_sessions.load(await db.sessions.get_revoked_ids(since))
+    except Exception as exc:
+        print(f"Failed to load the revoked sessions {exc=}")
+    else:
+        print(f"Loaded {revoked_sessions.count} revoked sessions")
+
+
+@site.on_event("shutdown")
+async def on_stop():
+    context: Context = site.dependency_overrides.get(create_context, create_context)()
+    await context.get(VoteBuffer).close()
+    await context.get(InvalidationBus).close()
+    await context.get(SessionCompactor).close()
 
 
 @site.get("/", response_class=TemplateResponse)
 async def index(
     emoji: Emoji = inject(Emoji),
     db: Database = inject(Database),
+    leaderboards: Leaderboards = inject(Leaderboards),
     session: Session = Depends(session_cookie),
+    vote_buffer: VoteBuffer = inject(VoteBuffer),
 ):
     challenge = await db.challenges.get_active()
     scope = {"challenge": None, "emoji": emoji}
     if challenge:
-        scope["challenge"] = await challenge.to_dict(expand_submissions=True)
+        page = await db.challenges.get_submission_page(
+            challenge, exclude=[Status.DISAPPROVED]
+        )
+        scope["challenge"] = await challenge.to_dict(
+            expand_submissions=True, include_voters=False
+        )
+        scope["next_cursor"] = page.next_cursor
         scope["challenge"]["formatted_start"] = challenge.start.format("dddd, MMMM Do ")
         scope["challenge"]["formatted_end"] = challenge.end.format("dddd, MMMM Do ")
-        _build_submissions(scope, session)
+        await _build_submissions(scope, session, db, vote_buffer)
 
-        leaderboard = await challenge.get_leaderboard()
-        leaderboard = sorted(leaderboard, key=lambda e: e.votes, reverse=True)
-        max_votes = leaderboard[0].votes if leaderboard else 2
+        leaderboard = await leaderboards.get(challenge.id)
+        top_entries = leaderboard.top(10)
+        max_votes = top_entries[0].votes if top_entries else 2
         scope["leaderboard"] = {
             "max": max(int(max_votes * 1.2), max_votes + 1),
             "entries": [
                 {"username": entry.username, "votes": entry.votes}
-                for entry in leaderboard
+                for entry in top_entries
             ],
         }
+        if session and session.user_id:
+            scope["leaderboard"]["rank"] = leaderboard.rank(session.user_id)
+            scope["leaderboard"]["votes"] = leaderboard.votes(session.user_id)
 
     upcoming_challenges = await db.challenges.get_upcoming_challenges(2)
     upcoming = None
@@ -74,19 +190,22 @@ async def index(
             "start_timestamp": upcoming.start.timestamp(),
         }
 
+    scope["season_standings"] = await db.standings.get_season(10)
     return "index.html", scope
 
 
 @site.get("/challenges", response_class=TemplateResponse)
 async def challenges(db: Database = inject(Database)):
+    summaries = await db.challenges.get_summaries(ignore_future=True)
     return "challenges.html", {
         "challenges": [
-            (await challenge.to_dict())
+            challenge.to_dict()
             | {
+                "markdown": challenge.markdown,
                 "formatted_start": challenge.start.format("dddd, MMMM Do "),
                 "formatted_end": challenge.end.format("dddd, MMMM Do "),
             }
-            for challenge in await db.challenges.get_all(ignore_future=True)
+            for challenge in summaries
         ]
     }
 
@@ -99,6 +218,7 @@ async def show_challenge(
     db: Database = inject(Database),
     emoji: Emoji = inject(Emoji),
     session: Session = Depends(session_cookie),
+    vote_buffer: VoteBuffer = inject(VoteBuffer),
 ):
     challenge = await db.challenges.get(challenge_id)
     if not challenge:
@@ -107,27 +227,87 @@ async def show_challenge(
             "title": f"Challenge does not exist",
         }
 
+    page = await db.challenges.get_submission_page(
+        challenge, exclude=[Status.DISAPPROVED]
+    )
     scope = {
-        "challenge": await challenge.to_dict(expand_submissions=True),
+        "challenge": await challenge.to_dict(
+            expand_submissions=True, include_voters=False
+        ),
+        "next_cursor": page.next_cursor,
         "emoji": emoji,
         "formatted_start": challenge.start.format("MMMM Do, YYYY"),
         "formatted_end": challenge.end.format("MMMM Do, YYYY"),
     }
-    _build_submissions(scope, session)
+    await _build_submissions(scope, session, db, vote_buffer)
     return "challenge.html", scope
 
 
-def _build_submissions(scope, session):
-    scope["user_votes"] = defaultdict(set)
+@site.get("/challenges/{challenge_id}/submissions", response_class=TemplateResponse)
+async def show_submissions_page(
+    challenge_id: int,
+    cursor: str,
+    db: Database = inject(Database),
+    emoji: Emoji = inject(Emoji),
+    session: Session = Depends(session_cookie),
+    vote_buffer: VoteBuffer = inject(VoteBuffer),
+    serializer: Serializer = inject(Serializer),
+):
+    try:
+        page = await db.challenges.get_submission_page(
+            challenge_id, cursor, exclude=[Status.DISAPPROVED]
+        )
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+    scope = {
+        "challenge": {
+            "id": challenge_id,
+            "submissions": await serializer.serialize(
+                page.submissions, expand_user=True, include_voters=False
+            ),
+        },
+        "next_cursor": page.next_cursor,
+        "emoji": emoji,
+    }
+    await _build_submissions(scope, session, db, vote_buffer)
+    return "submissions-page.html", scope
+
+
+async def _build_submissions(scope, session, db: Database, vote_buffer: VoteBuffer):
     for submission in scope["challenge"]["submissions"]:
         submission["formatted_created"] = submission["created"].format(
             "dddd, MMMM Do - h:mmA"
         )
 
-        if session:
-            for emoji, voters in submission["votes"].items():
-                if session.user_id in voters:
-                    scope["user_votes"][submission["id"]].add(emoji)
+    scope["user_votes"] = defaultdict(set)
+    if session and session.user_id:
+        scope["user_votes"] = await db.challenges.get_user_votes(
+            scope["challenge"]["id"], session.user_id
+        )
+        _apply_pending_votes(scope, vote_buffer.get_pending(session.user_id))
+
+
+def _apply_pending_votes(scope, pending: dict[tuple[int, str], bool]):
+    """Shows the user's votes that are still waiting to be written."""
+    submissions = {
+        submission["id"]: submission for submission in scope["challenge"]["submissions"]
+    }
+    for (submission_id, emoji), add in pending.items():
+        user_votes = scope["user_votes"][submission_id]
+        if add == (emoji in user_votes):
+            continue
+
+        if add:
+            user_votes.add(emoji)
+        else:
+            user_votes.discard(emoji)
+
+        if submission := submissions.get(submission_id):
+            votes = submission["vote_counts"] = dict(submission["vote_counts"])
+            votes[emoji] = votes.get(emoji, 0) + (1 if add else -1)
+            if votes[emoji] <= 0:
+                del votes[emoji]
 
 
 @site.get(
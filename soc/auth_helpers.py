@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import Any
 
 import jwt
 import sqlalchemy.exc
+from bevy import Bevy, bevy_method, Inject
 from fastapi import Depends, HTTPException, Cookie, Header
 from fastapi.security import OAuth2PasswordBearer
 
@@ -9,6 +11,7 @@ from soc.config.models.site import SiteSettings
 from soc.context import inject
 from soc.controllers.authentication import AuthenticationSettings
 from soc.database import Database
+from soc.database.revoked_sessions import RevokedSessions
 from soc.entities.sessions import Session
 
 auth_scheme = OAuth2PasswordBearer(tokenUrl="authenticate")
@@ -27,9 +30,10 @@ def require_roles(*roles):
         cookie_session: dict[str, Any] | None = Depends(session_cookie),
         db: Database = inject(Database),
         settings: AuthenticationSettings = inject(AuthenticationSettings),
+        sessions: RequestSessions = inject(RequestSessions),
     ):
         session = (
-            await bearer_token(authorization.split(" ", maxsplit=1)[1], settings, db)
+            await sessions.get(authorization.split(" ", maxsplit=1)[1])
             if authorization
             else cookie_session
         )
@@ -38,8 +42,12 @@ def require_roles(*roles):
 
         else:
             await validate_session(session, settings, db)
-            user = await db.users.get_by_id(session.user_id)
-            user_roles = set(await user.get_roles())
+            if session.roles is None:
+                user = await db.users.get_by_id(session.user_id)
+                user_roles = set(await user.get_roles())
+            else:
+                user_roles = set(session.roles)
+
             roles_match = bool(user_roles & roles)
 
         if not roles_match:
@@ -51,7 +59,11 @@ def require_roles(*roles):
 def parse_token(token: str, settings: AuthenticationSettings) -> dict[str, Any]:
     try:
         return jwt.decode(token, settings.jwt.private_key, settings.jwt.algorithm)
-    except (jwt.exceptions.InvalidSignatureError, jwt.exceptions.DecodeError):
+    except (
+        jwt.exceptions.InvalidSignatureError,
+        jwt.exceptions.DecodeError,
+        jwt.exceptions.ExpiredSignatureError,
+    ):
         return {}
 
 
@@ -76,18 +88,78 @@ async def get_session_data(session_info: dict[str, Any], db: Database) -> Sessio
         return Session(-1, -1, False, None, session_info)
 
 
-async def session_cookie(
-    session_token: str | None = Cookie(default=None, alias="sessionid"),
-    settings: AuthenticationSettings = inject(AuthenticationSettings),
-    db: Database = inject(Database),
-):
-    session_info = parse_token(session_token, settings)
+async def load_session(
+    session_info: dict[str, Any],
+    settings: AuthenticationSettings,
+    db: Database,
+    revoked_sessions: RevokedSessions,
+) -> Session | None:
     if session_info.get("type") == "dbless":
         return Session(-1, -1, False, None, session_info)
 
+    if settings.signed_sessions and "exp" in session_info:
+        # Sessions that may have been revoked are confirmed using their row
+        if session_info["session_id"] not in revoked_sessions:
+            return Session(
+                session_info["session_id"],
+                session_info["user_id"],
+                False,
+                datetime.fromtimestamp(session_info["created"]),
+                {"username": session_info["username"]},
+                roles=session_info["roles"],
+            )
+
     return await get_session_data(session_info, db)
 
 
+class RequestSessions(Bevy):
+    """Loads the sessions of a single request. Each token is decoded & its session
+    loaded once, every later lookup of the token during the request reuses it."""
+
+    def __init__(self):
+        self._sessions: dict[str | None, Session | None] = {}
+        self._token_data: dict[str | None, dict[str, Any]] = {}
+
+    def add_token_data(self, token_data: dict[str | None, dict[str, Any]]):
+        """Adds tokens that have already been decoded, the rate limiting middleware
+        decodes bearer tokens before the request is routed."""
+        self._token_data |= token_data
+
+    @bevy_method
+    def parse(
+        self, session_token: str | None, settings: AuthenticationSettings = Inject
+    ) -> dict[str, Any]:
+        if session_token not in self._token_data:
+            self._token_data[session_token] = parse_token(session_token, settings)
+
+        return self._token_data[session_token]
+
+    @bevy_method
+    async def get(
+        self,
+        session_token: str | None,
+        settings: AuthenticationSettings = Inject,
+        db: Database = Inject,
+        revoked_sessions: RevokedSessions = Inject,
+    ) -> Session | None:
+        if not session_token:
+            return None
+
+        if session_token not in self._sessions:
+            self._sessions[session_token] = await load_session(
+                self.parse(session_token), settings, db, revoked_sessions
+            )
+
+        return self._sessions[session_token]
+
+
+async def session_cookie(
+    session_token: str | None = Cookie(default=None, alias="sessionid"),
+    sessions: RequestSessions = inject(RequestSessions),
+):
+    return await sessions.get(session_token)
+
+
 async def validate_session_cookie(
     session: Session = Depends(session_cookie),
     settings: AuthenticationSettings = inject(AuthenticationSettings),
@@ -98,14 +170,9 @@ async def validate_session_cookie(
 
 async def bearer_token(
     session_token: str = Depends(auth_scheme),
-    settings: AuthenticationSettings = inject(AuthenticationSettings),
-    db: Database = inject(Database),
+    sessions: RequestSessions = inject(RequestSessions),
 ):
-    session_info = parse_token(session_token, settings)
-    if session_info.get("type") == "dbless":
-        return Session(-1, -1, False, None, session_info)
-
-    return await get_session_data(session_info, db)
+    return await sessions.get(session_token)
 
 
 async def validate_bearer_token(
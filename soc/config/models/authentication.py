@@ -21,5 +21,9 @@ class AuthenticationSettings(BaseSettingsModel):
     salt_rounds: int = Field(default=12, env="SOC_AUTH_SALT_ROUNDS")
     salt_prefix: bytes = Field(default=b"2b", env="SOC_AUTH_SALT_PREFIX")
     admin_email: str = Field(default="", env="SOC_AUTH_ADMIN_EMAIL")
+    signed_sessions: bool = Field(default=False, env="SOC_AUTH_SIGNED_SESSIONS")
+    session_lifetime: int = Field(
+        default=7 * 24 * 60 * 60, env="SOC_AUTH_SESSION_LIFETIME"
+    )
     jwt: JWTSettings = Field(default_factory=JWTSettings)
     discord: DiscordSettings = Field(default_factory=DiscordSettings)
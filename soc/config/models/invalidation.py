@@ -0,0 +1,13 @@
+from pydantic import Field
+
+from soc.config.base_model import BaseSettingsModel
+
+
+class InvalidationSettings(BaseSettingsModel):
+    __config_key__ = "invalidation"
+
+    backend: str = Field(default="auto", env="SOC_INVALIDATION_BACKEND")
+    poll_interval: float = Field(default=1.0, env="SOC_INVALIDATION_POLL_INTERVAL")
+    reconnect_interval: float = Field(
+        default=5.0, env="SOC_INVALIDATION_RECONNECT_INTERVAL"
+    )
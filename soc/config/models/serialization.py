@@ -0,0 +1,9 @@
+from pydantic import Field
+
+from soc.config.base_model import BaseSettingsModel
+
+
+class SerializationSettings(BaseSettingsModel):
+    __config_key__ = "serialization"
+
+    concurrency: int = Field(default=8, env="SOC_SERIALIZATION_CONCURRENCY")
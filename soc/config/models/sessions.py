@@ -0,0 +1,19 @@
+from pydantic import Field
+
+from soc.config.base_model import BaseSettingsModel
+
+
+class SessionSettings(BaseSettingsModel):
+    __config_key__ = "sessions"
+
+    compaction_interval: int = Field(
+        default=60 * 60, env="SOC_SESSIONS_COMPACTION_INTERVAL"
+    )
+    compaction_batch_size: int = Field(
+        default=500, env="SOC_SESSIONS_COMPACTION_BATCH_SIZE"
+    )
+    compaction_pause: float = Field(default=0.1, env="SOC_SESSIONS_COMPACTION_PAUSE")
+    guest_lifetime: int = Field(default=24 * 60 * 60, env="SOC_SESSIONS_GUEST_LIFETIME")
+    revoked_retention: int = Field(
+        default=7 * 24 * 60 * 60, env="SOC_SESSIONS_REVOKED_RETENTION"
+    )
@@ -0,0 +1,12 @@
+from pydantic import Field
+
+from soc.config.base_model import BaseSettingsModel
+
+
+class VoteSettings(BaseSettingsModel):
+    __config_key__ = "votes"
+
+    write_behind: bool = Field(default=False, env="SOC_VOTES_WRITE_BEHIND")
+    flush_interval: int = Field(default=250, env="SOC_VOTES_FLUSH_INTERVAL")
+    flush_size: int = Field(default=500, env="SOC_VOTES_FLUSH_SIZE")
+    flush_retries: int = Field(default=5, env="SOC_VOTES_FLUSH_RETRIES")
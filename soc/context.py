@@ -7,10 +7,10 @@ from fastapi import Depends, routing, FastAPI, Request
 from fastapi.routing import get_request_handler
 
 import soc.auth_helpers
-from soc.config.models.authentication import AuthenticationSettings
 from soc.config.settings_provider import SettingsProvider
-from soc.database import Database
+from soc.database.identity_map import IdentityMap
 from soc.database.provider import DatabaseProvider
+from soc.database.unit_of_work import UnitOfWork
 from soc.entities.sessions import Session
 from soc.templates.scope import Scope
 
@@ -37,44 +37,48 @@ class BevyRoute(routing.APIRoute):
             overrides_provider = self.dependency_overrides_provider
             overrides = overrides_provider.dependency_overrides
             context: Context = overrides.get(create_context, create_context)().branch()
-            session = await self._load_session(request, context)
-            context.add(session, use_as=Session)
-            context.add(request, use_as=Request)
-            if "sessionid" in request.cookies and session and not session.revoked:
-                scope = context.get(Scope)
-                scope["session_token"] = request.cookies["sessionid"]
-
-            if hasattr(self.response_class, "__bevy_context__"):
-                response_class = context.bind(response_class)
-
-            handler = get_request_handler(
-                dependant=self.dependant,
-                body_field=self.body_field,
-                status_code=self.status_code,
-                response_class=response_class,
-                response_field=self.secure_cloned_response_field,
-                response_model_include=self.response_model_include,
-                response_model_exclude=self.response_model_exclude,
-                response_model_by_alias=self.response_model_by_alias,
-                response_model_exclude_unset=self.response_model_exclude_unset,
-                response_model_exclude_defaults=self.response_model_exclude_defaults,
-                response_model_exclude_none=self.response_model_exclude_none,
-                dependency_overrides_provider=DependencyOverridesProvider(
-                    overrides_provider, {create_context: lambda: context}
-                ),
-            )
-            return await handler(request, *args, **kwargs)
+            identity_map = context.create(IdentityMap, cache=True)
+            unit_of_work = context.create(UnitOfWork, cache=True)
+            sessions = context.create(soc.auth_helpers.RequestSessions, cache=True)
+            sessions.add_token_data(getattr(request.state, "token_data", {}))
+            with identity_map.activate(), unit_of_work.activate():
+                session = await self._load_session(request, context)
+                context.add(session, use_as=Session)
+                context.add(request, use_as=Request)
+                if "sessionid" in request.cookies and session and not session.revoked:
+                    scope = context.get(Scope)
+                    scope["session_token"] = request.cookies["sessionid"]
+
+                if hasattr(self.response_class, "__bevy_context__"):
+                    response_class = context.bind(response_class)
+
+                handler = get_request_handler(
+                    dependant=self.dependant,
+                    body_field=self.body_field,
+                    status_code=self.status_code,
+                    response_class=response_class,
+                    response_field=self.secure_cloned_response_field,
+                    response_model_include=self.response_model_include,
+                    response_model_exclude=self.response_model_exclude,
+                    response_model_by_alias=self.response_model_by_alias,
+                    response_model_exclude_unset=self.response_model_exclude_unset,
+                    response_model_exclude_defaults=self.response_model_exclude_defaults,
+                    response_model_exclude_none=self.response_model_exclude_none,
+                    dependency_overrides_provider=DependencyOverridesProvider(
+                        overrides_provider, {create_context: lambda: context}
+                    ),
+                )
+                response = await handler(request, *args, **kwargs)
+                await unit_of_work.commit()
+                return response
 
         return custom_handler
 
     async def _load_session(
         self, request: fastapi.Request, context: Context
     ) -> Session | None:
-        auth_settings = context.get(AuthenticationSettings)
-        db = context.get(Database)
-        return await soc.auth_helpers.session_cookie(
-            request.cookies.get("sessionid"), auth_settings, db
-        )
+        sessions = context.get(soc.auth_helpers.RequestSessions)
+        return await sessions.get(request.cookies.get("sessionid"))
 
 
 def create_app(*args, **kwargs) -> FastAPI:
@@ -48,11 +48,26 @@ class Authentication(Bevy):
 
     @bevy_method
     async def create_user_session(
-        self, user: User | UserModel, db: Database = Inject
+        self,
+        user: User | UserModel,
+        db: Database = Inject,
+        settings: AuthenticationSettings = Inject,
     ) -> (str, Session):
+        """Creates a session for the user. When signed sessions are enabled the user's
+        details are signed into the token along with when it expires, so the session
+        can be validated without loading it."""
         session_id = self._create_session_id()
         session = await db.sessions.create(session_id, user.id, username=user.username)
-        token = self.create_token(session_id=session_id)
+        if not settings.signed_sessions:
+            return self.create_token(session_id=session_id), session
+
+        token = self.create_token(
+            session_id=session_id,
+            user_id=user.id,
+            username=user.username,
+            roles=await db.users.get_roles(user.id),
+            exp=int(time()) + settings.session_lifetime,
+        )
         return token, session
 
     @bevy_method
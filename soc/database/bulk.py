@@ -0,0 +1,40 @@
+from collections import defaultdict
+from typing import Any, Iterable
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from soc.database.models.base import BaseModel
+
+
+async def bulk_update(
+    db_session: AsyncSession,
+    model: type[BaseModel],
+    rows: Iterable[dict[str, Any]],
+):
+    """Updates the rows matching each row's ID. Rows that set the same columns are
+    updated with a single executemany statement."""
+    table = model.__table__
+    groups = defaultdict(list)
+    for row in rows:
+        columns = tuple(sorted(row.keys() - {"id"}))
+        groups[columns].append({f"_{name}": value for name, value in row.items()})
+
+    for columns, params in groups.items():
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({column: bindparam(f"_{column}") for column in columns})
+        )
+        await db_session.execute(statement, params)
+
+
+def get_insert(db_session: AsyncSession):
+    """Gets the insert construct that supports ON CONFLICT for the session's
+    database."""
+    match db_session.bind.dialect.name:
+        case "postgresql":
+            return postgresql.insert
+        case _:
+            return sqlite.insert
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from soc.database.models.challenges import ChallengeModel
+
+
+class ChallengeCache:
+    """Holds the challenges that haven't finished yet, ordered by their start. The
+    active & upcoming challenges can only change when one of them starts or ends, so
+    the cache expires at the next of those boundaries or when it's invalidated by a
+    write."""
+
+    size = 10
+
+    def __init__(self):
+        self._models: list[ChallengeModel] | None = None
+        self._expires = datetime.min
+        self._version = 0
+
+    async def get_active(
+        self, load: Callable[[int], Awaitable[list[ChallengeModel]]]
+    ) -> ChallengeModel | None:
+        now = datetime.utcnow()
+        models = await self._get(load, now)
+        return next(
+            (
+                model
+                for model in models
+                if model.start <= now and model.end >= now - timedelta(days=1)
+            ),
+            None,
+        )
+
+    async def get_upcoming(
+        self, limit: int, load: Callable[[int], Awaitable[list[ChallengeModel]]]
+    ) -> list[ChallengeModel] | None:
+        """Gets the next challenges that haven't ended, None if the cache doesn't
+        hold enough of them to answer."""
+        now = datetime.utcnow()
+        models = await self._get(load, now)
+        today = datetime.combine(now.date(), datetime.min.time())
+        upcoming = [model for model in models if model.end >= today]
+        # Fewer challenges than the cache's size means every unfinished one was loaded
+        if len(upcoming) < limit and len(models) >= self.size:
+            return None
+
+        return upcoming[:limit]
+
+    def invalidate(self):
+        self._models = None
+        self._version += 1
+
+    async def _get(
+        self, load: Callable[[int], Awaitable[list[ChallengeModel]]], now: datetime
+    ) -> list[ChallengeModel]:
+        if self._models is not None and now < self._expires:
+            return self._models
+
+        version = self._version
+        models = await load(self.size)
+        # The challenges may be stale if they were invalidated while loading
+        if version == self._version:
+            self._expires = self._find_next_boundary(models, now)
+            self._models = models
+
+        return models
+
+    def _find_next_boundary(
+        self, models: list[ChallengeModel], now: datetime
+    ) -> datetime:
+        boundaries = [datetime.max]
+        for model in models:
+            # Challenges are active through the day after they end, so they finish
+            # the instant after that
+            last_day = model.end + timedelta(days=1)
+            boundaries.extend(
+                (
+                    model.start,
+                    last_day + timedelta(microseconds=1),
+                    datetime.combine(last_day.date(), datetime.min.time()),
+                )
+            )
+
+        return min(boundary for boundary in boundaries if boundary > now)
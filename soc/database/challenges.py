@@ -1,33 +1,47 @@
 from __future__ import annotations
 
 import html
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Type
+from typing import Any, Iterable, Type
 
 import sqlalchemy.exc
 import sqlalchemy.orm
 from bevy import Bevy, bevy_method, Inject
 from fast_protocol import protocol
-from sqlalchemy import delete, update
+from sqlalchemy import bindparam, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql import func
 
 import soc.entities.submissions as submissions
+from soc.database.challenge_cache import ChallengeCache
+from soc.database.bulk import bulk_update, get_insert
+from soc.database.cursors import decode_cursor, encode_cursor
+from soc.database.identity_map import get_identity_map
 from soc.database.models.challenges import ChallengeModel
 from soc.database.models.submission_status import SubmissionStatusModel
 from soc.database.models.submissions import SubmissionModel
 from soc.database.models.users import UserModel
+from soc.database.models.vote_counts import VoteCountModel
+from soc.database.models.vote_totals import VoteTotalModel
+from soc.database.role_cache import RoleCache
+from soc.database.standings import Standings
+from soc.database.standings_cache import StandingsCache
 from soc.database.models.votes import VoteModel
-from soc.entities.challenges import Challenge
+from soc.entities.challenges import Challenge, ChallengeSummary
 from soc.entities.users import User
 from soc.events import Events
+from soc.invalidation import InvalidationBus
+from soc.rendering import render_markdown, RENDERER_VERSION
 
 
 IDable = protocol("id")
 
 
 class Challenges(Bevy):
+    vote_lookup_chunk_size = 100
+
     def __init__(self):
         self._challenge_type: Type[Challenge] = self.bevy.bind(Challenge)
         self._submission_type: Type[submissions.Submission] = self.bevy.bind(
@@ -36,6 +50,7 @@ class Challenges(Bevy):
         self._submission_status_type: Type[
             submissions.SubmissionStatus
         ] = self.bevy.bind(submissions.SubmissionStatus)
+        self._user_type: Type[User] = self.bevy.bind(User)
 
     @bevy_method
     async def create(
@@ -46,10 +61,12 @@ class Challenges(Bevy):
         end: datetime,
         user: int | User,
         db_session: AsyncSession = Inject,
+        cache: ChallengeCache = Inject,
+        bus: InvalidationBus = Inject,
     ) -> Challenge:
         model = ChallengeModel(
             title=html.escape(title),
-            description=html.escape(description),
+            **self._prepare_description(description),
             start=start,
             end=end,
             user_id=user.id if isinstance(user, User) else user,
@@ -57,38 +74,61 @@ class Challenges(Bevy):
         async with db_session.begin():
             db_session.add(model)
 
-        return self._challenge_type.from_db_model(model)
+        cache.invalidate()
+        await bus.publish("challenges")
+        return get_identity_map().add(
+            Challenge, model.id, self._challenge_type.from_db_model(model)
+        )
 
     @bevy_method
     async def get(self, challenge_id: int) -> Challenge | None:
+        identity_map = get_identity_map()
+        if challenge := identity_map.get(Challenge, challenge_id):
+            return challenge
+
         query = select(ChallengeModel).filter_by(id=challenge_id)
         model = await self._get_first_query_result(query)
         if not model:
             return
 
-        return self._challenge_type.from_db_model(model)
-
-    async def get_active(self) -> Challenge | None:
-        now = datetime.utcnow()
-        query = select(ChallengeModel).filter(
-            ChallengeModel.start <= now, ChallengeModel.end >= now - timedelta(days=1)
+        return identity_map.add(
+            Challenge, model.id, self._challenge_type.from_db_model(model)
         )
-        model = await self._get_first_query_result(query)
+
+    @bevy_method
+    async def get_active(self, cache: ChallengeCache = Inject) -> Challenge | None:
+        model = await cache.get_active(self._get_unfinished_challenges)
         if not model:
             return None
 
         return self._challenge_type.from_db_model(model)
 
-    async def get_upcoming_challenges(self, limit: int = 10) -> list[Challenge]:
-        now = datetime.utcnow()
+    @bevy_method
+    async def get_upcoming_challenges(
+        self, limit: int = 10, cache: ChallengeCache = Inject
+    ) -> list[Challenge]:
+        challenges = await cache.get_upcoming(limit, self._get_unfinished_challenges)
+        if challenges is None:
+            now = datetime.utcnow()
+            query = (
+                select(ChallengeModel)
+                .where(ChallengeModel.end >= now.date())
+                .order_by(ChallengeModel.start.asc())
+                .limit(limit)
+            )
+            challenges = await self._get_query_result(query)
+
+        return [self._challenge_type.from_db_model(model) for model in challenges]
+
+    async def _get_unfinished_challenges(self, limit: int) -> list[ChallengeModel]:
+        """Gets the challenges that are active or have yet to start."""
         query = (
             select(ChallengeModel)
-            .where(ChallengeModel.end >= now.date())
+            .where(ChallengeModel.end >= datetime.utcnow() - timedelta(days=1))
             .order_by(ChallengeModel.start.asc())
             .limit(limit)
         )
-        challenges = await self._get_query_result(query)
-        return [self._challenge_type.from_db_model(model) for model in challenges]
+        return list(await self._get_query_result(query, []))
 
     async def get_all(self, ignore_future: bool = False) -> list[Challenge]:
         query = select(ChallengeModel).order_by(
@@ -100,6 +140,38 @@ class Challenges(Bevy):
         result = await self._get_query_result(query, [])
         return [self._challenge_type.from_db_model(row) for row in result]
 
+    @bevy_method
+    async def get_summaries(
+        self, ignore_future: bool = False, db_session: AsyncSession = Inject
+    ) -> list[ChallengeSummary]:
+        """Gets a summary of every challenge using a single grouped query."""
+        query = (
+            select(
+                ChallengeModel.id,
+                ChallengeModel.title,
+                ChallengeModel.description,
+                ChallengeModel.description_html,
+                ChallengeModel.created,
+                ChallengeModel.start,
+                ChallengeModel.end,
+                ChallengeModel.user_id,
+                UserModel.username,
+                func.count(SubmissionModel.id).label("submission_count"),
+            )
+            .outerjoin(UserModel, UserModel.id == ChallengeModel.user_id)
+            .outerjoin(
+                SubmissionModel, SubmissionModel.challenge_id == ChallengeModel.id
+            )
+            .group_by(ChallengeModel.id, UserModel.username)
+            .order_by(ChallengeModel.start, ChallengeModel.end)
+        )
+        if ignore_future:
+            query = query.where(ChallengeModel.start <= datetime.utcnow())
+
+        async with db_session:
+            cursor = await db_session.execute(query)
+            return [ChallengeSummary.from_row(row) for row in cursor]
+
     @bevy_method
     async def create_submission(
         self,
@@ -109,25 +181,26 @@ class Challenges(Bevy):
         challenge: int | Challenge,
         user: int | User,
         db_session: AsyncSession = Inject,
+        events: Events = Inject,
     ) -> submissions.Submission:
         user_id = user if isinstance(user, int) else user.id
         model = SubmissionModel(
             type=type,
             link=html.escape(link),
-            description=html.escape(description),
+            **self._prepare_description(description),
             user_id=user_id,
             challenge_id=challenge if isinstance(challenge, int) else challenge.id,
+            status=submissions.Status.CREATED,
         )
         async with db_session.begin():
             db_session.add(model)
+            await db_session.flush()
+            status_model = await self._add_submission_status(
+                model.id, submissions.Status.CREATED, user_id, db_session
+            )
 
-        submission = self._submission_type.from_db_model(model)
-        submission.status = submissions.SubmissionStatus(
-            status=submissions.Status.CREATED,
-            user_id=user_id,
-            submission_id=submission.id,
-        )
-        await submission.sync()
+        submission = self._submission_type.from_db_model(model, status_model)
+        await events.dispatch("submission.status.changed", submission)
         return submission
 
     @bevy_method
@@ -139,13 +212,13 @@ class Challenges(Bevy):
         db_session: AsyncSession = Inject,
         events: Events = Inject,
     ) -> submissions.SubmissionStatus:
-        model = SubmissionStatusModel(
-            status=status,
-            submission_id=submission.id if hasattr(submission, "id") else submission,
-            user_id=user if isinstance(user, int) else user.id,
-        )
         async with db_session.begin():
-            db_session.add(model)
+            model = await self._add_submission_status(
+                submission.id if hasattr(submission, "id") else submission,
+                status,
+                user if isinstance(user, int) else user.id,
+                db_session,
+            )
 
         updated_status = submissions.SubmissionStatus.from_db_model(model)
         await events.dispatch(
@@ -156,6 +229,27 @@ class Challenges(Bevy):
         )
         return updated_status
 
+    async def _add_submission_status(
+        self,
+        submission_id: int,
+        status: submissions.Status,
+        user_id: int,
+        db_session: AsyncSession,
+    ) -> SubmissionStatusModel:
+        """Adds a status to the submission's history and updates the submission's
+        current status. This must be called inside of a transaction."""
+        model = SubmissionStatusModel(
+            status=status, submission_id=submission_id, user_id=user_id
+        )
+        db_session.add(model)
+        await db_session.flush()
+        await db_session.execute(
+            update(SubmissionModel)
+            .where(SubmissionModel.id == submission_id)
+            .values(status=status, status_id=model.id)
+        )
+        return model
+
     @bevy_method
     async def add_vote_to_submission(
         self,
@@ -163,14 +257,40 @@ class Challenges(Bevy):
         user: int | User,
         emoji: str,
         db_session: AsyncSession = Inject,
-    ) -> VoteModel:
-        model = VoteModel(
-            emoji=emoji, user_id=self.get_id(user), submission=self.get_id(submission)
+        events: Events = Inject,
+    ) -> bool:
+        """Adds the user's vote using a single conditional insert. Nothing is added
+        if the user has already voted with the emoji, if the submission doesn't
+        exist, or if the user created the submission. Returns True if the vote was
+        added."""
+        submission_id, user_id = self.get_id(submission), self.get_id(user)
+        statement = (
+            get_insert(db_session)(VoteModel)
+            .from_select(
+                ["emoji", "user_id", "submission"],
+                select(
+                    sqlalchemy.literal(emoji, VoteModel.emoji.type),
+                    sqlalchemy.literal(user_id, VoteModel.user_id.type),
+                    SubmissionModel.id,
+                ).where(
+                    SubmissionModel.id == submission_id,
+                    SubmissionModel.user_id != user_id,
+                ),
+            )
+            .on_conflict_do_nothing()
         )
+        author = None
         async with db_session.begin():
-            db_session.add(model)
+            result = await db_session.execute(statement)
+            if result.rowcount:
+                author = await self._update_vote_counts(
+                    submission_id, emoji, 1, db_session
+                )
 
-        return model
+        if author:
+            await events.dispatch("submission.votes.changed", *author, 1)
+
+        return bool(result.rowcount)
 
     @bevy_method
     async def remove_vote_from_submission(
@@ -179,21 +299,367 @@ class Challenges(Bevy):
         user: int | User,
         emoji: str,
         db_session: AsyncSession = Inject,
+        events: Events = Inject,
     ):
+        submission_id = self.get_id(submission)
         query = delete(VoteModel).filter_by(
-            submission=self.get_id(submission), user_id=self.get_id(user), emoji=emoji
+            submission=submission_id, user_id=self.get_id(user), emoji=emoji
         )
+        author = None
+        async with db_session.begin():
+            result = await db_session.execute(query)
+            if result.rowcount:
+                author = await self._update_vote_counts(
+                    submission_id, emoji, -result.rowcount, db_session
+                )
+
+        if author:
+            await events.dispatch("submission.votes.changed", *author, -result.rowcount)
+
+    @bevy_method
+    async def apply_votes(
+        self,
+        user: int | User,
+        votes: dict[tuple[int, str], bool],
+        db_session: AsyncSession = Inject,
+        events: Events = Inject,
+    ) -> tuple[int, int]:
+        """Adds (True) or removes (False) the user's vote for each submission ID &
+        emoji pair in a single transaction. Raises a ValueError if any of the
+        submissions don't exist or belong to the user. Returns the number of votes
+        added & removed."""
+        user_id = self.get_id(user)
+        submission_ids = {submission_id for submission_id, _ in votes}
+        async with db_session.begin():
+            authors = await self._get_submission_authors(submission_ids, db_session)
+            self._check_voter(user_id, submission_ids, authors)
+            added, removed, vote_totals = await self._apply_vote_changes(
+                {
+                    (user_id, submission_id, emoji): add
+                    for (submission_id, emoji), add in votes.items()
+                },
+                authors,
+                db_session,
+            )
+
+        await self._dispatch_vote_totals(vote_totals, authors, events)
+        return added, removed
+
+    @bevy_method
+    async def check_votes(
+        self,
+        user: int | User,
+        submission_ids: Iterable[int],
+        db_session: AsyncSession = Inject,
+    ):
+        """Raises a ValueError if any of the submissions don't exist or belong to the
+        user, votes are checked before they're buffered."""
+        submission_ids = set(submission_ids)
+        async with db_session:
+            authors = await self._get_submission_authors(submission_ids, db_session)
+
+        self._check_voter(self.get_id(user), submission_ids, authors)
+
+    def _check_voter(
+        self,
+        user_id: int,
+        submission_ids: set[int],
+        authors: dict[int, sqlalchemy.engine.Row],
+    ):
+        if missing := submission_ids - authors.keys():
+            raise ValueError(f"No such submissions {sorted(missing)}")
+
+        if any(author.user_id == user_id for author in authors.values()):
+            raise ValueError("You cannot vote for your own submissions.")
+
+    @bevy_method
+    async def flush_votes(
+        self,
+        votes: dict[tuple[int, int, str], bool],
+        db_session: AsyncSession = Inject,
+        events: Events = Inject,
+    ) -> tuple[int, int]:
+        """Adds (True) or removes (False) many users' votes in a single
+        transaction. Each vote is keyed by the user ID, submission ID, and emoji.
+        Votes should be checked before they're buffered, votes for submissions that
+        have since been deleted are ignored. Returns the number of votes added &
+        removed."""
         async with db_session.begin():
-            await db_session.execute(query)
+            authors = await self._get_submission_authors(
+                {submission_id for _, submission_id, _ in votes}, db_session
+            )
+            added, removed, vote_totals = await self._apply_vote_changes(
+                {
+                    (user_id, submission_id, emoji): add
+                    for (user_id, submission_id, emoji), add in votes.items()
+                    if submission_id in authors
+                    and authors[submission_id].user_id != user_id
+                },
+                authors,
+                db_session,
+            )
+
+        await self._dispatch_vote_totals(vote_totals, authors, events)
+        return added, removed
+
+    async def _get_submission_authors(
+        self, submission_ids: set[int], db_session: AsyncSession
+    ) -> dict[int, sqlalchemy.engine.Row]:
+        """Gets the challenge ID, author ID, and author username of each
+        submission."""
+        cursor = await db_session.execute(
+            select(
+                SubmissionModel.id,
+                SubmissionModel.challenge_id,
+                SubmissionModel.user_id,
+                UserModel.username,
+            )
+            .join(UserModel)
+            .where(SubmissionModel.id.in_(submission_ids))
+        )
+        return {row.id: row for row in cursor}
+
+    async def _apply_vote_changes(
+        self,
+        votes: dict[tuple[int, int, str], bool],
+        authors: dict[int, sqlalchemy.engine.Row],
+        db_session: AsyncSession,
+    ) -> tuple[int, int, dict[tuple[int, int], int]]:
+        """Inserts & deletes the votes that change something and updates the vote
+        counters to match. The counters are only changed by the votes that were
+        actually inserted or deleted, so votes written by another transaction at the
+        same time aren't counted twice. This must be called inside of a transaction.
+        Returns the number of votes added & removed along with how much each
+        author's total changed for each challenge."""
+        if not votes:
+            return 0, 0, {}
+
+        existing = await self._get_existing_votes(list(votes), db_session)
+        added = await self._insert_votes(
+            [key for key, add in votes.items() if add and key not in existing],
+            db_session,
+        )
+        removed = await self._delete_votes(
+            [key for key, add in votes.items() if not add and key in existing],
+            db_session,
+        )
+
+        vote_counts = defaultdict(int)
+        vote_totals = defaultdict(int)
+        for keys, amount in [(key, 1) for key in added] + [
+            (key, -1) for key in removed
+        ]:
+            _, submission_id, emoji = keys
+            author = authors[submission_id]
+            vote_counts[submission_id, emoji] += amount
+            vote_totals[author.challenge_id, author.user_id] += amount
+
+        await self._add_to_counters(
+            VoteCountModel, ("submission_id", "emoji"), vote_counts, db_session
+        )
+        await self._add_to_counters(
+            VoteTotalModel, ("challenge_id", "user_id"), vote_totals, db_session
+        )
+        return len(added), len(removed), vote_totals
+
+    async def _get_existing_votes(
+        self, keys: list[tuple[int, int, str]], db_session: AsyncSession
+    ) -> set[tuple[int, int, str]]:
+        """Gets which of the votes keyed by user ID, submission ID, and emoji exist.
+        Each vote is matched on its own so the lookups use the votes index, the
+        votes are looked up in chunks to keep the queries small."""
+        existing = set()
+        for start in range(0, len(keys), self.vote_lookup_chunk_size):
+            cursor = await db_session.execute(
+                select(VoteModel.user_id, VoteModel.submission, VoteModel.emoji).where(
+                    sqlalchemy.or_(
+                        *(
+                            (VoteModel.submission == submission_id)
+                            & (VoteModel.user_id == user_id)
+                            & (VoteModel.emoji == emoji)
+                            for user_id, submission_id, emoji in keys[
+                                start : start + self.vote_lookup_chunk_size
+                            ]
+                        )
+                    )
+                )
+            )
+            existing.update(map(tuple, cursor))
+
+        return existing
+
+    async def _insert_votes(
+        self, keys: list[tuple[int, int, str]], db_session: AsyncSession
+    ) -> list[tuple[int, int, str]]:
+        """Inserts the votes keyed by user ID, submission ID, and emoji, skipping
+        votes that already exist. Returns the keys of the votes that were
+        inserted."""
+        if not keys:
+            return []
+
+        statement = get_insert(db_session)(VoteModel).on_conflict_do_nothing()
+        rows = [
+            {"user_id": user_id, "submission": submission_id, "emoji": emoji}
+            for user_id, submission_id, emoji in keys
+        ]
+        if db_session.bind.dialect.name == "postgresql":
+            cursor = await db_session.execute(
+                statement.values(rows).returning(
+                    VoteModel.user_id, VoteModel.submission, VoteModel.emoji
+                )
+            )
+            return list(map(tuple, cursor))
+
+        # SQLAlchemy can't use RETURNING with SQLite, so each vote is inserted on its
+        # own to know whether it was
+        inserted = []
+        for key, row in zip(keys, rows):
+            if (await db_session.execute(statement.values(row))).rowcount:
+                inserted.append(key)
+
+        return inserted
+
+    async def _delete_votes(
+        self, keys: list[tuple[int, int, str]], db_session: AsyncSession
+    ) -> list[tuple[int, int, str]]:
+        """Deletes the votes keyed by user ID, submission ID, and emoji. Returns the
+        keys of the votes that were deleted."""
+        if not keys:
+            return []
+
+        columns = VoteModel.user_id, VoteModel.submission, VoteModel.emoji
+        if db_session.bind.dialect.name == "postgresql":
+            cursor = await db_session.execute(
+                delete(VoteModel)
+                .where(sqlalchemy.tuple_(*columns).in_(keys))
+                .returning(*columns)
+            )
+            return list(map(tuple, cursor))
+
+        deleted = []
+        for user_id, submission_id, emoji in keys:
+            result = await db_session.execute(
+                delete(VoteModel).filter_by(
+                    user_id=user_id, submission=submission_id, emoji=emoji
+                )
+            )
+            if result.rowcount:
+                deleted.append((user_id, submission_id, emoji))
+
+        return deleted
+
+    async def _dispatch_vote_totals(
+        self,
+        vote_totals: dict[tuple[int, int], int],
+        authors: dict[int, sqlalchemy.engine.Row],
+        events: Events,
+    ):
+        usernames = {author.user_id: author.username for author in authors.values()}
+        for (challenge_id, author_id), amount in vote_totals.items():
+            if amount:
+                await events.dispatch(
+                    "submission.votes.changed",
+                    challenge_id,
+                    author_id,
+                    usernames[author_id],
+                    amount,
+                )
+
+    async def _update_vote_counts(
+        self, submission_id: int, emoji: str, amount: int, db_session: AsyncSession
+    ) -> tuple[int, int, str] | None:
+        """Adds the amount to the submission's emoji count and to the submission
+        author's total for the challenge. This must be called inside of a
+        transaction so the counts stay consistent with the votes table. Returns the
+        challenge ID, author ID, and author username."""
+        cursor = await db_session.execute(
+            select(
+                SubmissionModel.challenge_id,
+                SubmissionModel.user_id,
+                UserModel.username,
+            )
+            .join(UserModel)
+            .where(SubmissionModel.id == submission_id)
+        )
+        row = cursor.first()
+        if not row:
+            return None
+
+        await self._add_to_counter(
+            VoteCountModel,
+            amount,
+            db_session,
+            submission_id=submission_id,
+            emoji=emoji,
+        )
+        await self._add_to_counter(
+            VoteTotalModel,
+            amount,
+            db_session,
+            challenge_id=row.challenge_id,
+            user_id=row.user_id,
+        )
+        return tuple(row)
+
+    async def _add_to_counter(
+        self,
+        model: Type[VoteCountModel] | Type[VoteTotalModel],
+        amount: int,
+        db_session: AsyncSession,
+        **keys,
+    ):
+        statement = get_insert(db_session)(model).values(votes=amount, **keys)
+        await db_session.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(keys), set_={"votes": model.votes + amount}
+            )
+        )
+
+    async def _add_to_counters(
+        self,
+        model: Type[VoteCountModel] | Type[VoteTotalModel],
+        key_names: tuple[str, str],
+        amounts: dict[tuple, int],
+        db_session: AsyncSession,
+    ):
+        """Adds many amounts to a counter table using a single multi-row upsert."""
+        rows = [
+            dict(zip(key_names, keys), votes=amount)
+            for keys, amount in amounts.items()
+            if amount
+        ]
+        if not rows:
+            return
+
+        statement = get_insert(db_session)(model).values(rows)
+        await db_session.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(key_names),
+                set_={"votes": model.votes + statement.excluded.votes},
+            )
+        )
 
     @bevy_method
     async def delete_challenge(
-        self, challenge: int | Challenge, db_session: AsyncSession = Inject
+        self,
+        challenge: int | Challenge,
+        db_session: AsyncSession = Inject,
+        cache: ChallengeCache = Inject,
+        bus: InvalidationBus = Inject,
+        standings: Standings = Inject,
+        standings_cache: StandingsCache = Inject,
     ):
         challenge_id = challenge if isinstance(challenge, int) else challenge.id
         async with db_session.begin():
+            await standings.remove_challenge(challenge_id, db_session)
             await db_session.execute(delete(ChallengeModel).filter_by(id=challenge_id))
 
+        cache.invalidate()
+        standings_cache.invalidate()
+        get_identity_map().discard(Challenge, challenge_id)
+        await bus.publish("challenges")
+        await bus.publish("standings")
+
     async def get_submission_votes(
         self, submission: int | submissions.Submission
     ) -> list[VoteModel]:
@@ -201,30 +667,218 @@ class Challenges(Bevy):
         result = await self._get_query_result(query, [])
         return list(result)
 
+    async def get_submission_vote_counts(
+        self, submission: int | submissions.Submission
+    ) -> dict[str, int]:
+        query = select(VoteCountModel).where(
+            VoteCountModel.submission_id == self.get_id(submission),
+            VoteCountModel.votes > 0,
+        )
+        result = await self._get_query_result(query, [])
+        return {row.emoji: row.votes for row in result}
+
+    async def get_user_votes(
+        self, challenge: int | Challenge, user: int | User
+    ) -> dict[int, set[str]]:
+        """Gets the emoji that the user has voted with on each submission in the
+        challenge."""
+        query = (
+            select(VoteModel)
+            .join(SubmissionModel)
+            .where(
+                SubmissionModel.challenge_id == self.get_id(challenge),
+                VoteModel.user_id == self.get_id(user),
+            )
+        )
+        votes = defaultdict(set)
+        for vote in await self._get_query_result(query, []):
+            votes[vote.submission].add(vote.emoji)
+
+        return votes
+
     async def get_submission(
         self, submission_id: int, status: SubmissionStatusModel | None = None
     ) -> submissions.Submission | None:
-        query = select(SubmissionModel).filter_by(id=submission_id)
-        model = await self._get_first_query_result(query)
-        return self._submission_type.from_db_model(model, status) if model else None
+        rows = await self._get_submission_rows(SubmissionModel.id == submission_id)
+        if not rows:
+            return None
+
+        model, current_status = rows[0]
+        return self._submission_type.from_db_model(model, status or current_status)
+
+    async def get_submissions(
+        self, challenge_id: int, status: submissions.Status | None = None
+    ) -> list[submissions.Submission]:
+        conditions = [SubmissionModel.challenge_id == challenge_id]
+        if status:
+            conditions.append(SubmissionModel.status == status)
 
-    async def get_submissions(self, challenge_id: int) -> list[submissions.Submission]:
-        query = select(SubmissionModel).filter_by(challenge_id=challenge_id)
-        result = await self._get_query_result(query, [])
         return [
+            self._submission_type.from_db_model(model, current_status)
+            for model, current_status in await self._get_submission_rows(*conditions)
+        ]
+
+    @bevy_method
+    async def hydrate(
+        self,
+        *challenges: Challenge,
+        exclude: Iterable[submissions.Status] = (),
+        db_session: AsyncSession = Inject,
+    ):
+        """Loads the submissions, their current statuses, their vote counts, and the
+        authors (with roles) of the challenges and their submissions. This uses the
+        same four queries no matter how many challenges or submissions there are, or
+        three when the roles are cached. Submissions that have an excluded status are
+        never loaded."""
+        if not challenges:
+            return
+
+        conditions = [
+            SubmissionModel.challenge_id.in_([challenge.id for challenge in challenges])
+        ]
+        if exclude:
+            conditions.append(SubmissionModel.status.not_in(exclude))
+
+        async with db_session:
+            submission_rows = (
+                await db_session.execute(self._select_submissions(*conditions))
+            ).all()
+            loaded, users = await self._load_submissions(
+                submission_rows,
+                conditions,
+                {challenge.user_id for challenge in challenges},
+                db_session,
+            )
+
+        challenge_submissions = defaultdict(list)
+        for submission in loaded:
+            challenge_submissions[submission.challenge_id].append(submission)
+
+        for challenge in challenges:
+            challenge.hydrate(
+                users.get(challenge.user_id), challenge_submissions[challenge.id]
+            )
+
+    @bevy_method
+    async def get_submission_page(
+        self,
+        challenge: int | Challenge,
+        cursor: str | None = None,
+        limit: int = 20,
+        status: submissions.Status | None = None,
+        exclude: Iterable[submissions.Status] = (),
+        db_session: AsyncSession = Inject,
+    ) -> submissions.SubmissionPage:
+        """Gets a page of the challenge's submissions ordered by when they were
+        created, the page's next cursor gets the page that follows. The submissions
+        are loaded the same way as hydrate loads them and if a challenge is given it
+        is hydrated with just this page of submissions. Raises a ValueError if the
+        cursor isn't valid."""
+        conditions = [SubmissionModel.challenge_id == self.get_id(challenge)]
+        if status:
+            conditions.append(SubmissionModel.status == status)
+
+        if exclude:
+            conditions.append(SubmissionModel.status.not_in(exclude))
+
+        if cursor:
+            match decode_cursor(cursor):
+                case [str() as created, int() as submission_id]:
+                    conditions.append(
+                        sqlalchemy.tuple_(SubmissionModel.created, SubmissionModel.id)
+                        > (datetime.fromisoformat(created), submission_id)
+                    )
+                case _:
+                    raise ValueError(f"Invalid cursor {cursor!r}")
+
+        query = (
+            self._select_submissions(*conditions)
+            .order_by(None)
+            .order_by(SubmissionModel.created, SubmissionModel.id)
+            .limit(limit + 1)
+        )
+        async with db_session:
+            submission_rows = (await db_session.execute(query)).all()
+            next_cursor = None
+            if len(submission_rows) > limit:
+                submission_rows = submission_rows[:limit]
+                last, _ = submission_rows[-1]
+                next_cursor = encode_cursor(last.created, last.id)
+
+            user_ids = set()
+            if isinstance(challenge, Challenge):
+                user_ids.add(challenge.user_id)
+
+            loaded, users = await self._load_submissions(
+                submission_rows,
+                [SubmissionModel.id.in_([model.id for model, _ in submission_rows])],
+                user_ids,
+                db_session,
+            )
+
+        if isinstance(challenge, Challenge):
+            challenge.hydrate(users.get(challenge.user_id), loaded)
+
+        return submissions.SubmissionPage(loaded, next_cursor)
+
+    @bevy_method
+    async def _load_submissions(
+        self,
+        submission_rows: list[tuple[SubmissionModel, SubmissionStatusModel | None]],
+        conditions: list,
+        user_ids: set[int],
+        db_session: AsyncSession,
+        role_cache: RoleCache = Inject,
+    ) -> tuple[list[submissions.Submission], dict[int, User]]:
+        """Creates the submissions from the rows along with their vote counts and
+        authors. The conditions must select the same submissions as the rows, the
+        given user IDs are loaded along with the authors. Returns the submissions and
+        a mapping of every loaded user."""
+        vote_count_models = (
+            await db_session.execute(
+                select(VoteCountModel)
+                .join(SubmissionModel)
+                .where(VoteCountModel.votes > 0, *conditions)
+            )
+        ).scalars()
+
+        user_ids = user_ids | {model.user_id for model, _ in submission_rows}
+        user_models = (
+            await db_session.execute(
+                select(UserModel).where(UserModel.id.in_(user_ids))
+            )
+        ).scalars()
+        roles = await role_cache.get(user_ids, db_session)
+
+        vote_counts = defaultdict(dict)
+        for vote_count in vote_count_models:
+            vote_counts[vote_count.submission_id][vote_count.emoji] = vote_count.votes
+
+        identity_map = get_identity_map()
+        users = {
+            model.id: identity_map.add(
+                User, model.id, self._user_type.from_db_model(model, roles[model.id])
+            )
+            for model in user_models
+        }
+        loaded = [
             self._submission_type.from_db_model(
-                row, await self.get_submission_status(row.id)
+                model,
+                status,
+                vote_counts=vote_counts[model.id],
+                created_by=users.get(model.user_id),
             )
-            for row in result
+            for model, status in submission_rows
         ]
+        return loaded, users
 
     async def get_submission_status(
         self, submission_id: int
     ) -> submissions.SubmissionStatus | None:
-        query = (
-            select(SubmissionStatusModel)
-            .filter_by(submission_id=submission_id)
-            .order_by(SubmissionStatusModel.updated.desc())
+        query = select(SubmissionStatusModel).join(
+            SubmissionModel,
+            (SubmissionModel.status_id == SubmissionStatusModel.id)
+            & (SubmissionModel.id == submission_id),
         )
         model = await self._get_first_query_result(query)
         return self._submission_status_type.from_db_model(model)
@@ -246,52 +900,261 @@ class Challenges(Bevy):
             statement = (
                 update(SubmissionModel)
                 .where(SubmissionModel.id == submission_id)
-                .values(description=html.escape(description))
+                .values(**self._prepare_description(description))
             )
             await db_session.execute(statement)
             await db_session.commit()
 
     @bevy_method
     async def update(
-        self, challenge_id: int, db_session: AsyncSession = Inject, **fields
+        self,
+        challenge_id: int,
+        db_session: AsyncSession = Inject,
+        cache: ChallengeCache = Inject,
+        bus: InvalidationBus = Inject,
+        **fields,
     ):
-        disallowed_fields = {"created", "id", "user_id"}
+        async with db_session.begin():
+            statement = (
+                update(ChallengeModel)
+                .where(ChallengeModel.id == challenge_id)
+                .values(**self._prepare_challenge_fields(fields))
+            )
+            await db_session.execute(statement)
+            await db_session.commit()
+
+        cache.invalidate()
+        get_identity_map().discard(Challenge, challenge_id)
+        await bus.publish("challenges")
+
+    async def save_challenges(
+        self, changes: dict[int, dict[str, Any]], db_session: AsyncSession
+    ) -> dict[int, str]:
+        """Writes the changed fields of each challenge, keyed by the challenge ID. This
+        must be called inside of a transaction. Returns the rendered descriptions of
+        the challenges whose descriptions changed."""
+        rows = [
+            {"id": challenge_id} | self._prepare_challenge_fields(fields)
+            for challenge_id, fields in changes.items()
+        ]
+        await bulk_update(db_session, ChallengeModel, rows)
+        return {
+            row["id"]: row["description_html"]
+            for row in rows
+            if "description_html" in row
+        }
+
+    @bevy_method
+    async def challenges_saved(
+        self,
+        challenge_ids: list[int],
+        cache: ChallengeCache = Inject,
+        bus: InvalidationBus = Inject,
+    ):
+        cache.invalidate()
+        identity_map = get_identity_map()
+        for challenge_id in challenge_ids:
+            identity_map.discard(Challenge, challenge_id)
+
+        await bus.publish("challenges")
+
+    async def save_submissions(
+        self, changes: dict[int, dict[str, Any]], db_session: AsyncSession
+    ) -> tuple[dict[int, submissions.SubmissionStatus], dict[int, str]]:
+        """Writes the changed descriptions & statuses of each submission, keyed by the
+        submission ID. This must be called inside of a transaction. Returns the new
+        statuses and the rendered descriptions, both keyed by submission ID."""
+        rows = []
+        rendered = {}
+        status_models = {}
+        for submission_id, fields in changes.items():
+            if "description" in fields:
+                row = self._prepare_description(fields["description"])
+                rows.append({"id": submission_id} | row)
+                rendered[submission_id] = row["description_html"]
+
+            if "status" in fields:
+                status_models[submission_id] = SubmissionStatusModel(
+                    status=fields["status"].status,
+                    submission_id=submission_id,
+                    user_id=fields["status"].user_id,
+                )
+
+        if status_models:
+            db_session.add_all(status_models.values())
+            await db_session.flush()
+
+        rows.extend(
+            {"id": submission_id, "status": model.status, "status_id": model.id}
+            for submission_id, model in status_models.items()
+        )
+        await bulk_update(db_session, SubmissionModel, rows)
+        statuses = {
+            submission_id: self._submission_status_type.from_db_model(model)
+            for submission_id, model in status_models.items()
+        }
+        return statuses, rendered
+
+    @bevy_method
+    async def submissions_saved(
+        self,
+        status_changes: list[submissions.Submission],
+        events: Events = Inject,
+    ):
+        for submission in status_changes:
+            await events.dispatch("submission.status.changed", submission)
+
+    def _prepare_challenge_fields(self, fields: dict[str, Any]) -> dict[str, Any]:
+        """Removes the fields that can't be changed and escapes the title &
+        description."""
+        disallowed_fields = {
+            "created",
+            "description_html",
+            "id",
+            "markdown_version",
+            "standings_frozen",
+            "user_id",
+        }
         changed_fields = {
             field_name: field_value
             for field_name, field_value in fields.items()
             if field_name not in disallowed_fields
         }
-        
+
         if "description" in changed_fields:
-            changed_fields["description"] = html.escape(changed_fields["description"])
-        
+            changed_fields |= self._prepare_description(changed_fields["description"])
+
         if "title" in changed_fields:
             changed_fields["title"] = html.escape(changed_fields["title"])
 
-        async with db_session.begin():
-            statement = (
-                update(ChallengeModel)
-                .where(ChallengeModel.id == challenge_id)
-                .values(**changed_fields)
+        return changed_fields
+
+    def _prepare_description(self, description: str) -> dict[str, str]:
+        """Escapes the description and renders it with the current renderer."""
+        description = html.escape(description)
+        return {
+            "description": description,
+            "description_html": render_markdown(description),
+            "markdown_version": RENDERER_VERSION,
+        }
+
+    async def rerender_markdown(self, batch_size: int = 500) -> int:
+        """Renders the descriptions of every challenge & submission that was rendered
+        by a different renderer version, or never rendered at all. Rows are updated in
+        batches. Returns how many rows were rendered."""
+        rendered = 0
+        for model in (ChallengeModel, SubmissionModel):
+            last_id = 0
+            while rows := await self._get_stale_markdown(model, last_id, batch_size):
+                await self._save_rendered_markdown(
+                    model,
+                    [
+                        {"_id": id, "_html": render_markdown(description)}
+                        for id, description in rows
+                    ],
+                )
+                rendered += len(rows)
+                last_id = rows[-1][0]
+
+        return rendered
+
+    @bevy_method
+    async def _get_stale_markdown(
+        self,
+        model: Type[ChallengeModel | SubmissionModel],
+        last_id: int,
+        limit: int,
+        db_session: AsyncSession = Inject,
+    ) -> list[tuple[int, str]]:
+        query = (
+            select(model.id, model.description)
+            .where(
+                model.id > last_id,
+                model.markdown_version.is_(None)
+                | (model.markdown_version != RENDERER_VERSION),
             )
-            await db_session.execute(statement)
-            await db_session.commit()
+            .order_by(model.id)
+            .limit(limit)
+        )
+        async with db_session:
+            return list((await db_session.execute(query)).all())
+
+    @bevy_method
+    async def _save_rendered_markdown(
+        self,
+        model: Type[ChallengeModel | SubmissionModel],
+        rows: list[dict[str, int | str]],
+        db_session: AsyncSession = Inject,
+    ):
+        table = model.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(
+                description_html=bindparam("_html"), markdown_version=RENDERER_VERSION
+            )
+        )
+        async with db_session.begin():
+            await db_session.execute(statement, rows)
 
     @bevy_method
     async def get_leaderboard(
         self, challenge_id: int, db_session: AsyncSession = Inject
     ) -> sqlalchemy.engine.result.ChunkedIteratorResult:
+        async with db_session:
+            return await db_session.execute(
+                select(UserModel.id, UserModel.username, VoteTotalModel.votes)
+                .join(VoteTotalModel)
+                .where(
+                    VoteTotalModel.challenge_id == challenge_id,
+                    VoteTotalModel.votes > 0,
+                )
+            )
+
+    @bevy_method
+    async def count_votes(
+        self, challenge_id: int, db_session: AsyncSession = Inject
+    ) -> sqlalchemy.engine.result.ChunkedIteratorResult:
+        """Counts the votes each user's submissions received directly from the votes
+        table. This is much slower than the leaderboard so should only be used to
+        verify the vote totals."""
         async with db_session:
             return await db_session.execute(
                 select(
-                    UserModel.username, func.count(UserModel.username).label("votes")
+                    UserModel.id,
+                    UserModel.username,
+                    func.count(UserModel.username).label("votes"),
                 )
                 .join(SubmissionModel)
                 .join(VoteModel)
                 .where(SubmissionModel.challenge_id == challenge_id)
-                .group_by(SubmissionModel.user_id, UserModel.username)
+                .group_by(UserModel.id, UserModel.username)
             )
 
+    @bevy_method
+    async def _get_submission_rows(
+        self, *conditions, db_session: AsyncSession = Inject
+    ) -> list[tuple[SubmissionModel, SubmissionStatusModel | None]]:
+        async with db_session:
+            try:
+                cursor = await db_session.execute(self._select_submissions(*conditions))
+            except sqlalchemy.exc.OperationalError:
+                return []
+
+            return list(cursor.all())
+
+    def _select_submissions(self, *conditions) -> sqlalchemy.sql.Select:
+        """Selects submissions along with their current status."""
+        return (
+            select(SubmissionModel, SubmissionStatusModel)
+            .outerjoin(
+                SubmissionStatusModel,
+                SubmissionStatusModel.id == SubmissionModel.status_id,
+            )
+            .where(*conditions)
+            .order_by(SubmissionModel.id)
+        )
+
     @bevy_method
     async def _get_query_result(
         self,
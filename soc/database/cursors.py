@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encodes the sort key of the last row on a page into an opaque cursor."""
+    data = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ]
+    )
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Decodes a cursor back into its values, raises a ValueError when the cursor
+    isn't valid."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor {cursor!r}") from exc
+
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+
+    return values
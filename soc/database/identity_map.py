@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Type, TypeVar
+
+T = TypeVar("T")
+
+_active_identity_map: ContextVar[IdentityMap | None] = ContextVar(
+    "active_identity_map", default=None
+)
+
+
+class IdentityMap:
+    """Holds the entities that have been loaded by their primary key so every lookup
+    of the same row returns the same entity. A map is created for each request and
+    activated while the request is handled, the repositories use whichever map is
+    active. Hits & misses are counted so the map's effectiveness can be checked."""
+
+    def __init__(self):
+        self._entities: dict[tuple[type, Any], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}("
+            f"entities={len(self._entities)}, hits={self.hits}, misses={self.misses})"
+        )
+
+    def get(self, entity_type: Type[T], id: Any) -> T | None:
+        entity = self._entities.get((entity_type, id))
+        if entity is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entity
+
+    def add(self, entity_type: Type[T], id: Any, entity: T) -> T:
+        """Adds the entity unless one is already mapped for the ID, returns the
+        entity that is mapped."""
+        return self._entities.setdefault((entity_type, id), entity)
+
+    def discard(self, entity_type: type, id: Any):
+        """Removes the entity so the next lookup loads it from the database, used when
+        the entity's row is written to."""
+        self._entities.pop((entity_type, id), None)
+
+    @contextmanager
+    def activate(self) -> Iterator[IdentityMap]:
+        token = _active_identity_map.set(self)
+        try:
+            yield self
+        finally:
+            _active_identity_map.reset(token)
+
+
+def get_identity_map() -> IdentityMap:
+    """Gets the active identity map. When no map is active, outside of a request, an
+    empty map is returned so nothing is shared."""
+    return _active_identity_map.get() or IdentityMap()
@@ -1,9 +1,13 @@
 import soc.database.models.challenges
+import soc.database.models.invalidations
 import soc.database.models.roles
 import soc.database.models.sessions
+import soc.database.models.standings
 import soc.database.models.settings
 import soc.database.models.submission_status
 import soc.database.models.submissions
 import soc.database.models.users
+import soc.database.models.vote_counts
+import soc.database.models.vote_totals
 import soc.database.models.votes
 from soc.database.models.base import BaseModel
@@ -1,5 +1,13 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Unicode
-from sqlalchemy.sql import func
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Unicode,
+)
+from sqlalchemy.sql import expression, func
 from soc.database.models.base import BaseModel
 
 
@@ -8,7 +16,17 @@ class ChallengeModel(BaseModel):
     id = Column(Integer, primary_key=True)
     title = Column(Unicode(512), nullable=False)
     description = Column(Unicode, nullable=False)
+    description_html = Column(Unicode, nullable=True)
+    markdown_version = Column(Unicode(32), nullable=True)
     created = Column(DateTime, server_default=func.now())
     start = Column(DateTime, nullable=False)
     end = Column(DateTime, nullable=False)
     user_id = Column(Integer, ForeignKey("Users.id"))
+    standings_frozen = Column(
+        Boolean, nullable=False, server_default=expression.false()
+    )
+
+    __table_args__ = (
+        Index("ix_Challenges_start_end", "start", "end"),
+        Index("ix_Challenges_standings_frozen_end", "standings_frozen", "end"),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, Integer, Unicode
+from sqlalchemy.sql import func
+
+from soc.database.models.base import BaseModel
+
+
+class InvalidationModel(BaseModel):
+    __tablename__ = "Invalidations"
+
+    id = Column(Integer, primary_key=True)
+    payload = Column(Unicode(1024), nullable=False)
+    created = Column(DateTime, server_default=func.now(), index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Unicode
+from sqlalchemy import Column, ForeignKey, Index, Integer, Unicode
 
 from soc.database.models.base import BaseModel
 
@@ -7,4 +7,6 @@ class RoleModel(BaseModel):
     __tablename__ = "Roles"
     id = Column(Integer, primary_key=True)
     type = Column(Unicode(32), nullable=False)
-    user_id = Column(Integer, ForeignKey("Users.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("Users.id", ondelete="CASCADE"), index=True)
+
+    __table_args__ = (Index("ix_Roles_type_user_id", "type", "user_id"),)
@@ -4,6 +4,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     BigInteger,
+    Index,
     Integer,
     Unicode,
 )
@@ -19,3 +20,8 @@ class SessionModel(BaseModel):
     created = Column(DateTime, server_default=func.now())
     user_id = Column(Integer, ForeignKey("Users.id", ondelete="CASCADE"))
     values = Column(Unicode(2**12), default="")
+
+    __table_args__ = (
+        Index("ix_Sessions_revoked_created", "revoked", "created"),
+        Index("ix_Sessions_user_id_created", "user_id", "created"),
+    )
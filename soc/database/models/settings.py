@@ -6,5 +6,5 @@ from soc.database.models.base import BaseModel
 class SettingsModel(BaseModel):
     __tablename__ = "Settings"
     id = Column(Integer, primary_key=True)
-    name = Column(Unicode(256), nullable=False)
+    name = Column(Unicode(256), nullable=False, index=True)
     value = Column(JSON, nullable=False)
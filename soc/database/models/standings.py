@@ -0,0 +1,29 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer
+
+from soc.database.models.base import BaseModel
+
+
+class StandingSnapshotModel(BaseModel):
+    """The final vote totals of each user for a challenge that has ended."""
+
+    __tablename__ = "StandingSnapshots"
+    challenge_id = Column(
+        Integer, ForeignKey("Challenges.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("Users.id", ondelete="CASCADE"), primary_key=True
+    )
+    votes = Column(Integer, nullable=False, default=0)
+
+
+class SeasonStandingModel(BaseModel):
+    """Each user's running vote total across every challenge that has ended."""
+
+    __tablename__ = "SeasonStandings"
+    user_id = Column(
+        Integer, ForeignKey("Users.id", ondelete="CASCADE"), primary_key=True
+    )
+    votes = Column(Integer, nullable=False, default=0)
+    challenges = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_SeasonStandings_votes", "votes"),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Unicode
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Unicode
 from sqlalchemy.sql import func
 
 from soc.database.models.base import BaseModel
@@ -11,3 +11,11 @@ class SubmissionStatusModel(BaseModel):
     updated = Column(DateTime, server_default=func.now())
     user_id = Column(Integer, ForeignKey("Users.id"))
     submission_id = Column(Integer, ForeignKey("Submissions.id", ondelete="CASCADE"))
+
+    __table_args__ = (
+        Index(
+            "ix_SubmissionStatusModel_submission_id_updated",
+            "submission_id",
+            "updated",
+        ),
+    )
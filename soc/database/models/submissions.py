@@ -1,6 +1,20 @@
-from sqlalchemy import Column, ForeignKey, Integer, Unicode
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Unicode
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.sql import func
+
 from soc.database.models.base import BaseModel
 
+# SQLite stores the server default without microseconds, binding parameters in the
+# same format keeps (created, id) cursor comparisons exact
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d " "%(hour)02d:%(minute)02d:%(second)02d"
+        )
+    ),
+    "sqlite",
+)
+
 
 class SubmissionModel(BaseModel):
     __tablename__ = "Submissions"
@@ -8,5 +22,17 @@ class SubmissionModel(BaseModel):
     type = Column(Unicode(32), nullable=False)
     link = Column(Unicode(512), nullable=False)
     description = Column(Unicode(4096), nullable=False)
+    description_html = Column(Unicode, nullable=True)
+    markdown_version = Column(Unicode(32), nullable=True)
     user_id = Column(Integer, ForeignKey("Users.id"))
     challenge_id = Column(Integer, ForeignKey("Challenges.id", ondelete="CASCADE"))
+    created = Column(Timestamp, server_default=func.now())
+    status = Column(Unicode(32), nullable=False, server_default="NONE")
+    status_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_Submissions_challenge_id_status", "challenge_id", "status"),
+        Index(
+            "ix_Submissions_challenge_id_created_id", "challenge_id", "created", "id"
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, Unicode
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, Unicode
 from sqlalchemy.sql import func
 
 from soc.database.models.base import BaseModel
@@ -8,9 +8,11 @@ class UserModel(BaseModel):
     __tablename__ = "Users"
 
     id = Column(Integer, primary_key=True)
-    username = Column(Unicode(64), nullable=False)
+    username = Column(Unicode(64), nullable=False, index=True)
     avatar = Column(Unicode(256), nullable=True)
     email = Column(Unicode(256), nullable=False, unique=True)
     password = Column(Unicode(256), nullable=False)
     joined = Column(DateTime, server_default=func.now())
     banned = Column(Boolean, default=False)
+
+    __table_args__ = (Index("ix_Users_banned_id", "banned", "id"),)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, ForeignKey, Integer, Unicode
+
+from soc.database.models.base import BaseModel
+
+
+class VoteCountModel(BaseModel):
+    __tablename__ = "VoteCounts"
+    submission_id = Column(
+        Integer, ForeignKey("Submissions.id", ondelete="CASCADE"), primary_key=True
+    )
+    emoji = Column(Unicode(128), primary_key=True)
+    votes = Column(Integer, nullable=False, default=0)
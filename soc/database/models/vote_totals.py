@@ -0,0 +1,14 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from soc.database.models.base import BaseModel
+
+
+class VoteTotalModel(BaseModel):
+    __tablename__ = "VoteTotals"
+    challenge_id = Column(
+        Integer, ForeignKey("Challenges.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("Users.id", ondelete="CASCADE"), primary_key=True
+    )
+    votes = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Unicode
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Unicode
 from sqlalchemy.sql import func
 
 from soc.database.models.base import BaseModel
@@ -11,3 +11,13 @@ class VoteModel(BaseModel):
     created = Column(DateTime, server_default=func.now())
     user_id = Column(Integer, ForeignKey("Users.id"))
     submission = Column(Integer, ForeignKey("Submissions.id", ondelete="CASCADE"))
+
+    __table_args__ = (
+        Index(
+            "ix_Votes_submission_user_id_emoji",
+            "submission",
+            "user_id",
+            "emoji",
+            unique=True,
+        ),
+    )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+from typing import Iterable
+
+
+class RevokedSessions:
+    """A Bloom filter of the IDs of revoked sessions. Signed sessions are checked
+    against it so only sessions that may have been revoked need to be looked up, the
+    lookup confirms whether they actually were. A session is never reported as not
+    revoked when it was, so every session may have been revoked until the filter is
+    loaded from the database."""
+
+    size = 2**20
+    hashes = 7
+
+    def __init__(self):
+        self._bits = bytearray(self.size // 8)
+        self.count = 0
+        self.loaded = False
+
+    def __contains__(self, session_id: int) -> bool:
+        if not self.loaded:
+            return True
+
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(session_id)
+        )
+
+    def add(self, session_id: int):
+        for position in self._get_positions(session_id):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def load(self, session_ids: Iterable[int]):
+        """Adds the revoked sessions that were found in the database, sessions revoked
+        while they were being found are kept."""
+        for session_id in session_ids:
+            self.add(session_id)
+
+        self.loaded = True
+
+    def _get_positions(self, session_id: int) -> Iterable[int]:
+        digest = blake2b(
+            session_id.to_bytes(8, "little", signed=True), digest_size=16
+        ).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
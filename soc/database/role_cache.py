@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from soc.database.models.roles import RoleModel
+
+
+class RoleCache:
+    """Holds the roles of users keyed by their ID. Roles rarely change and are only
+    changed through Users.set_roles, which invalidates the user's roles, so they're
+    kept until then. The oldest users are dropped once the cache is full."""
+
+    size = 10_000
+
+    def __init__(self):
+        self._roles: dict[int, list[str]] = {}
+        self._version = 0
+
+    async def get(
+        self, user_ids: Iterable[int], db_session: AsyncSession
+    ) -> dict[int, list[str]]:
+        """Gets the roles of every user, the roles of users that aren't cached are
+        loaded using a single query."""
+        user_ids = set(user_ids)
+        roles = {
+            user_id: list(self._roles[user_id])
+            for user_id in user_ids
+            if user_id in self._roles
+        }
+        if missing := user_ids - roles.keys():
+            roles |= await self._load(missing, db_session)
+
+        return roles
+
+    def invalidate(self, user_id: int):
+        self._roles.pop(user_id, None)
+        self._version += 1
+
+    def clear(self):
+        self._roles.clear()
+        self._version += 1
+
+    async def _load(
+        self, user_ids: set[int], db_session: AsyncSession
+    ) -> dict[int, list[str]]:
+        version = self._version
+        roles = {user_id: [] for user_id in user_ids}
+        cursor = await db_session.execute(
+            select(RoleModel.user_id, RoleModel.type).where(
+                RoleModel.user_id.in_(user_ids)
+            )
+        )
+        for user_id, role in cursor:
+            roles[user_id].append(role)
+
+        # Roles that were invalidated while loading may be stale
+        if version == self._version:
+            for user_id, user_roles in roles.items():
+                self._roles[user_id] = list(user_roles)
+
+            while len(self._roles) > self.size:
+                del self._roles[next(iter(self._roles))]
+
+        return roles
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Awaitable, Callable
+
+from soc.database.models.sessions import SessionModel
+
+
+class SessionCache:
+    """Holds recently used session rows keyed by their ID so most requests don't need
+    to read the Sessions table. Sessions are invalidated whenever they're written to
+    and expire after the TTL in case they're changed outside of this process. The
+    least recently used sessions are dropped once the cache is full."""
+
+    size = 10_000
+    ttl = 300
+
+    def __init__(self):
+        self._models: OrderedDict[int, tuple[float, SessionModel]] = OrderedDict()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}("
+            f"sessions={len(self._models)}, hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions})"
+        )
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def metrics(self) -> dict[str, int | float]:
+        return {
+            "size": len(self._models),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    async def get(
+        self,
+        session_id: int,
+        load: Callable[[int], Awaitable[SessionModel | None]],
+    ) -> SessionModel | None:
+        """Gets the session's row, loading it when it isn't cached or has expired.
+        Sessions that don't exist aren't cached."""
+        if cached := self._models.get(session_id):
+            expires, model = cached
+            if expires > monotonic():
+                self._models.move_to_end(session_id)
+                self.hits += 1
+                return model
+
+            del self._models[session_id]
+
+        self.misses += 1
+        version = self._version
+        model = await load(session_id)
+        # The session may be stale if it was invalidated while loading
+        if model and version == self._version:
+            self.add(model)
+
+        return model
+
+    def add(self, model: SessionModel):
+        self._models[model.id] = monotonic() + self.ttl, model
+        self._models.move_to_end(model.id)
+        while len(self._models) > self.size:
+            self._models.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, session_id: int):
+        self._models.pop(session_id, None)
+        self._version += 1
+
+    def clear(self):
+        self._models.clear()
+        self._version += 1
@@ -1,14 +1,21 @@
+import asyncio
 import json
-from typing import Type
+from datetime import datetime
+from typing import Any, Iterable, Type
 
 import sqlalchemy.exc
 from bevy import Bevy, bevy_method, Inject
-from sqlalchemy import update
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from soc.database.bulk import bulk_update
+from soc.database.identity_map import get_identity_map
 from soc.database.models.sessions import SessionModel
+from soc.database.revoked_sessions import RevokedSessions
+from soc.database.session_cache import SessionCache
 from soc.entities.sessions import Session
+from soc.invalidation import InvalidationBus
 
 
 class Sessions(Bevy):
@@ -21,6 +28,7 @@ class Sessions(Bevy):
         session_id: int,
         user_id: int = -1,
         db_session: AsyncSession = Inject,
+        cache: SessionCache = Inject,
         **values
     ) -> Session:
         session_model = SessionModel(
@@ -29,12 +37,36 @@ class Sessions(Bevy):
         async with db_session.begin():
             db_session.add(session_model)
 
-        return self._session_type.from_db_model(session_model)
+        cache.add(session_model)
+        return get_identity_map().add(
+            Session, session_id, self._session_type.from_db_model(session_model)
+        )
 
     @bevy_method
     async def get(
-        self, session_id: int, db_session: AsyncSession = Inject
+        self,
+        session_id: int,
+        db_session: AsyncSession = Inject,
+        cache: SessionCache = Inject,
     ) -> Session | None:
+        identity_map = get_identity_map()
+        session = identity_map.get(Session, session_id)
+        if session is not None:
+            return session
+
+        session_model = await cache.get(
+            session_id, lambda session_id: self._load(session_id, db_session)
+        )
+        if not session_model:
+            return
+
+        return identity_map.add(
+            Session, session_id, self._session_type.from_db_model(session_model)
+        )
+
+    async def _load(
+        self, session_id: int, db_session: AsyncSession
+    ) -> SessionModel | None:
         query = select(SessionModel).filter_by(id=session_id)
         async with db_session:
             try:
@@ -42,16 +74,16 @@ class Sessions(Bevy):
             except sqlalchemy.exc.OperationalError:
                 return
             else:
-                session_model = cursor.scalars().first()
-
-        if not session_model:
-            return
-
-        return self._session_type.from_db_model(session_model)
+                return cursor.scalars().first()
 
     @bevy_method
     async def set_user(
-        self, session_id: int, user_id: int, db_session: AsyncSession = Inject
+        self,
+        session_id: int,
+        user_id: int,
+        db_session: AsyncSession = Inject,
+        cache: SessionCache = Inject,
+        bus: InvalidationBus = Inject,
     ):
         async with db_session.begin():
             statement = (
@@ -62,8 +94,19 @@ class Sessions(Bevy):
             await db_session.execute(statement)
             await db_session.commit()
 
+        self._discard([session_id], cache)
+        await bus.publish("sessions", session_id)
+
     @bevy_method
-    async def revoke(self, session_id: int, db_session: AsyncSession = Inject):
+    async def revoke(
+        self,
+        session_id: int,
+        db_session: AsyncSession = Inject,
+        cache: SessionCache = Inject,
+        revoked_sessions: RevokedSessions = Inject,
+        bus: InvalidationBus = Inject,
+    ):
+        revoked_sessions.add(session_id)
         async with db_session.begin():
             statement = (
                 update(SessionModel)
@@ -73,9 +116,56 @@ class Sessions(Bevy):
             await db_session.execute(statement)
             await db_session.commit()
 
+        self._discard([session_id], cache)
+        await bus.publish("revoked_sessions", session_id)
+
+    @bevy_method
+    async def revoke_users(
+        self,
+        user_ids: Iterable[int],
+        db_session: AsyncSession = Inject,
+        cache: SessionCache = Inject,
+        revoked_sessions: RevokedSessions = Inject,
+        bus: InvalidationBus = Inject,
+    ) -> list[int]:
+        """Revokes every session the users have that hasn't been revoked, returns the
+        IDs of the sessions that were revoked."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return []
+
+        async with db_session.begin():
+            cursor = await db_session.execute(
+                select(SessionModel.id).filter(
+                    SessionModel.user_id.in_(user_ids), SessionModel.revoked.is_(False)
+                )
+            )
+            session_ids = list(cursor.scalars())
+            if session_ids:
+                await db_session.execute(
+                    update(SessionModel)
+                    .where(SessionModel.id.in_(session_ids))
+                    .values(revoked=True)
+                    .execution_options(synchronize_session=False)
+                )
+
+        for session_id in session_ids:
+            revoked_sessions.add(session_id)
+
+        self._discard(session_ids, cache)
+        for session_id in session_ids:
+            await bus.publish("revoked_sessions", session_id)
+
+        return session_ids
+
     @bevy_method
     async def update(
-        self, session_id: int, db_session: AsyncSession = Inject, **values
+        self,
+        session_id: int,
+        db_session: AsyncSession = Inject,
+        cache: SessionCache = Inject,
+        bus: InvalidationBus = Inject,
+        **values
     ):
         async with db_session.begin():
             statement = (
@@ -85,3 +175,88 @@ class Sessions(Bevy):
             )
             await db_session.execute(statement)
             await db_session.commit()
+
+        self._discard([session_id], cache)
+        await bus.publish("sessions", session_id)
+
+    async def save(self, changes: dict[int, dict[str, Any]], db_session: AsyncSession):
+        """Writes the changed fields of each session, keyed by the session ID. This must
+        be called inside of a transaction."""
+        rows = []
+        for session_id, fields in changes.items():
+            if "values" in fields:
+                fields = fields | {"values": json.dumps(fields["values"])}
+
+            rows.append({"id": session_id} | fields)
+
+        await bulk_update(db_session, SessionModel, rows)
+
+    @bevy_method
+    async def saved(
+        self,
+        sessions: Iterable[Session],
+        cache: SessionCache = Inject,
+        revoked_sessions: RevokedSessions = Inject,
+        bus: InvalidationBus = Inject,
+    ):
+        """Drops the cached sessions once their changes have been committed."""
+        for session in sessions:
+            cache.invalidate(session.id)
+            if session.revoked:
+                revoked_sessions.add(session.id)
+                await bus.publish("revoked_sessions", session.id)
+            else:
+                await bus.publish("sessions", session.id)
+
+    @bevy_method
+    async def compact(
+        self,
+        guests_before: datetime,
+        revoked_before: datetime,
+        batch_size: int = 500,
+        pause: float = 0.1,
+        db_session: AsyncSession = Inject,
+    ) -> int:
+        """Deletes the guest sessions that never had a user & the revoked sessions that
+        were created before the given times. Sessions are deleted in batches, each in
+        its own transaction, pausing (seconds) between batches so locks aren't held for
+        long. Returns how many sessions were deleted."""
+        deleted = 0
+        for condition in (
+            SessionModel.user_id.is_(None) & (SessionModel.created < guests_before),
+            SessionModel.revoked.is_(True) & (SessionModel.created < revoked_before),
+        ):
+            while True:
+                batch = select(SessionModel.id).where(condition).limit(batch_size)
+                async with db_session.begin():
+                    result = await db_session.execute(
+                        delete(SessionModel)
+                        .where(SessionModel.id.in_(batch.scalar_subquery()))
+                        .execution_options(synchronize_session=False)
+                    )
+
+                deleted += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+
+                await asyncio.sleep(pause)
+
+        return deleted
+
+    @bevy_method
+    async def get_revoked_ids(
+        self, since: datetime, db_session: AsyncSession = Inject
+    ) -> list[int]:
+        """Gets the IDs of the sessions created since the given time that have been
+        revoked."""
+        query = select(SessionModel.id).filter(
+            SessionModel.revoked.is_(True), SessionModel.created >= since
+        )
+        async with db_session:
+            return list((await db_session.execute(query)).scalars())
+
+    def _discard(self, session_ids: Iterable[int], cache: SessionCache):
+        identity_map = get_identity_map()
+        for session_id in session_ids:
+            cache.invalidate(session_id)
+            identity_map.discard(Session, session_id)
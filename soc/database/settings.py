@@ -7,6 +7,8 @@ from sqlalchemy.future import select
 from sqlalchemy.sql import update
 
 from soc.database.models.settings import SettingsModel
+from soc.database.settings_cache import NOTSET, SettingsCache
+from soc.invalidation import InvalidationBus
 
 
 class Settings(Bevy):
@@ -28,8 +30,11 @@ class Settings(Bevy):
             await self._add_update_to_session(name, value, db_session)
             await db_session.commit()
 
+        await self._invalidate([name])
+
     @bevy_method
     async def sync(self, db_session: AsyncSession = Inject):
+        names = list(self._unsynced)
         async with db_session:
             for name, value in list(self._unsynced.items()):
                 await self._add_update_to_session(name, value, db_session)
@@ -37,11 +42,23 @@ class Settings(Bevy):
 
             await db_session.commit()
 
+        await self._invalidate(names)
+
+    @bevy_method
+    async def _invalidate(
+        self,
+        names: list[str],
+        cache: SettingsCache = Inject,
+        bus: InvalidationBus = Inject,
+    ):
+        for name in names:
+            cache.invalidate(name)
+            await bus.publish("settings", name)
+
     async def _add_update_to_session(
         self, name: str, value: Any, db_session: AsyncSession
     ):
-        NOTSET = object()
-        existing_value = await self.get(name, NOTSET, use_unsynced_cache=False)
+        existing_value = await self._get_from_db(name, NOTSET)
         if existing_value is NOTSET:
             db_session.add(SettingsModel(name=name, value=value))
 
@@ -62,12 +79,13 @@ class Settings(Bevy):
         default: Any = None,
         *,
         use_unsynced_cache: bool = True,
-        db_session: AsyncSession = Inject,
+        cache: SettingsCache = Inject,
     ) -> list[Any] | dict[str, Any] | None:
         if use_unsynced_cache and name in self._unsynced:
             return self._unsynced[name]
 
-        return await self._get_from_db(name, default)
+        value = await cache.get(name, lambda name: self._get_from_db(name, NOTSET))
+        return default if value is NOTSET else value
 
     @bevy_method
     async def _get_from_db(
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+NOTSET = object()
+
+
+class SettingsCache:
+    """Holds the values of settings keyed by their name, including settings that
+    aren't set. Settings are only changed through Settings.set & Settings.sync, which
+    invalidate them, so they're kept until then."""
+
+    def __init__(self):
+        self._values: dict[str, Any] = {}
+        self._version = 0
+
+    async def get(self, name: str, load: Callable[[str], Awaitable[Any]]) -> Any:
+        """Gets the setting's value, NOTSET if the setting isn't set."""
+        if name in self._values:
+            return self._values[name]
+
+        version = self._version
+        value = await load(name)
+        # The setting may be stale if it was invalidated while loading
+        if version == self._version:
+            self._values[name] = value
+
+        return value
+
+    def invalidate(self, name: str):
+        self._values.pop(name, None)
+        self._version += 1
+
+    def clear(self):
+        self._values.clear()
+        self._version += 1
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+
+from bevy import Bevy, bevy_method, Inject
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import literal
+
+from soc.database.bulk import get_insert
+from soc.database.models.challenges import ChallengeModel
+from soc.database.models.standings import SeasonStandingModel, StandingSnapshotModel
+from soc.database.models.users import UserModel
+from soc.database.models.vote_totals import VoteTotalModel
+from soc.database.standings_cache import StandingsCache
+from soc.entities.challenges import LeaderboardEntry, SeasonStanding
+from soc.invalidation import InvalidationBus
+
+
+class Standings(Bevy):
+    @bevy_method
+    async def freeze_ended_challenges(
+        self, db_session: AsyncSession = Inject
+    ) -> list[int]:
+        """Freezes the standings of every challenge that has ended but hasn't been
+        frozen yet. Returns the IDs of the challenges that were frozen."""
+        query = select(ChallengeModel.id).where(
+            ChallengeModel.end < datetime.utcnow() - timedelta(days=1),
+            ChallengeModel.standings_frozen.is_(False),
+        )
+        async with db_session:
+            challenge_ids = (await db_session.execute(query)).scalars().all()
+
+        return [
+            challenge_id
+            for challenge_id in challenge_ids
+            if await self.freeze(challenge_id)
+        ]
+
+    @bevy_method
+    async def freeze(
+        self,
+        challenge_id: int,
+        db_session: AsyncSession = Inject,
+        cache: StandingsCache = Inject,
+        bus: InvalidationBus = Inject,
+    ) -> bool:
+        """Snapshots the challenge's final vote totals and adds them to the season
+        standings. A challenge is only ever frozen once, returns False if it was
+        already frozen."""
+        async with db_session.begin():
+            result = await db_session.execute(
+                update(ChallengeModel)
+                .where(
+                    ChallengeModel.id == challenge_id,
+                    ChallengeModel.standings_frozen.is_(False),
+                )
+                .values(standings_frozen=True)
+            )
+            if not result.rowcount:
+                return False
+
+            totals = select(
+                VoteTotalModel.challenge_id,
+                VoteTotalModel.user_id,
+                VoteTotalModel.votes,
+            ).where(
+                VoteTotalModel.challenge_id == challenge_id, VoteTotalModel.votes > 0
+            )
+            await db_session.execute(
+                StandingSnapshotModel.__table__.insert().from_select(
+                    ["challenge_id", "user_id", "votes"], totals
+                )
+            )
+
+            statement = get_insert(db_session)(SeasonStandingModel).from_select(
+                ["user_id", "votes", "challenges"],
+                select(
+                    StandingSnapshotModel.user_id,
+                    StandingSnapshotModel.votes,
+                    literal(1),
+                ).where(StandingSnapshotModel.challenge_id == challenge_id),
+            )
+            await db_session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={
+                        "votes": SeasonStandingModel.votes + statement.excluded.votes,
+                        "challenges": SeasonStandingModel.challenges + 1,
+                    },
+                )
+            )
+
+        cache.invalidate()
+        await bus.publish("standings")
+        return True
+
+    async def remove_challenge(self, challenge_id: int, db_session: AsyncSession):
+        """Subtracts a frozen challenge's snapshot from the season standings, must be
+        called in the transaction that deletes the challenge since deleting it
+        cascades to the snapshot. The standings cache must be invalidated once the
+        transaction commits."""
+        snapshot = select(StandingSnapshotModel).where(
+            StandingSnapshotModel.challenge_id == challenge_id
+        )
+        snapshot_votes = (
+            snapshot.with_only_columns(StandingSnapshotModel.votes)
+            .where(StandingSnapshotModel.user_id == SeasonStandingModel.user_id)
+            .scalar_subquery()
+        )
+        await db_session.execute(
+            update(SeasonStandingModel)
+            .where(
+                SeasonStandingModel.user_id.in_(
+                    snapshot.with_only_columns(StandingSnapshotModel.user_id)
+                )
+            )
+            .values(
+                votes=SeasonStandingModel.votes - snapshot_votes,
+                challenges=SeasonStandingModel.challenges - 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db_session.execute(
+            delete(SeasonStandingModel)
+            .where(SeasonStandingModel.challenges < 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @bevy_method
+    async def get_season(
+        self, limit: int = 10, cache: StandingsCache = Inject
+    ) -> list[SeasonStanding]:
+        return await cache.get(limit, self._load_season)
+
+    @bevy_method
+    async def _load_season(
+        self, limit: int, db_session: AsyncSession = Inject
+    ) -> list[SeasonStanding]:
+        query = (
+            select(
+                UserModel.username,
+                SeasonStandingModel.votes,
+                SeasonStandingModel.challenges,
+            )
+            .join(UserModel, UserModel.id == SeasonStandingModel.user_id)
+            .order_by(SeasonStandingModel.votes.desc())
+            .limit(limit)
+        )
+        async with db_session:
+            cursor = await db_session.execute(query)
+            return [SeasonStanding(*row) for row in cursor]
+
+    @bevy_method
+    async def get_snapshot(
+        self, challenge_id: int, db_session: AsyncSession = Inject
+    ) -> list[LeaderboardEntry]:
+        query = (
+            select(UserModel.username, StandingSnapshotModel.votes)
+            .join(UserModel, UserModel.id == StandingSnapshotModel.user_id)
+            .where(StandingSnapshotModel.challenge_id == challenge_id)
+            .order_by(StandingSnapshotModel.votes.desc())
+        )
+        async with db_session:
+            cursor = await db_session.execute(query)
+            return [LeaderboardEntry(*row) for row in cursor]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Awaitable, Callable
+
+from soc.entities.challenges import SeasonStanding
+
+
+class StandingsCache:
+    """Holds the top season standings keyed by how many were requested. The season
+    standings only change when a challenge's standings are frozen or a frozen
+    challenge is deleted, which invalidate them, so they're kept until then."""
+
+    def __init__(self):
+        self._standings: dict[int, list[SeasonStanding]] = {}
+        self._version = 0
+
+    async def get(
+        self, limit: int, load: Callable[[int], Awaitable[list[SeasonStanding]]]
+    ) -> list[SeasonStanding]:
+        if limit in self._standings:
+            return list(self._standings[limit])
+
+        version = self._version
+        standings = await load(limit)
+        # The standings may be stale if they were invalidated while loading
+        if version == self._version:
+            self._standings[limit] = list(standings)
+
+        return standings
+
+    def invalidate(self):
+        self._standings.clear()
+        self._version += 1
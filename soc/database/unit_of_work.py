@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from bevy import Bevy, bevy_method, Inject
+from fast_protocol import protocol
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import soc.database
+
+# Entities need a changed property & a mark_saved method along with save_all & saved_all
+# class methods. save_all writes the changes of a batch of entities inside of the
+# transaction, saved_all is called with the same batch once the transaction commits.
+Saveable = protocol("changed", "mark_saved", "save_all", "saved_all")
+
+_active_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "active_unit_of_work", default=None
+)
+
+
+class UnitOfWork(Bevy):
+    """Collects the entities that have pending changes so they can all be written in a
+    single transaction. A unit of work is created for each request and committed once
+    the request has been handled."""
+
+    def __init__(self):
+        self._entities: dict[int, Saveable] = {}
+        self._active = False
+
+    async def save(self, entity: Saveable):
+        """Adds the entity's changes to the unit of work. When the unit of work isn't
+        active, outside of a request, the changes are committed right away."""
+        self._entities[id(entity)] = entity
+        if not self._active:
+            await self.commit()
+
+    @bevy_method
+    async def commit(
+        self, db: soc.database.Database = Inject, db_session: AsyncSession = Inject
+    ):
+        """Writes every entity's changes in one transaction, entities of the same type
+        are written together. Nothing is written if any statement fails."""
+        batches = defaultdict(list)
+        for entity in self._entities.values():
+            if entity.changed:
+                batches[type(entity).save_all.__func__].append(entity)
+
+        self._entities.clear()
+        if not batches:
+            return
+
+        async with db_session.begin():
+            for entities in batches.values():
+                await type(entities[0]).save_all(entities, db, db_session)
+
+        for entities in batches.values():
+            await type(entities[0]).saved_all(entities, db)
+            for entity in entities:
+                entity.mark_saved()
+
+    @contextmanager
+    def activate(self) -> Iterator[UnitOfWork]:
+        token = _active_unit_of_work.set(self)
+        self._active = True
+        try:
+            yield self
+        finally:
+            self._active = False
+            _active_unit_of_work.reset(token)
+
+
+def get_unit_of_work(owner: Bevy) -> UnitOfWork:
+    """Gets the active unit of work. When there isn't one a unit of work is created
+    using the owner's context."""
+    return _active_unit_of_work.get() or owner.bevy.create(UnitOfWork)
@@ -2,13 +2,20 @@ from typing import Iterable, Type
 
 from bevy import Bevy, Inject
 from bevy.providers.function_provider import bevy_method
-from sqlalchemy import delete, update
+from sqlalchemy import delete, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql import func
 
+from soc.config.models.authentication import AuthenticationSettings
+from soc.database.cursors import decode_cursor, encode_cursor
+from soc.database.identity_map import get_identity_map
 from soc.database.models.roles import RoleModel
 from soc.database.models.users import UserModel
-from soc.entities.users import User
+from soc.database.role_cache import RoleCache
+from soc.database.sessions import Sessions
+from soc.entities.users import User, UserPage
+from soc.invalidation import InvalidationBus
 
 
 class Users(Bevy):
@@ -16,7 +23,15 @@ class Users(Bevy):
         self._user_type: Type[User] = self.bevy.bind(User)
 
     @bevy_method
-    async def ban(self, *ban_ids, session: AsyncSession = Inject):
+    async def ban(
+        self,
+        *ban_ids,
+        session: AsyncSession = Inject,
+        sessions: Sessions = Inject,
+        settings: AuthenticationSettings = Inject,
+    ):
+        """Bans the users. Signed sessions are validated without reading the user, so
+        the users' sessions are revoked to log them out."""
         async with session.begin():
             statement = (
                 update(UserModel).where(UserModel.id.in_(ban_ids)).values(banned=True)
@@ -24,6 +39,10 @@ class Users(Bevy):
             await session.execute(statement)
             await session.commit()
 
+        self._discard(ban_ids)
+        if settings.signed_sessions:
+            await sessions.revoke_users(ban_ids)
+
     @bevy_method
     async def unban(self, *ban_ids, session: AsyncSession = Inject):
         async with session.begin():
@@ -33,6 +52,8 @@ class Users(Bevy):
             await session.execute(statement)
             await session.commit()
 
+        self._discard(ban_ids)
+
     @bevy_method
     async def create(
         self,
@@ -48,11 +69,17 @@ class Users(Bevy):
         async with session.begin():
             session.add(user_model)
 
-        return self._user_type.from_db_model(user_model)
+        return get_identity_map().add(
+            User, user_model.id, self._user_type.from_db_model(user_model)
+        )
 
     @bevy_method
     async def get_all(
-        self, start: int = 0, num: int = 0, session: AsyncSession = Inject
+        self,
+        start: int = 0,
+        num: int = 0,
+        session: AsyncSession = Inject,
+        cache: RoleCache = Inject,
     ) -> list[User]:
         query = select(UserModel)
         if start:
@@ -62,8 +89,80 @@ class Users(Bevy):
             query = query.limit(num)
 
         async with session:
-            cursor = await session.execute(query)
-            return [self._user_type.from_db_model(row) for row in cursor.scalars()]
+            models = (await session.execute(query)).scalars().all()
+            roles = await cache.get([model.id for model in models], session)
+
+        return [
+            self._user_type.from_db_model(model, roles[model.id]) for model in models
+        ]
+
+    @bevy_method
+    async def get_page(
+        self,
+        cursor: str | None = None,
+        limit: int = 25,
+        banned: bool | None = None,
+        role: str | None = None,
+        session: AsyncSession = Inject,
+        cache: RoleCache = Inject,
+    ) -> UserPage:
+        """Gets a page of users ordered by ID along with an estimate of how many users
+        match the filters. The page's next cursor gets the page that follows. Raises a
+        ValueError if the cursor isn't valid."""
+        conditions = []
+        if banned is not None:
+            conditions.append(UserModel.banned == banned)
+
+        if role:
+            conditions.append(
+                UserModel.id.in_(select(RoleModel.user_id).filter_by(type=role))
+            )
+
+        page_conditions = list(conditions)
+        if cursor:
+            match decode_cursor(cursor):
+                case [int() as user_id]:
+                    page_conditions.append(UserModel.id > user_id)
+                case _:
+                    raise ValueError(f"Invalid cursor {cursor!r}")
+
+        query = (
+            select(UserModel)
+            .filter(*page_conditions)
+            .order_by(UserModel.id)
+            .limit(limit + 1)
+        )
+        async with session:
+            models = (await session.execute(query)).scalars().all()
+            next_cursor = None
+            if len(models) > limit:
+                models = models[:limit]
+                next_cursor = encode_cursor(models[-1].id)
+
+            roles = await cache.get([model.id for model in models], session)
+            total = await self._estimate_count(conditions, session)
+
+        return UserPage(
+            [self._user_type.from_db_model(model, roles[model.id]) for model in models],
+            next_cursor,
+            total,
+        )
+
+    async def _estimate_count(self, conditions: list, session: AsyncSession) -> int:
+        """Postgres keeps an estimate of the table's row count in its statistics which
+        avoids scanning every user when nothing is filtered. Filtered counts & other
+        databases fall back to counting the matching rows."""
+        if not conditions and session.bind.dialect.name == "postgresql":
+            estimate = await session.scalar(
+                text("SELECT reltuples FROM pg_class WHERE relname = 'Users'")
+            )
+            # Tables that have never been analyzed have no estimate
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+
+        return await session.scalar(
+            select(func.count(UserModel.id)).filter(*conditions)
+        )
 
     async def get_by_email(self, email: str) -> User | None:
         return await self.get_by(email=email)
@@ -76,6 +175,10 @@ class Users(Bevy):
 
     @bevy_method
     async def get_by(self, session: AsyncSession = Inject, **fields) -> User | None:
+        identity_map = get_identity_map()
+        if fields.keys() == {"id"} and (user := identity_map.get(User, fields["id"])):
+            return user
+
         query = select(UserModel).filter_by(**fields)
         async with session:
             cursor = await session.execute(query)
@@ -84,16 +187,24 @@ class Users(Bevy):
         if not user_model:
             return
 
-        return self._user_type.from_db_model(user_model)
+        return identity_map.add(
+            User, user_model.id, self._user_type.from_db_model(user_model)
+        )
+
+    async def get_roles(self, user_id: int) -> list[str]:
+        return (await self.get_roles_for([user_id]))[user_id]
 
     @bevy_method
-    async def get_roles(
-        self, user_id: int, session: AsyncSession = Inject
-    ) -> list[str]:
-        query = select(RoleModel).filter_by(user_id=user_id)
+    async def get_roles_for(
+        self,
+        user_ids: Iterable[int],
+        session: AsyncSession = Inject,
+        cache: RoleCache = Inject,
+    ) -> dict[int, list[str]]:
+        """Gets the roles of every user keyed by user ID, uncached roles are loaded
+        with a single query."""
         async with session:
-            cursor = await session.execute(query)
-            return [row.type for row in cursor.scalars()]
+            return await cache.get(user_ids, session)
 
     @bevy_method
     async def set_roles(
@@ -101,10 +212,19 @@ class Users(Bevy):
         user_id: int,
         roles: Iterable[str],
         session: AsyncSession = Inject,
+        cache: RoleCache = Inject,
+        bus: InvalidationBus = Inject,
+        sessions: Sessions = Inject,
+        settings: AuthenticationSettings = Inject,
     ):
-        current_roles = set(await self.get_roles(user_id))
+        """Sets the user's roles. Signed sessions carry the roles they were created
+        with, so the user's sessions are revoked when their roles change."""
         roles = set(roles)
         async with session.begin():
+            cursor = await session.execute(
+                select(RoleModel.type).filter_by(user_id=user_id)
+            )
+            current_roles = set(cursor.scalars())
             add_roles = roles - current_roles
             for role in add_roles:
                 session.add(RoleModel(type=role, user_id=user_id))
@@ -115,3 +235,14 @@ class Users(Bevy):
                     RoleModel.type.in_(remove_roles), RoleModel.user_id == user_id
                 )
             )
+
+        cache.invalidate(user_id)
+        self._discard([user_id])
+        await bus.publish("roles", user_id)
+        if settings.signed_sessions and (add_roles or remove_roles):
+            await sessions.revoke_users([user_id])
+
+    def _discard(self, user_ids: Iterable[int]):
+        identity_map = get_identity_map()
+        for user_id in user_ids:
+            identity_map.discard(User, user_id)
@@ -3,17 +3,20 @@ from __future__ import annotations
 import dataclasses
 import datetime
 from datetime import datetime, timedelta
-from typing import Any, Awaitable
+from typing import Any
 
-import markdown
 import pendulum
 from bevy import Bevy, bevy_method, Inject
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import soc.database
 import soc.entities.submissions as submissions
 from soc.database.models.challenges import ChallengeModel
+from soc.database.unit_of_work import get_unit_of_work
 from soc.entities.users import User
-from soc.state_property import state_property
+from soc.rendering import render_markdown
+from soc.serialization import Serializer
+from soc.state_property import state_property, StateTracked
 
 
 @dataclasses.dataclass
@@ -22,11 +25,84 @@ class LeaderboardEntry:
     votes: int
 
 
-class Challenge(Bevy):
-    title, _title, _title_state = state_property(str)
-    description, _description, _description_state = state_property(str)
-    start, _start, _start_state = state_property(datetime)
-    end, _end, _end_state = state_property(datetime)
+@dataclasses.dataclass
+class SeasonStanding:
+    username: str
+    votes: int
+    challenges: int
+
+
+@dataclasses.dataclass
+class ChallengeSummary:
+    """The fields needed to list challenges along with how many submissions they
+    have, without loading the submissions or the author."""
+
+    id: int
+    title: str
+    description: str
+    description_html: str | None
+    created: pendulum.DateTime
+    start: pendulum.DateTime
+    end: pendulum.DateTime
+    user_id: int
+    username: str | None
+    submission_count: int
+
+    @property
+    def markdown(self) -> str:
+        # Rows that haven't been rerendered since the site started have no HTML yet
+        if self.description_html is None:
+            self.description_html = render_markdown(self.description)
+
+        return self.description_html
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "created": self.created.date(),
+            "start": self.start.date(),
+            "end": self.end.date(),
+            "user_id": self.user_id,
+            "username": self.username,
+            "submission_count": self.submission_count,
+        }
+
+    @classmethod
+    def from_row(cls, row) -> ChallengeSummary:
+        return cls(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            description_html=row.description_html,
+            created=pendulum.instance(row.created),
+            start=pendulum.instance(row.start),
+            end=pendulum.instance(row.end),
+            user_id=row.user_id,
+            username=row.username,
+            submission_count=row.submission_count,
+        )
+
+
+class Challenge(StateTracked, Bevy):
+    __slots__ = (
+        "_id",
+        "_title",
+        "_description",
+        "_description_html",
+        "_created",
+        "_start",
+        "_end",
+        "_user_id",
+        "_created_by",
+        "_submissions",
+    )
+
+    title, _title_state = state_property(str, "_title")
+    description, _description_state = state_property(str, "_description")
+    start, _start_state = state_property(datetime, "_start")
+    end, _end_state = state_property(datetime, "_end")
 
     def __init__(
         self,
@@ -37,14 +113,18 @@ class Challenge(Bevy):
         start: datetime,
         end: datetime,
         user_id: int,
+        description_html: str | None = None,
     ):
         self._id = id
         self._title = title
         self._description = description
+        self._description_html = description_html
         self._created = pendulum.instance(created)
         self._start = pendulum.instance(start)
         self._end = pendulum.instance(end)
         self._user_id = user_id
+        self._created_by: User | None = None
+        self._submissions: list[submissions.Submission] | None = None
 
     def __hash__(self):
         return id(self.id)
@@ -65,23 +145,21 @@ class Challenge(Bevy):
     def active(self) -> bool:
         return self.start <= pendulum.now() < self.end + timedelta(days=1)
 
-    @property
-    def changed(self) -> bool:
-        return (
-            self._title_state.changed
-            or self._description_state.changed
-            or self._start_state.changed
-            or self._end_state.changed
-        )
-
     @property
     def created(self) -> datetime:
         return self._created
 
     @property
     @bevy_method
-    def created_by(self, db: soc.database.Database = Inject) -> Awaitable[User]:
-        return db.users.get_by_id(self._user_id)
+    async def created_by(self, db: soc.database.Database = Inject) -> User:
+        if self._created_by:
+            return self._created_by
+
+        return await db.users.get_by_id(self._user_id)
+
+    @property
+    def hydrated(self) -> bool:
+        return self._submissions is not None
 
     @property
     def id(self) -> int:
@@ -89,7 +167,14 @@ class Challenge(Bevy):
 
     @property
     def markdown(self) -> str:
-        return markdown.markdown(self.description)
+        if self._description_state.changed:
+            return render_markdown(self.description)
+
+        # Rows that haven't been rerendered since the site started have no HTML yet
+        if self._description_html is None:
+            self._description_html = render_markdown(self.description)
+
+        return self._description_html
 
     @property
     def user_id(self) -> int:
@@ -97,10 +182,13 @@ class Challenge(Bevy):
 
     @property
     @bevy_method
-    def submissions(
+    async def submissions(
         self, db: soc.database.Database = Inject
-    ) -> Awaitable[list[submissions.Submission]]:
-        return db.challenges.get_submissions(self.id)
+    ) -> list[submissions.Submission]:
+        if self._submissions is not None:
+            return self._submissions
+
+        return await db.challenges.get_submissions(self.id)
 
     @bevy_method
     async def delete(self, db: soc.database.Database = Inject):
@@ -115,31 +203,75 @@ class Challenge(Bevy):
             for entry in await db.challenges.get_leaderboard(self.id)
         ]
 
-    @bevy_method
-    async def sync(self, db: soc.database.Database = Inject):
-        if not self.changed:
-            return
+    async def sync(self):
+        if self.changed:
+            await get_unit_of_work(self).save(self)
 
+    def get_changes(self) -> dict[str, Any]:
         changes = {}
         if self._title_state.changed:
             changes["title"] = self._title
-            self._title_state.changed = False
 
         if self._description_state.changed:
             changes["description"] = self._description
-            self._description_state.changed = False
 
         if self._start_state.changed:
             changes["start"] = self._start
-            self._start_state.changed = False
 
         if self._end_state.changed:
             changes["end"] = self._end
-            self._end_state.changed = False
 
-        await db.challenges.update(**changes)
+        return changes
 
-    async def to_dict(self, expand_submissions: bool = False) -> dict[str, Any]:
+    @classmethod
+    async def save_all(
+        cls,
+        challenges: list[Challenge],
+        db: soc.database.Database,
+        db_session: AsyncSession,
+    ):
+        rendered = await db.challenges.save_challenges(
+            {challenge.id: challenge.get_changes() for challenge in challenges},
+            db_session,
+        )
+        for challenge in challenges:
+            if challenge.id in rendered:
+                challenge._description_html = rendered[challenge.id]
+
+    @classmethod
+    async def saved_all(cls, challenges: list[Challenge], db: soc.database.Database):
+        await db.challenges.challenges_saved([challenge.id for challenge in challenges])
+
+    def hydrate(
+        self,
+        created_by: User | None,
+        challenge_submissions: list[submissions.Submission],
+    ):
+        """Stores the preloaded author & submissions so that reads don't need to go
+        back to the database."""
+        self._created_by = created_by
+        self._submissions = challenge_submissions
+
+    @bevy_method
+    async def to_dict(
+        self,
+        expand_submissions: bool = False,
+        include_voters: bool = True,
+        db: soc.database.Database = Inject,
+        serializer: Serializer = Inject,
+    ) -> dict[str, Any]:
+        if not self.hydrated:
+            await db.challenges.hydrate(self)
+
+        user, *submission_dicts = await serializer.gather(
+            serializer.load(self._get_created_by_dict()),
+            *(
+                submission.to_dict(
+                    expand_user=expand_submissions, include_voters=include_voters
+                )
+                for submission in await self.submissions
+            ),
+        )
         return {
             "id": self.id,
             "title": self.title,
@@ -148,14 +280,14 @@ class Challenge(Bevy):
             "created": self.created.date(),
             "start": self.start.date(),
             "end": self.end.date(),
-            "user": await (await self.created_by).to_dict(),
+            "user": user,
             "active": self.active,
-            "submissions": [
-                await submission.to_dict(expand_user=expand_submissions)
-                for submission in await self.submissions
-            ],
+            "submissions": submission_dicts,
         }
 
+    async def _get_created_by_dict(self) -> dict[str, Any]:
+        return await (await self.created_by).to_dict()
+
     @classmethod
     def from_db_model(cls, model: ChallengeModel) -> Challenge:
         return cls(
@@ -166,4 +298,5 @@ class Challenge(Bevy):
             start=model.start,
             end=model.end,
             user_id=model.user_id,
+            description_html=model.description_html,
         )
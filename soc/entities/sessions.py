@@ -6,16 +6,28 @@ from collections.abc import MutableMapping
 from datetime import datetime
 from typing import Any
 
-from bevy import Bevy, bevy_method, Inject
+from bevy import Bevy
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import soc.database
 from soc.database.models.sessions import SessionModel
-from soc.state_property import state_property
+from soc.database.unit_of_work import get_unit_of_work
+from soc.state_property import state_property, StateTracked
 
 
-class Session(MutableMapping, Bevy):
-    user_id, _user_id, _user_id_state = state_property(int)
-    revoked, _revoked, _revoked_state = state_property(bool)
+class Session(MutableMapping, StateTracked, Bevy):
+    __slots__ = (
+        "_id",
+        "_user_id",
+        "_revoked",
+        "_created",
+        "_values",
+        "_values_changed",
+        "_roles",
+    )
+
+    user_id, _user_id_state = state_property(int, "_user_id")
+    revoked, _revoked_state = state_property(bool, "_revoked")
 
     def __init__(
         self,
@@ -24,6 +36,7 @@ class Session(MutableMapping, Bevy):
         revoked: bool,
         created: datetime,
         values: dict[str, Any],
+        roles: list[str] | None = None,
     ):
         self._id = id
         self._user_id = user_id
@@ -31,6 +44,7 @@ class Session(MutableMapping, Bevy):
         self._created = created
         self._values = values
         self._values_changed = False
+        self._roles = roles
 
     def __delitem__(self, key):
         del self._values[key]
@@ -61,6 +75,10 @@ class Session(MutableMapping, Bevy):
         self._values[key] = value
         self._values_changed = True
 
+    @property
+    def changed(self) -> bool:
+        return super().changed or self._values_changed
+
     @property
     def id(self) -> int:
         return self._id
@@ -69,23 +87,51 @@ class Session(MutableMapping, Bevy):
     def created(self) -> datetime:
         return self._created
 
+    @property
+    def roles(self) -> list[str] | None:
+        """The user's roles when they were signed into the session's token, None when
+        they weren't."""
+        return self._roles
+
     @property
     def empty(self) -> bool:
         return self.user_id == -1 and not self._values
 
-    @bevy_method
-    async def sync(self, db: soc.database.Database = Inject):
+    async def sync(self):
+        if self.changed:
+            await get_unit_of_work(self).save(self)
+
+    def get_changes(self) -> dict[str, Any]:
+        changes = {}
         if self._values_changed:
-            await db.sessions.update(self.id, **self._values)
-            self._values_changed = False
+            changes["values"] = self._values
 
         if self._user_id_state.changed:
-            await db.sessions.set_user(self.id, self.user_id)
-            self._user_id_state.changed = False
+            changes["user_id"] = self._user_id
 
         if self._revoked_state.changed:
-            await db.sessions.revoke(self.id)
-            self._revoked_state.changed = False
+            changes["revoked"] = self._revoked
+
+        return changes
+
+    def mark_saved(self):
+        self._values_changed = False
+        super().mark_saved()
+
+    @classmethod
+    async def save_all(
+        cls,
+        sessions: list[Session],
+        db: soc.database.Database,
+        db_session: AsyncSession,
+    ):
+        await db.sessions.save(
+            {session.id: session.get_changes() for session in sessions}, db_session
+        )
+
+    @classmethod
+    async def saved_all(cls, sessions: list[Session], db: soc.database.Database):
+        await db.sessions.saved(sessions)
 
     @classmethod
     def from_db_model(cls, model: SessionModel) -> Session:
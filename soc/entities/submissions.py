@@ -5,15 +5,18 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Awaitable
 
-import markdown
 import pendulum
 from bevy import Bevy, bevy_method, Inject
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import soc.database
 from soc.database.models.submission_status import SubmissionStatusModel
 from soc.database.models.submissions import SubmissionModel
+from soc.database.unit_of_work import get_unit_of_work
 from soc.entities.users import User
-from soc.state_property import state_property
+from soc.rendering import render_markdown
+from soc.serialization import Serializer
+from soc.state_property import state_property, StateTracked
 from soc.strenum import auto, StrEnum
 
 
@@ -68,9 +71,23 @@ class SubmissionStatus:
                 )
 
 
-class Submission(Bevy):
-    description, _description, _description_state = state_property(str)
-    status, _status, _status_state = state_property(SubmissionStatus)
+class Submission(StateTracked, Bevy):
+    __slots__ = (
+        "_id",
+        "_type",
+        "_description",
+        "_description_html",
+        "_link",
+        "_user_id",
+        "_challenge_id",
+        "_status",
+        "_created",
+        "_vote_counts",
+        "_created_by",
+    )
+
+    description, _description_state = state_property(str, "_description")
+    status, _status_state = state_property(SubmissionStatus, "_status")
 
     def __init__(
         self,
@@ -81,14 +98,22 @@ class Submission(Bevy):
         user_id: int,
         challenge_id: int,
         status: SubmissionStatus | None = None,
+        created: datetime | None = None,
+        vote_counts: dict[str, int] | None = None,
+        created_by: User | None = None,
+        description_html: str | None = None,
     ):
         self._id = id
         self._type = type
         self._description = description
+        self._description_html = description_html
         self._link = link
         self._user_id = user_id
         self._challenge_id = challenge_id
         self._status = status
+        self._created = pendulum.instance(created) if created else None
+        self._vote_counts = vote_counts
+        self._created_by = created_by
 
     def __hash__(self):
         return self.id
@@ -105,20 +130,22 @@ class Submission(Bevy):
             f"{self._status})"
         )
 
-    @property
-    def changed(self) -> bool:
-        return self._description_state.changed or self._status_state.changed
-
     @property
     @bevy_method
     async def created(self, db: soc.database.Database = Inject) -> pendulum.DateTime:
+        if self._created:
+            return self._created
+
         status = await db.challenges.get_submission_created_status(self.id)
         return pendulum.instance(status.updated)
 
     @property
     @bevy_method
-    def created_by(self, db: soc.database.Database = Inject) -> Awaitable[User]:
-        return db.users.get_by_id(self._user_id)
+    async def created_by(self, db: soc.database.Database = Inject) -> User:
+        if self._created_by:
+            return self._created_by
+
+        return await db.users.get_by_id(self._user_id)
 
     @property
     def id(self) -> int:
@@ -134,7 +161,14 @@ class Submission(Bevy):
 
     @property
     def markdown(self) -> str:
-        return markdown.markdown(self.description)
+        if self._description_state.changed:
+            return render_markdown(self.description)
+
+        # Rows that haven't been rerendered since the site started have no HTML yet
+        if self._description_html is None:
+            self._description_html = render_markdown(self.description)
+
+        return self._description_html
 
     @property
     def type(self) -> str:
@@ -159,54 +193,124 @@ class Submission(Bevy):
 
         return votes
 
+    @property
+    def vote_counts(self) -> Awaitable[dict[str, int]]:
+        return self._get_vote_counts()
+
+    @bevy_method
+    async def _get_vote_counts(
+        self, db: soc.database.Database = Inject
+    ) -> dict[str, int]:
+        if self._vote_counts is not None:
+            return self._vote_counts
+
+        return await db.challenges.get_submission_vote_counts(self)
+
     @bevy_method
     async def add_vote(
         self, user: int | User, emoji: str, db: soc.database.Database = Inject
     ):
         await db.challenges.add_vote_to_submission(self.id, user, emoji)
+        self._vote_counts = None
 
     @bevy_method
     async def remove_vote(
         self, user: int | User, emoji: str, db: soc.database.Database = Inject
     ):
         await db.challenges.remove_vote_from_submission(self.id, user, emoji)
+        self._vote_counts = None
 
-    @bevy_method
-    async def sync(self, db: soc.database.Database = Inject):
-        if not self.changed:
-            return
+    async def sync(self):
+        if self.changed:
+            await get_unit_of_work(self).save(self)
 
+    def get_changes(self) -> dict[str, Any]:
+        changes = {}
         if self._description_state.changed:
-            await db.challenges.update_submission(self._description)
-            self._description_state.changed = False
+            changes["description"] = self._description
 
         if self._status_state.changed:
-            self._status = await db.challenges.set_submission_status(
-                self, self._status.status, self._status.user_id
-            )
-            self._status_state.changed = False
+            changes["status"] = self._status
+
+        return changes
 
-    async def to_dict(self, expand_user: bool = False) -> dict[str, Any]:
+    @classmethod
+    async def save_all(
+        cls,
+        submissions: list[Submission],
+        db: soc.database.Database,
+        db_session: AsyncSession,
+    ):
+        statuses, rendered = await db.challenges.save_submissions(
+            {submission.id: submission.get_changes() for submission in submissions},
+            db_session,
+        )
+        for submission in submissions:
+            if submission.id in statuses:
+                submission._status = statuses[submission.id]
+
+            if submission.id in rendered:
+                submission._description_html = rendered[submission.id]
+
+    @classmethod
+    async def saved_all(cls, submissions: list[Submission], db: soc.database.Database):
+        await db.challenges.submissions_saved(
+            [
+                submission
+                for submission in submissions
+                if submission._status_state.changed
+            ]
+        )
+
+    @bevy_method
+    async def to_dict(
+        self,
+        expand_user: bool = False,
+        include_voters: bool = True,
+        serializer: Serializer = Inject,
+    ) -> dict[str, Any]:
+        created, status, votes, vote_counts, created_by = await serializer.gather(
+            serializer.load(self.created),
+            self.status.to_dict(),
+            serializer.load(self._get_votes_dict(include_voters)),
+            serializer.load(self.vote_counts),
+            serializer.load(self._get_created_by_dict(expand_user)),
+        )
         data = {
             "id": self.id,
             "type": self.type,
-            "created": await self.created,
+            "created": created,
             "description": self.description,
             "markdown": self.markdown,
             "link": self._link,
             "user_id": self._user_id,
             "challenge_id": self._challenge_id,
-            "status": await self.status.to_dict(),
-            "votes": await self.votes,
-            "created_by": await (await self.created_by).to_dict()
-            if expand_user
-            else None,
+            "status": status,
+            "votes": votes,
+            "vote_counts": vote_counts,
+            "created_by": created_by,
         }
         return data
 
+    async def _get_votes_dict(self, include_voters: bool) -> dict[str, set[int]] | None:
+        if not include_voters:
+            return None
+
+        return await self.votes
+
+    async def _get_created_by_dict(self, expand_user: bool) -> dict[str, Any] | None:
+        if not expand_user:
+            return None
+
+        return await (await self.created_by).to_dict()
+
     @classmethod
     def from_db_model(
-        cls, model: SubmissionModel, status: SubmissionStatus | None = None
+        cls,
+        model: SubmissionModel,
+        status: SubmissionStatus | None = None,
+        vote_counts: dict[str, int] | None = None,
+        created_by: User | None = None,
     ) -> Submission:
         return cls(
             id=model.id,
@@ -216,4 +320,14 @@ class Submission(Bevy):
             user_id=model.user_id,
             challenge_id=model.challenge_id,
             status=SubmissionStatus.from_db_model(status),
+            created=model.created,
+            vote_counts=vote_counts,
+            created_by=created_by,
+            description_html=model.description_html,
         )
+
+
+@dataclass
+class SubmissionPage:
+    submissions: list[Submission]
+    next_cursor: str | None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+from dataclasses import dataclass
 from typing import Any, Iterable
 
 import pydantic
@@ -9,6 +10,8 @@ from bevy import Bevy, bevy_method, Inject
 import soc.database
 from soc.database.models.users import UserModel
 
+DEFAULT_AVATAR = "https://soc.beginner.codes/static/res/account_circle_FILL0_wght400_GRAD0_opsz48-white.png"
+
 
 class User(pydantic.BaseModel, Bevy):
     id: int = pydantic.Field()
@@ -18,13 +21,11 @@ class User(pydantic.BaseModel, Bevy):
     avatar: str | None
     joined: datetime.datetime
     banned: bool
+    _roles: list[str] | None = pydantic.PrivateAttr(default=None)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.avatar = (
-            self.avatar
-            or "https://soc.beginner.codes/static/res/account_circle_FILL0_wght400_GRAD0_opsz48-white.png"
-        )
+        self.avatar = self.avatar or DEFAULT_AVATAR
 
     def __hash__(self):
         return id(self.id)
@@ -34,11 +35,15 @@ class User(pydantic.BaseModel, Bevy):
 
     @bevy_method
     async def get_roles(self, db: soc.database.Database = Inject) -> list[str]:
-        return await db.users.get_roles(self.id)
+        if self._roles is None:
+            self._roles = await db.users.get_roles(self.id)
+
+        return self._roles
 
     @bevy_method
     async def set_roles(self, roles: Iterable[str], db: soc.database.Database = Inject):
         await db.users.set_roles(self.id, roles)
+        self._roles = None
 
     @bevy_method
     async def to_dict(self) -> dict[str, Any]:
@@ -52,13 +57,24 @@ class User(pydantic.BaseModel, Bevy):
         }
 
     @classmethod
-    def from_db_model(cls, model: UserModel) -> User:
-        return cls(
+    def from_db_model(cls, model: UserModel, roles: list[str] | None = None) -> User:
+        """Skips validation, the rows come from our own database so they already
+        match the model."""
+        user = cls.construct(
             id=model.id,
             username=model.username,
             email=model.email,
             password=model.password,
-            avatar=model.avatar,
+            avatar=model.avatar or DEFAULT_AVATAR,
             joined=model.joined,
             banned=model.banned,
         )
+        user._roles = roles
+        return user
+
+
+@dataclass
+class UserPage:
+    users: list[User]
+    next_cursor: str | None
+    total: int
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import suppress
+from datetime import datetime, timedelta
+from inspect import isawaitable
+from typing import Any, Callable
+from uuid import uuid4
+
+from bevy import Bevy, bevy_method, Inject
+from fast_protocol import protocol
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+
+from soc.config.models.invalidation import InvalidationSettings
+from soc.database.models.invalidations import InvalidationModel
+
+InvalidationBackend = protocol("start", "publish", "wait_closed", "close")
+
+
+class InvalidationBus(Bevy):
+    """Tells the other replicas which cached keys have been changed so they can drop
+    them from their caches. Messages are sent through the backend chosen by the
+    invalidation settings, auto uses Postgres notifications or stays in the process
+    when it's SQLite. Polling the database has to be chosen, it's only needed when
+    several processes share a SQLite file. Nothing is sent until the bus has been
+    started.
+
+    When the backend can't connect or loses its connection it's reconnected every
+    reconnect interval (seconds). Messages may have been missed while it was
+    disconnected, so the reset callbacks are called once it reconnects."""
+
+    @bevy_method
+    def __init__(self, settings: InvalidationSettings = Inject):
+        self._settings = settings
+        self._origin = uuid4().hex
+        self._handlers: defaultdict[str, set[Callable]] = defaultdict(set)
+        self._reset_handlers: set[Callable[[], Any]] = set()
+        self._backend: InvalidationBackend | None = None
+        self._task = None
+        self.published = 0
+        self.received = 0
+        self.resets = 0
+
+    def on(self, topic: str, callback: Callable[[Any], Any] | Callable[[], Any]):
+        """Adds a callback for the topic's messages. Callbacks are given the changed
+        key, or nothing when the message has no key."""
+        self._handlers[topic].add(callback)
+
+    def off(self, topic: str, callback: Callable[[Any], Any] | Callable[[], Any]):
+        self._handlers[topic].remove(callback)
+
+    def on_reset(self, callback: Callable[[], Any]):
+        """Adds a callback that's called when the bus reconnects, it should drop
+        everything that's cached. Callbacks can be async."""
+        self._reset_handlers.add(callback)
+
+    @bevy_method
+    async def start(self, engine: AsyncEngine = Inject):
+        match self._settings.backend:
+            case "auto" if engine.dialect.name == "postgresql":
+                backend = PostgresInvalidationBackend(engine)
+            case "polling":
+                backend = PollingInvalidationBackend(
+                    engine, self._settings.poll_interval
+                )
+            case "postgres":
+                backend = PostgresInvalidationBackend(engine)
+            case "auto" | "memory":
+                backend = MemoryInvalidationBackend()
+            case "none":
+                return
+            case _:
+                raise ValueError(
+                    f"Unknown invalidation backend {self._settings.backend!r}"
+                )
+
+        self._backend = backend
+        connected = await self._connect()
+        self._task = asyncio.create_task(self._stay_connected(connected))
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        if self._backend:
+            await self._backend.close()
+            self._backend = None
+
+    async def publish(self, topic: str, key: Any = None):
+        """Sends a message to the other replicas that the key has changed. This should
+        be called after the change has been committed."""
+        if not self._backend:
+            return
+
+        payload = json.dumps({"origin": self._origin, "topic": topic, "key": key})
+        try:
+            await self._backend.publish(payload)
+        except Exception as exc:
+            print(f"Failed to publish the invalidation of {topic} {key} {exc=}")
+        else:
+            self.published += 1
+
+    async def _connect(self) -> bool:
+        try:
+            await self._backend.start(self._receive)
+        except Exception as exc:
+            print(f"Failed to connect the invalidation bus {exc=}")
+            return False
+
+        return True
+
+    async def _stay_connected(self, connected: bool):
+        while True:
+            if connected:
+                await self._backend.wait_closed()
+                print("Lost the invalidation bus connection, reconnecting")
+
+            await self._backend.close()
+            await asyncio.sleep(self._settings.reconnect_interval)
+            if connected := await self._connect():
+                await self._reset()
+
+    async def _reset(self):
+        self.resets += 1
+        for handler in list(self._reset_handlers):
+            try:
+                result = handler()
+                if isawaitable(result):
+                    await result
+            except Exception as exc:
+                print(f"Failed to reset after reconnecting the invalidation bus {exc=}")
+
+    def _receive(self, payload: str):
+        message = json.loads(payload)
+        if message["origin"] == self._origin:
+            return
+
+        self.received += 1
+        key = message["key"]
+        for handler in list(self._handlers[message["topic"]]):
+            if key is None:
+                handler()
+            else:
+                handler(key)
+
+
+class MemoryInvalidationBackend:
+    """Sends messages to every bus in the process that uses the memory backend, for
+    tests that run multiple sites in one process."""
+
+    _receivers: list[Callable[[str], None]] = []
+
+    def __init__(self):
+        self._receive = None
+        self._closed = asyncio.Event()
+
+    async def start(self, receive: Callable[[str], None]):
+        self._receive = receive
+        self._closed.clear()
+        self._receivers.append(receive)
+
+    async def publish(self, payload: str):
+        for receive in list(self._receivers):
+            receive(payload)
+
+    async def wait_closed(self):
+        await self._closed.wait()
+
+    async def close(self):
+        if self._receive in self._receivers:
+            self._receivers.remove(self._receive)
+
+
+class PostgresInvalidationBackend:
+    """Sends messages using Postgres notifications, a connection is held open to
+    listen for them. Connections can be dropped without the listener being told, so
+    the connection is checked every check interval (seconds)."""
+
+    channel = "soc_invalidations"
+    check_interval = 30
+
+    def __init__(self, engine: AsyncEngine):
+        self._engine = engine
+        self._connection = None
+        self._listener = None
+        self._closed = asyncio.Event()
+        self._task = None
+
+    async def start(self, receive: Callable[[str], None]):
+        self._closed.clear()
+        self._connection = await self._engine.connect()
+        raw_connection = await self._connection.get_raw_connection()
+        self._listener = raw_connection.driver_connection
+        self._receive = lambda connection, pid, channel, payload: receive(payload)
+        await self._listener.add_listener(self.channel, self._receive)
+        self._listener.add_termination_listener(lambda connection: self._closed.set())
+        self._task = asyncio.create_task(self._check_periodically())
+
+    async def publish(self, payload: str):
+        async with self._engine.connect() as connection:
+            await connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+            await connection.commit()
+
+    async def wait_closed(self):
+        await self._closed.wait()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        if self._listener and not self._listener.is_closed():
+            with suppress(Exception):
+                await self._listener.remove_listener(self.channel, self._receive)
+
+        if self._connection:
+            with suppress(Exception):
+                await self._connection.close()
+
+        self._listener = self._connection = None
+
+    async def _check_periodically(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self._listener.execute("SELECT 1")
+            except Exception:
+                self._closed.set()
+                return
+
+
+class PollingInvalidationBackend:
+    """Sends messages by adding them to the Invalidations table, which is polled for
+    new messages every interval (seconds). Messages older than the retention are
+    deleted. A poll that fails closes the backend, messages may have been deleted
+    before they could be read."""
+
+    retention = timedelta(minutes=5)
+    cleanup_every = 60
+
+    def __init__(self, engine: AsyncEngine, interval: float):
+        self._engine = engine
+        self._interval = interval
+        self._last_id = 0
+        self._closed = asyncio.Event()
+        self._task = None
+
+    async def start(self, receive: Callable[[str], None]):
+        self._receive = receive
+        self._closed.clear()
+        async with self._engine.connect() as connection:
+            self._last_id = await connection.scalar(
+                select(func.coalesce(func.max(InvalidationModel.id), 0))
+            )
+
+        self._task = asyncio.create_task(self._poll_periodically())
+
+    async def publish(self, payload: str):
+        async with self._engine.begin() as connection:
+            await connection.execute(insert(InvalidationModel).values(payload=payload))
+
+    async def wait_closed(self):
+        await self._closed.wait()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _poll_periodically(self):
+        polls = 0
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self._poll()
+            except Exception as exc:
+                print(f"Failed to poll for invalidations {exc=}")
+                self._closed.set()
+                return
+
+            polls += 1
+            if polls % self.cleanup_every == 0:
+                try:
+                    await self._delete_old_messages()
+                except Exception as exc:
+                    print(f"Failed to delete old invalidations {exc=}")
+
+    async def _poll(self):
+        async with self._engine.connect() as connection:
+            rows = await connection.execute(
+                select(InvalidationModel.id, InvalidationModel.payload)
+                .where(InvalidationModel.id > self._last_id)
+                .order_by(InvalidationModel.id)
+            )
+            for message_id, payload in rows:
+                self._last_id = message_id
+                self._receive(payload)
+
+    async def _delete_old_messages(self):
+        async with self._engine.begin() as connection:
+            await connection.execute(
+                delete(InvalidationModel).where(
+                    InvalidationModel.created < datetime.utcnow() - self.retention
+                )
+            )
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Iterable, Iterator
+
+from bevy import Bevy, bevy_method, Inject
+
+from soc.database import Database
+from soc.entities.challenges import LeaderboardEntry
+from soc.events import Events
+from soc.invalidation import InvalidationBus
+
+
+class _Node:
+    __slots__ = ("key", "priority", "size", "left", "right")
+
+    def __init__(self, key: tuple[int, int]):
+        self.key = key
+        self.priority = random.random()
+        self.size = 1
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+
+class _Ranking:
+    """A sorted set of (-votes, user ID) keys stored as a treap, a binary search tree
+    kept balanced by random priorities. Each node knows the size of its subtree so
+    adding, removing & ranking a key are all O(log n)."""
+
+    __slots__ = ("_root",)
+
+    def __init__(self):
+        self._root: _Node | None = None
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        stack, node = [], self._root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def __len__(self):
+        return _size(self._root)
+
+    def add(self, key: tuple[int, int]):
+        left, right = _split(self._root, key)
+        self._root = _merge(_merge(left, _Node(key)), right)
+
+    def remove(self, key: tuple[int, int]):
+        self._root = _remove(self._root, key)
+
+    def count_before(self, key: tuple) -> int:
+        """Counts the keys that sort before the key."""
+        count, node = 0, self._root
+        while node:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+
+        return count
+
+
+def _size(node: _Node | None) -> int:
+    return node.size if node else 0
+
+
+def _resize(node: _Node) -> _Node:
+    node.size = _size(node.left) + _size(node.right) + 1
+    return node
+
+
+def _split(node: _Node | None, key: tuple) -> tuple[_Node | None, _Node | None]:
+    """Splits the tree into the keys before the key & the keys from it onwards."""
+    if node is None:
+        return None, None
+
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        return _resize(node), right
+
+    left, node.left = _split(node.left, key)
+    return left, _resize(node)
+
+
+def _merge(left: _Node | None, right: _Node | None) -> _Node | None:
+    """Joins two trees where every key in the left tree sorts before the right."""
+    if not left or not right:
+        return left or right
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _resize(left)
+
+    right.left = _merge(left, right.left)
+    return _resize(right)
+
+
+def _remove(node: _Node | None, key: tuple) -> _Node | None:
+    if node is None:
+        return None
+
+    if node.key == key:
+        return _merge(node.left, node.right)
+
+    if key < node.key:
+        node.left = _remove(node.left, key)
+    else:
+        node.right = _remove(node.right, key)
+
+    return _resize(node)
+
+
+class Leaderboard:
+    """Vote totals for a single challenge kept in rank order. The ranking is a sorted
+    set of (-votes, user ID) keys so updates & rank lookups are O(log n) and the top
+    entries are the first keys."""
+
+    def __init__(self, entries: Iterable[tuple[int, str, int]] = ()):
+        self._votes: dict[int, int] = {}
+        self._usernames: dict[int, str] = {}
+        self._ranking = _Ranking()
+        for user_id, username, votes in entries:
+            self.add(user_id, username, votes)
+
+    def __eq__(self, other):
+        return isinstance(other, Leaderboard) and other._votes == self._votes
+
+    def __len__(self):
+        return len(self._ranking)
+
+    def add(self, user_id: int, username: str, votes: int):
+        """Adds votes (or removes them when negative) to the user's total."""
+        self._usernames[user_id] = username
+        current = self._votes.pop(user_id, 0)
+        if current:
+            self._ranking.remove((-current, user_id))
+
+        if current + votes > 0:
+            self._votes[user_id] = current + votes
+            self._ranking.add((-current - votes, user_id))
+
+    def rank(self, user_id: int) -> int | None:
+        """Gets the user's position on the leaderboard, users with the same number of
+        votes share a rank. Users without any votes are not ranked."""
+        if user_id not in self._votes:
+            return None
+
+        return self._ranking.count_before((-self._votes[user_id],)) + 1
+
+    def top(self, num: int | None = None) -> list[LeaderboardEntry]:
+        entries = []
+        for votes, user_id in self._ranking:
+            if len(entries) == num:
+                break
+
+            entries.append(LeaderboardEntry(self._usernames[user_id], -votes))
+
+        return entries
+
+    def votes(self, user_id: int) -> int:
+        return self._votes.get(user_id, 0)
+
+
+class Leaderboards(Bevy):
+    """Process wide leaderboards that are seeded from the database the first time
+    they're needed and then kept current using the vote events. Vote changes are sent
+    to the other replicas over the invalidation bus so every replica shows the same
+    ranking. They are periodically checked against the votes table to catch any
+    drift."""
+
+    reconcile_interval = 300
+    reconcile_attempts = 3
+
+    @bevy_method
+    def __init__(
+        self,
+        loop=None,
+        events: Events = Inject,
+        bus: InvalidationBus = Inject,
+    ):
+        self._loop = loop or asyncio.get_event_loop()
+        self._bus = bus
+        self._leaderboards: dict[int, Leaderboard] = {}
+        self._seeding: dict[int, asyncio.Task] = {}
+        self._reconciling: dict[int, list[tuple[int, str, int]]] = {}
+
+        self._loop.create_task(self._reconcile_periodically())
+        events.on("submission.votes.changed", self.on_votes_changed)
+        events.on("submission.votes.changed", self._publish_votes_changed)
+
+    async def get(self, challenge_id: int) -> Leaderboard:
+        if challenge_id not in self._leaderboards:
+            if challenge_id not in self._seeding:
+                self._seeding[challenge_id] = self._loop.create_task(
+                    self._seed(challenge_id)
+                )
+
+            await self._seeding[challenge_id]
+
+        return self._leaderboards[challenge_id]
+
+    def on_votes_changed(
+        self, challenge_id: int, user_id: int, username: str, votes: int
+    ):
+        if challenge_id in self._reconciling:
+            self._reconciling[challenge_id].append((user_id, username, votes))
+
+        if challenge_id in self._leaderboards:
+            self._leaderboards[challenge_id].add(user_id, username, votes)
+
+    def on_remote_votes_changed(self, change: list):
+        """Applies a vote change that was made on another replica."""
+        self.on_votes_changed(*change)
+
+    @bevy_method
+    async def reconcile(self, db: Database = Inject):
+        """Counts each leaderboard's votes from the votes table and replaces any that
+        have drifted. A vote that changes while the votes are counted may or may not
+        have been counted, so a leaderboard is only replaced using a count that no
+        vote changed during. Counts that differ because of those votes are retried a
+        few times and are otherwise left for the next reconcile."""
+        for challenge_id in list(self._leaderboards):
+            for _ in range(self.reconcile_attempts):
+                self._reconciling[challenge_id] = changes = []
+                try:
+                    counted = Leaderboard(await db.challenges.count_votes(challenge_id))
+                finally:
+                    del self._reconciling[challenge_id]
+
+                if counted == self._leaderboards.get(challenge_id, counted):
+                    break
+
+                if not changes:
+                    print(
+                        f"Leaderboard for challenge {challenge_id} drifted, reseeding"
+                    )
+                    self._leaderboards[challenge_id] = counted
+                    break
+
+    async def _publish_votes_changed(
+        self, challenge_id: int, user_id: int, username: str, votes: int
+    ):
+        await self._bus.publish("votes", [challenge_id, user_id, username, votes])
+
+    @bevy_method
+    async def _seed(self, challenge_id: int, db: Database = Inject):
+        try:
+            self._leaderboards[challenge_id] = Leaderboard(
+                await db.challenges.get_leaderboard(challenge_id)
+            )
+        finally:
+            del self._seeding[challenge_id]
+
+    async def _reconcile_periodically(self):
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as exc:
+                print(f"Failed to reconcile the leaderboards {exc=}")
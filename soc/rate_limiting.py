@@ -62,7 +62,10 @@ class RateLimitMiddleware:
             return {}
 
         _, session_token = auth_header.split(" ", maxsplit=1)
-        return auth_helpers.parse_token(session_token, auth_settings)
+        session_info = auth_helpers.parse_token(session_token, auth_settings)
+        # Lets the route reuse the decoded token
+        request.state.token_data = {session_token: session_info}
+        return session_info
 
     @bevy_method
     async def _send_rate_limit_response(
@@ -0,0 +1,10 @@
+import markdown
+
+# Bump the revision whenever the way descriptions are rendered changes, upgrading the
+# markdown library changes the version as well
+RENDERER_REVISION = 1
+RENDERER_VERSION = f"{RENDERER_REVISION}-{markdown.__version__}"
+
+
+def render_markdown(text: str) -> str:
+    return markdown.markdown(text)
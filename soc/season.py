@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import asyncio
+
+from bevy import Bevy, bevy_method, Inject
+
+from soc.database import Database
+
+
+class SeasonStandings(Bevy):
+    """Periodically freezes the standings of challenges that have ended so they're
+    added to the season standings exactly once."""
+
+    check_interval = 300
+
+    def __init__(self, loop=None):
+        self._loop = loop or asyncio.get_event_loop()
+        self._loop.create_task(self._freeze_periodically())
+
+    @bevy_method
+    async def freeze_ended_challenges(self, db: Database = Inject):
+        for challenge_id in await db.standings.freeze_ended_challenges():
+            print(f"Froze the standings for challenge {challenge_id}")
+
+    async def _freeze_periodically(self):
+        while True:
+            try:
+                await self.freeze_ended_challenges()
+            except Exception as exc:
+                print(f"Failed to freeze the challenge standings {exc=}")
+
+            await asyncio.sleep(self.check_interval)
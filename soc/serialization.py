@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, TypeVar
+
+from bevy import Bevy, bevy_method, Inject
+
+from soc.config.models.serialization import SerializationSettings
+
+T = TypeVar("T")
+
+
+class Serializer(Bevy):
+    """Resolves the awaitables needed to serialize an entity graph concurrently so
+    the latency is that of the slowest branch rather than the sum of every round
+    trip. Repository methods open their own pooled session, so every branch runs
+    on its own connection. Awaitables that read the database are passed through
+    load, no more than the configured concurrency of them are awaited at once
+    across every gather the serializer runs, however deeply they're nested."""
+
+    @bevy_method
+    def __init__(self, settings: SerializationSettings = Inject):
+        self._concurrency = settings.concurrency
+        self._limiter = asyncio.Semaphore(max(self._concurrency, 1))
+
+    async def gather(self, *awaitables: Awaitable[T]) -> list[T]:
+        """Awaits all the awaitables, the results are in the same order. Only the
+        awaitables passed through load are limited, so awaitables that gather more
+        awaitables never hold up the ones they're waiting on."""
+        if self._concurrency <= 1:
+            return [await awaitable for awaitable in awaitables]
+
+        return list(await asyncio.gather(*awaitables))
+
+    async def load(self, awaitable: Awaitable[T]) -> T:
+        """Awaits an awaitable that reads the database once there's capacity. It must
+        not call gather itself."""
+        async with self._limiter:
+            return await awaitable
+
+    async def serialize(self, entities, **kwargs) -> list[dict[str, Any]]:
+        """Calls to_dict on every entity, passing along the keyword args."""
+        return await self.gather(*(entity.to_dict(**kwargs) for entity in entities))
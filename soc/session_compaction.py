@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+from bevy import Bevy, bevy_method, Inject
+
+from soc.config.models.authentication import AuthenticationSettings
+from soc.config.models.sessions import SessionSettings
+from soc.database import Database
+
+
+class SessionCompactor(Bevy):
+    """Deletes the sessions that can no longer be used every compaction interval
+    (seconds), guest sessions that never logged in once they're older than the guest
+    lifetime & revoked sessions once they're older than the revoked retention. Revoked
+    sessions are kept for at least the session lifetime so the revocations of signed
+    sessions are still found when the site starts."""
+
+    @bevy_method
+    def __init__(
+        self,
+        loop=None,
+        settings: SessionSettings = Inject,
+        auth_settings: AuthenticationSettings = Inject,
+    ):
+        self._loop = loop or asyncio.get_event_loop()
+        self._settings = settings
+        self._auth_settings = auth_settings
+        self.reclaimed = 0
+        self._task = None
+        if self.enabled:
+            self._task = self._loop.create_task(self._compact_periodically())
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.compaction_interval > 0
+
+    @bevy_method
+    async def compact(self, db: Database = Inject) -> int:
+        """Deletes the sessions that can no longer be used, returns how many were
+        deleted."""
+        now = datetime.utcnow()
+        revoked_retention = max(
+            self._settings.revoked_retention, self._auth_settings.session_lifetime
+        )
+        reclaimed = await db.sessions.compact(
+            now - timedelta(seconds=self._settings.guest_lifetime),
+            now - timedelta(seconds=revoked_retention),
+            self._settings.compaction_batch_size,
+            self._settings.compaction_pause,
+        )
+        self.reclaimed += reclaimed
+        return reclaimed
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _compact_periodically(self):
+        while True:
+            await asyncio.sleep(self._settings.compaction_interval)
+            try:
+                if reclaimed := await self.compact():
+                    print(f"Reclaimed {reclaimed} sessions")
+            except Exception as exc:
+                print(f"Failed to compact the sessions {exc=}")
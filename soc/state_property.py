@@ -1,55 +1,87 @@
 from __future__ import annotations
 
-from typing import Any, cast, Generic, TypeVar, Type
-from weakref import WeakKeyDictionary
+from operator import attrgetter
+from typing import cast, Type, TypeVar
 
 T = TypeVar("T")
 
 
-class StateProperty(Generic[T]):
-    def __init__(self):
-        self._instances: WeakKeyDictionary[Any, _StateProperty[T]] = WeakKeyDictionary()
+class StateTracked:
+    """Base for entities that use state properties. The changed flags of every state
+    property are kept as bits of a single slot on the instance.
 
-    def __get__(self, instance, owner):
-        return self.get(instance)
+    Bevy doesn't declare __slots__, so entities still have a __dict__ slot. It's never
+    used so the dict is never created, it only costs a pointer per instance."""
+
+    __slots__ = ("_changed_fields",)
 
-    def get(self, instance):
-        if instance not in self._instances:
-            self._instances[instance] = _StateProperty[T]()
+    def __new__(cls, *args, **kwargs):
+        instance = super().__new__(cls)
+        instance._changed_fields = 0
+        return instance
 
-        return self._instances[instance]
+    @property
+    def changed(self) -> bool:
+        return self._changed_fields != 0
 
+    def mark_saved(self):
+        self._changed_fields = 0
 
-class _UnmonitoredProperty(Generic[T]):
-    def __init__(self, state: StateProperty):
-        self._state_property = state
+
+class StateProperty:
+    """Gives access to whether a state property has changed. The bit is assigned when
+    the owning class is created, after the bits used by the classes it inherits from."""
+
+    __slots__ = ("bit",)
+
+    def __init__(self):
+        self.bit = 0
+
+    def __set_name__(self, owner, name):
+        inherited = {
+            value
+            for base in owner.__mro__[1:]
+            for value in vars(base).values()
+            if isinstance(value, StateProperty)
+        }
+        flags = [
+            value for value in vars(owner).values() if isinstance(value, StateProperty)
+        ]
+        self.bit = 1 << (len(inherited) + flags.index(self))
 
     def __get__(self, instance, owner):
-        state = self._state_property.get(instance)
-        return state.value
+        if instance is None:
+            return self
 
-    def __set__(self, instance, value):
-        state = self._state_property.get(instance)
-        state.value = value
+        return _ChangedFlag(instance, self.bit)
 
 
-class _MonitoredProperty(_UnmonitoredProperty):
-    def __set__(self, instance, value):
-        super().__set__(instance, value)
-        state = self._state_property.get(instance)
-        state.changed = True
+class _ChangedFlag:
+    __slots__ = ("_instance", "_bit")
 
+    def __init__(self, instance: StateTracked, bit: int):
+        self._instance = instance
+        self._bit = bit
 
-class _StateProperty(Generic[T]):
-    def __init__(self):
-        self.changed = False
-        self.value = None
+    @property
+    def changed(self) -> bool:
+        return bool(self._instance._changed_fields & self._bit)
+
+    @changed.setter
+    def changed(self, changed: bool):
+        if changed:
+            self._instance._changed_fields |= self._bit
+        else:
+            self._instance._changed_fields &= ~self._bit
+
+
+def state_property(t: Type[T], slot: str) -> tuple[T, StateProperty]:
+    """Creates a property that reads the value from the slot and marks it as changed
+    when it's set. Setting the slot directly doesn't mark it as changed."""
+    state = StateProperty()
 
+    def set_value(instance: StateTracked, value: T):
+        setattr(instance, slot, value)
+        instance._changed_fields |= state.bit
 
-def state_property(t: Type[T]) -> tuple[T, T, StateProperty[T]]:
-    state = StateProperty[T]()
-    return (
-        cast(T, _MonitoredProperty(state)),
-        cast(T, _UnmonitoredProperty(state)),
-        state,
-    )
+    return cast(T, property(attrgetter(slot), set_value)), state
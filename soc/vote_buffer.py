@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+
+from bevy import Bevy, bevy_method, Inject
+
+from soc.config.models.votes import VoteSettings
+from soc.database import Database
+
+
+class VoteBuffer(Bevy):
+    """Holds votes in memory and writes them to the database in batches when write
+    behind is enabled. Each user's vote for a submission & emoji is coalesced so
+    only the last add or remove is written. Batches are flushed every flush interval
+    (milliseconds) or as soon as there are flush size pending votes. Votes that fail
+    to flush are retried with the next batch, after flush retries failures in a row
+    they're dropped so the buffer can't grow without limit while the database is
+    down."""
+
+    @bevy_method
+    def __init__(self, loop=None, settings: VoteSettings = Inject):
+        self._loop = loop or asyncio.get_event_loop()
+        self._settings = settings
+        self._pending: dict[tuple[int, int, str], bool] = {}
+        self._flushing: dict[tuple[int, int, str], bool] = {}
+        self._lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._closing = False
+        self._failures = 0
+        self._task = None
+        if self.enabled:
+            self._task = self._loop.create_task(self._flush_periodically())
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.write_behind
+
+    def add(self, submission_id: int, user_id: int, emoji: str):
+        self._set(user_id, submission_id, emoji, True)
+
+    def remove(self, submission_id: int, user_id: int, emoji: str):
+        self._set(user_id, submission_id, emoji, False)
+
+    def get_pending(self, user_id: int) -> dict[tuple[int, str], bool]:
+        """Gets the user's votes that haven't been written yet so they can be
+        shown to the user, keyed by submission ID & emoji."""
+        return {
+            (submission_id, emoji): add
+            for votes in (self._flushing, self._pending)
+            for (voter_id, submission_id, emoji), add in votes.items()
+            if voter_id == user_id
+        }
+
+    @bevy_method
+    async def flush(self, db: Database = Inject):
+        async with self._lock:
+            if not self._pending:
+                return
+
+            self._flushing, self._pending = self._pending, {}
+            self._full.clear()
+            try:
+                await db.challenges.flush_votes(self._flushing)
+            except Exception:
+                self._failures += 1
+                if self._failures > self._settings.flush_retries:
+                    print(
+                        f"Dropping {len(self._flushing)} votes after {self._failures} "
+                        f"failed flushes"
+                    )
+                    self._failures = 0
+                else:
+                    # Newer votes replace the ones that failed
+                    self._pending = self._flushing | self._pending
+
+                raise
+            except BaseException:
+                # Cancelled while writing, the votes may not have been written
+                self._pending = self._flushing | self._pending
+                raise
+            else:
+                self._failures = 0
+            finally:
+                self._flushing = {}
+
+    async def close(self):
+        """Stops flushing periodically, waiting for a flush that's in progress to
+        finish, then flushes the votes that are still pending."""
+        if self._task:
+            self._closing = True
+            self._full.set()
+            await self._task
+
+        await self.flush()
+
+    def _set(self, user_id: int, submission_id: int, emoji: str, add: bool):
+        self._pending[user_id, submission_id, emoji] = add
+        if len(self._pending) >= self._settings.flush_size:
+            self._full.set()
+
+    async def _flush_periodically(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(
+                    self._full.wait(), self._settings.flush_interval / 1000
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.flush()
+            except Exception as exc:
+                print(f"Failed to flush {len(self._pending)} votes {exc=}")
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import soc.database.challenge_cache
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.challenge_cache import ChallengeCache
+from soc.database.models.base import BaseModel
+from soc.database.models.challenges import ChallengeModel
+from soc.database.provider import DatabaseProvider
+
+START = datetime(2022, 7, 4, 12)
+
+
+class Clock(datetime):
+    now = START
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    monkeypatch.setattr(soc.database.challenge_cache, "datetime", Clock)
+    Clock.now = START
+    return Clock
+
+
+@pytest.fixture()
+def loader():
+    loader = SimpleNamespace(
+        loads=0,
+        models=[
+            ChallengeModel(id=1, start=START, end=START + timedelta(days=2)),
+            ChallengeModel(
+                id=2, start=START + timedelta(days=7), end=START + timedelta(days=9)
+            ),
+        ],
+    )
+
+    async def load(limit: int) -> list[ChallengeModel]:
+        loader.loads += 1
+        return loader.models[:limit]
+
+    loader.load = load
+    return loader
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_when_a_challenge_starts(clock, loader):
+    cache = ChallengeCache()
+    clock.now = START - timedelta(seconds=1)
+    assert await cache.get_active(loader.load) is None
+    assert await cache.get_active(loader.load) is None
+    assert loader.loads == 1
+
+    clock.now = START
+    assert (await cache.get_active(loader.load)).id == 1
+    assert loader.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_when_a_challenge_ends(clock, loader):
+    cache = ChallengeCache()
+    last_day = START + timedelta(days=3)
+    clock.now = last_day
+    assert (await cache.get_active(loader.load)).id == 1
+
+    clock.now = last_day + timedelta(microseconds=1)
+    assert await cache.get_active(loader.load) is None
+    assert loader.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_when_the_last_day_ends(clock, loader):
+    cache = ChallengeCache()
+    midnight = datetime.combine((START + timedelta(days=3)).date(), datetime.min.time())
+    clock.now = midnight - timedelta(seconds=1)
+    assert [model.id for model in await cache.get_upcoming(2, loader.load)] == [1, 2]
+
+    clock.now = midnight
+    assert [model.id for model in await cache.get_upcoming(2, loader.load)] == [2]
+    assert loader.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_doesnt_answer_past_what_it_holds(clock, loader):
+    cache = ChallengeCache()
+    cache.size = 1
+    assert await cache.get_upcoming(2, loader.load) is None
+
+    cache.size = 2
+    cache.invalidate()
+    assert len(await cache.get_upcoming(2, loader.load)) == 2
+
+
+@pytest.mark.asyncio
+async def test_updates_invalidate_the_cache(context):
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), user
+    )
+    assert (await db.challenges.get_active()).title == "Challenge"
+
+    await db.challenges.update(challenge.id, title="Updated")
+    assert (await db.challenges.get_active()).title == "Updated"
+
+    challenge = await db.challenges.get(challenge.id)
+    challenge.title = "Synced"
+    await challenge.sync()
+    assert (await db.challenges.get_active()).title == "Synced"
+
+
+@pytest.mark.asyncio
+async def test_deletes_invalidate_the_cache(context):
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), user
+    )
+    assert await db.challenges.get_active()
+
+    await db.challenges.delete_challenge(challenge.id)
+    assert await db.challenges.get_active() is None
+    assert await db.challenges.get_upcoming_challenges() == []
+
+
+@pytest.mark.asyncio
+async def test_challenges_invalidated_while_loading_arent_cached(clock, loader):
+    cache = ChallengeCache()
+
+    async def load_while_invalidated(limit: int) -> list[ChallengeModel]:
+        models = await loader.load(limit)
+        cache.invalidate()
+        return models
+
+    assert (await cache.get_active(load_while_invalidated)).id == 1
+    assert (await cache.get_active(loader.load)).id == 1
+    assert loader.loads == 2
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def challenge_ids(context: Context):
+    db = context.get(Database)
+    bob = await db.users.create("Bob", "", "bob@beginner.codes")
+    alice = await db.users.create("Alice", "", "alice@beginner.codes")
+    now = datetime.utcnow()
+    challenge_ids = []
+    for days_from_now, submission_count in ((-10, 2), (-1, 0), (5, 1)):
+        start = now + timedelta(days=days_from_now)
+        challenge = await db.challenges.create(
+            "Challenge", "", start, start + timedelta(days=2), bob
+        )
+        for _ in range(submission_count):
+            await db.challenges.create_submission(
+                "code", "https://beginner.codes", "", challenge, alice
+            )
+
+        challenge_ids.append(challenge.id)
+
+    return challenge_ids
+
+
+@pytest.mark.asyncio
+async def test_summaries_count_submissions(context, challenge_ids):
+    summaries = await context.get(Database).challenges.get_summaries()
+
+    assert [summary.id for summary in summaries] == challenge_ids
+    assert [summary.submission_count for summary in summaries] == [2, 0, 1]
+    assert {summary.username for summary in summaries} == {"Bob"}
+
+
+@pytest.mark.asyncio
+async def test_summaries_ignore_future_challenges(context, challenge_ids):
+    db = context.get(Database)
+    summaries = await db.challenges.get_summaries(ignore_future=True)
+    challenges = await db.challenges.get_all(ignore_future=True)
+
+    assert [summary.id for summary in summaries] == challenge_ids[:2]
+    assert [challenge.id for challenge in challenges] == challenge_ids[:2]
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.identity_map import IdentityMap
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def seeded(context: Context):
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), user
+    )
+    return SimpleNamespace(user_id=user.id, challenge_id=challenge.id)
+
+
+@pytest.fixture()
+def statements(context: Context):
+    statements = []
+    engine = context.get(AsyncEngine).sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    yield statements
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.asyncio
+async def test_lookups_return_the_mapped_entity(context, seeded, statements):
+    db = context.get(Database)
+    with IdentityMap().activate() as identity_map:
+        challenge = await db.challenges.get(seeded.challenge_id)
+        user = await db.users.get_by_id(seeded.user_id)
+        assert len(statements) == 2
+
+        assert await db.challenges.get(seeded.challenge_id) is challenge
+        assert await db.users.get_by_id(seeded.user_id) is user
+        assert len(statements) == 2
+        assert (identity_map.hits, identity_map.misses) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_writes_discard_the_mapped_entity(context, seeded):
+    db = context.get(Database)
+    with IdentityMap().activate():
+        challenge = await db.challenges.get(seeded.challenge_id)
+        await db.challenges.update(seeded.challenge_id, title="Updated")
+
+        updated = await db.challenges.get(seeded.challenge_id)
+        assert updated is not challenge
+        assert updated.title == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_saved_entities_are_discarded(context, seeded):
+    db = context.get(Database)
+    with IdentityMap().activate():
+        challenge = await db.challenges.get(seeded.challenge_id)
+        challenge.title = "Saved"
+        await challenge.sync()
+
+        saved = await db.challenges.get(seeded.challenge_id)
+        assert saved is not challenge
+        assert saved.title == "Saved"
+
+
+@pytest.mark.asyncio
+async def test_entities_arent_shared_outside_of_a_map(context, seeded):
+    db = context.get(Database)
+    challenge = await db.challenges.get(seeded.challenge_id)
+
+    assert await db.challenges.get(seeded.challenge_id) is not challenge
+    with IdentityMap().activate():
+        assert await db.challenges.get(seeded.challenge_id) is not challenge
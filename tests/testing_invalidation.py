@@ -0,0 +1,181 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.config.models.invalidation import InvalidationSettings
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+from soc.database.role_cache import RoleCache
+from soc.database.settings import Settings
+from soc.database.settings_cache import SettingsCache
+from soc.invalidation import (
+    InvalidationBus,
+    MemoryInvalidationBackend,
+    PollingInvalidationBackend,
+)
+from soc.leaderboard import Leaderboards
+
+
+async def create_replica(uri: str, backend: str) -> Context:
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri=uri), use_as=DatabaseSettings)
+    context.add(
+        InvalidationSettings(
+            backend=backend, poll_interval=0.01, reconnect_interval=0.01
+        ),
+        use_as=InvalidationSettings,
+    )
+    context.create(AsyncEngine, cache=True)
+    bus = context.create(InvalidationBus, cache=True)
+    bus.on("roles", context.create(RoleCache, cache=True).invalidate)
+    bus.on("settings", context.create(SettingsCache, cache=True).invalidate)
+    bus.on_reset(context.get(RoleCache).clear)
+    bus.on_reset(context.get(SettingsCache).clear)
+    bus.on("votes", context.create(Leaderboards, cache=True).on_remote_votes_changed)
+    return context
+
+
+@pytest.fixture(params=["memory", "polling"])
+async def replicas(request, tmp_path):
+    uri = f"sqlite+aiosqlite:///{tmp_path / 'soc.db'}"
+    replicas = [await create_replica(uri, request.param) for _ in range(2)]
+    async with replicas[0].get(AsyncEngine).begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    for replica in replicas:
+        await replica.get(InvalidationBus).start()
+
+    yield replicas
+    for replica in replicas:
+        await replica.get(InvalidationBus).close()
+        await replica.get(AsyncEngine).dispose()
+
+
+async def wait_for(condition, timeout: float = 1):
+    async def poll():
+        while not await condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_role_changes_invalidate_other_replicas(replicas):
+    first, second = (replica.get(Database) for replica in replicas)
+    user = await first.users.create("Bob", "", "bob@beginner.codes")
+    assert await second.users.get_roles(user.id) == []
+
+    await first.users.set_roles(user.id, ["MOD"])
+
+    async def updated():
+        return await second.users.get_roles(user.id) != []
+
+    await wait_for(updated)
+    assert await second.users.get_roles(user.id) == ["MOD"]
+    assert replicas[0].get(InvalidationBus).received == 0
+
+
+@pytest.mark.asyncio
+async def test_setting_changes_invalidate_other_replicas(replicas):
+    first, second = (replica.get(Settings) for replica in replicas)
+    assert await second.get("announcement_webhooks") is None
+
+    await first.set("announcement_webhooks", {"new_challenge": "https://"})
+
+    async def updated():
+        return await second.get("announcement_webhooks") is not None
+
+    await wait_for(updated)
+    assert await second.get("announcement_webhooks") == {"new_challenge": "https://"}
+
+
+@pytest.mark.asyncio
+async def test_votes_update_other_replicas_leaderboards(replicas):
+    first = replicas[0].get(Database)
+    author = await first.users.create("Bob", "", "bob@beginner.codes")
+    voter = await first.users.create("Amy", "", "amy@beginner.codes")
+    now = datetime.utcnow()
+    challenge = await first.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), author
+    )
+    submission = await first.challenges.create_submission(
+        "code", "https://beginner.codes", "", challenge, author
+    )
+    leaderboard = await replicas[1].get(Leaderboards).get(challenge.id)
+
+    await first.challenges.add_vote_to_submission(submission, voter, "cat")
+
+    async def updated():
+        return leaderboard.votes(author.id) == 1
+
+    await wait_for(updated)
+
+
+@pytest.mark.asyncio
+async def test_reconnecting_clears_caches(replicas):
+    first, second = (replica.get(Database) for replica in replicas)
+    user = await first.users.create("Bob", "", "bob@beginner.codes")
+    assert await second.users.get_roles(user.id) == []
+
+    # The role change is made while the second replica is disconnected
+    bus = replicas[1].get(InvalidationBus)
+    await bus.close()
+    await first.users.set_roles(user.id, ["MOD"])
+    assert await second.users.get_roles(user.id) == []
+
+    await bus.start()
+    bus._backend._closed.set()
+
+    async def reset():
+        return bus.resets == 1
+
+    await wait_for(reset)
+    assert await second.users.get_roles(user.id) == ["MOD"]
+
+
+@pytest.mark.asyncio
+async def test_failed_starts_are_retried(replicas, monkeypatch):
+    bus = replicas[1].get(InvalidationBus)
+    await bus.close()
+    backend_type = (
+        MemoryInvalidationBackend
+        if bus._settings.backend == "memory"
+        else PollingInvalidationBackend
+    )
+    start = backend_type.start
+    attempts = []
+
+    async def fail_once(self, receive):
+        attempts.append(receive)
+        if len(attempts) == 1:
+            raise ConnectionError("Database unavailable")
+
+        await start(self, receive)
+
+    monkeypatch.setattr(backend_type, "start", fail_once)
+    await bus.start()
+
+    async def reset():
+        return bus.resets == 1
+
+    await wait_for(reset)
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_auto_stays_in_process_on_sqlite(tmp_path):
+    replica = await create_replica(f"sqlite+aiosqlite:///{tmp_path / 'soc.db'}", "auto")
+    bus = replica.get(InvalidationBus)
+    await bus.start()
+    try:
+        assert isinstance(bus._backend, MemoryInvalidationBackend)
+    finally:
+        await bus.close()
+        await replica.get(AsyncEngine).dispose()
@@ -0,0 +1,124 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.challenges import Challenges
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+from soc.leaderboard import Leaderboard, Leaderboards
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+def counted_votes(monkeypatch):
+    """The vote totals returned by each call to count_votes, the callback runs while
+    the votes are being counted."""
+    counted = SimpleNamespace(results=[], calls=0, during=lambda: None)
+
+    async def count_votes(self, challenge_id):
+        counted.during()
+        counted.during = lambda: None
+        counted.calls += 1
+        return counted.results[min(counted.calls, len(counted.results)) - 1]
+
+    monkeypatch.setattr(Challenges, "count_votes", count_votes)
+    return counted
+
+
+@pytest.fixture()
+def leaderboards(context):
+    leaderboards = context.create(Leaderboards, cache=True)
+    leaderboards._leaderboards[1] = Leaderboard([(1, "Bob", 1)])
+    return leaderboards
+
+
+def test_leaderboard_ranks():
+    leaderboard = Leaderboard([(1, "Bob", 3), (2, "Amy", 5), (3, "Joe", 3)])
+    leaderboard.add(2, "Amy", -5)
+
+    assert [entry.username for entry in leaderboard.top(2)] == ["Bob", "Joe"]
+    assert leaderboard.rank(1) == leaderboard.rank(3) == 1
+    assert leaderboard.rank(2) is None
+
+
+def test_leaderboard_matches_a_sorted_ranking():
+    randomizer = random.Random(0)
+    leaderboard, totals = Leaderboard(), {}
+    for _ in range(2000):
+        user_id, votes = randomizer.randrange(50), randomizer.choice((-1, 1, 2))
+        leaderboard.add(user_id, f"User {user_id}", votes)
+        totals[user_id] = max(totals.get(user_id, 0) + votes, 0)
+
+    ranking = sorted((-votes, user_id) for user_id, votes in totals.items() if votes)
+    assert len(leaderboard) == len(ranking)
+    assert [entry.votes for entry in leaderboard.top()] == [-v for v, _ in ranking]
+    assert len(leaderboard.top(10)) == 10
+    for user_id, votes in totals.items():
+        rank = sum(other > votes for other in totals.values()) + 1
+        assert leaderboard.rank(user_id) == (rank if votes else None)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_replaces_drifted_leaderboards(leaderboards, counted_votes):
+    counted_votes.results = [[(1, "Bob", 4)]]
+
+    await leaderboards.reconcile()
+
+    assert (await leaderboards.get(1)).votes(1) == 4
+
+
+@pytest.mark.asyncio
+async def test_reconcile_doesnt_count_votes_twice(leaderboards, counted_votes):
+    """Bob's vote was committed before the votes were counted but its event arrives
+    while they're counted."""
+    counted_votes.results = [[(1, "Bob", 2)]]
+    counted_votes.during = lambda: leaderboards.on_votes_changed(1, 1, "Bob", 1)
+
+    await leaderboards.reconcile()
+
+    assert (await leaderboards.get(1)).votes(1) == 2
+    assert counted_votes.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_recounts_votes_changed_while_counting(
+    leaderboards, counted_votes
+):
+    """Bob's vote is committed after the votes were counted, so the first count is
+    retried."""
+    counted_votes.results = [[(1, "Bob", 1)], [(1, "Bob", 2)]]
+    counted_votes.during = lambda: leaderboards.on_votes_changed(1, 1, "Bob", 1)
+
+    await leaderboards.reconcile()
+
+    assert (await leaderboards.get(1)).votes(1) == 2
+    assert counted_votes.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_reconcile_replaces_leaderboards_after_a_quiet_count(
+    leaderboards, counted_votes
+):
+    counted_votes.results = [[(1, "Bob", 5)], [(1, "Bob", 4)]]
+    counted_votes.during = lambda: leaderboards.on_votes_changed(1, 1, "Bob", 1)
+
+    await leaderboards.reconcile()
+
+    assert (await leaderboards.get(1)).votes(1) == 4
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import soc.entities.challenges
+import soc.entities.submissions
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.models.challenges import ChallengeModel
+from soc.database.provider import DatabaseProvider
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def seeded(context):
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "*Old*", now - timedelta(days=1), now + timedelta(days=1), user
+    )
+    submission = await db.challenges.create_submission(
+        "code", "https://beginner.codes", "*Old*", challenge, user
+    )
+    return SimpleNamespace(challenge=challenge, submission=submission)
+
+
+@pytest.fixture()
+def renders(monkeypatch):
+    renders = []
+    for module in (soc.entities.challenges, soc.entities.submissions):
+        render_markdown = module.render_markdown
+        monkeypatch.setattr(
+            module,
+            "render_markdown",
+            lambda text, render=render_markdown: renders.append(text) or render(text),
+        )
+
+    return renders
+
+
+@pytest.mark.asyncio
+async def test_reads_use_the_stored_html(context, seeded, renders):
+    db = context.get(Database)
+    challenge = await db.challenges.get(seeded.challenge.id)
+    (summary,) = await db.challenges.get_summaries()
+    (submission,) = await db.challenges.get_submissions(seeded.challenge.id)
+
+    assert challenge.markdown == "<p><em>Old</em></p>"
+    assert summary.markdown == "<p><em>Old</em></p>"
+    assert submission.markdown == "<p><em>Old</em></p>"
+    assert renders == []
+
+
+@pytest.mark.asyncio
+async def test_saved_entities_keep_the_rendered_html(seeded, renders):
+    for entity in (seeded.challenge, seeded.submission):
+        entity.description = "*New*"
+        await entity.sync()
+
+        assert entity.markdown == "<p><em>New</em></p>"
+
+    assert renders == []
+
+
+@pytest.mark.asyncio
+async def test_unrendered_descriptions_are_rendered_on_read(context, seeded):
+    db = context.get(Database)
+    async with context.get(AsyncEngine).begin() as conn:
+        await conn.execute(
+            update(ChallengeModel).values(description_html=None, markdown_version=None)
+        )
+
+    (summary,) = await db.challenges.get_summaries()
+    challenge = await db.challenges.get(seeded.challenge.id)
+    assert summary.markdown == "<p><em>Old</em></p>"
+    assert challenge.markdown == "<p><em>Old</em></p>"
+
+    assert await db.challenges.rerender_markdown() == 1
+    (summary,) = await db.challenges.get_summaries()
+    assert summary.markdown == "<p><em>Old</em></p>"
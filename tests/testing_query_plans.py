@@ -0,0 +1,231 @@
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.cursors import encode_cursor
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+from soc.database.settings import Settings
+from soc.entities.submissions import Status, SubmissionStatus
+
+DATABASES = ["sqlite+aiosqlite://"]
+if os.environ.get("SOC_TEST_POSTGRES_URI"):
+    DATABASES.append(os.environ["SOC_TEST_POSTGRES_URI"])
+
+# Queries that are expected to read the whole table
+ALLOWED_FULL_SCANS = {"challenges.get_summaries", "users.get_all"}
+
+
+@pytest.fixture(params=DATABASES)
+async def context(request):
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri=request.param), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.drop_all)
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def seeded(context):
+    db = context.get(Database)
+    admin = await db.users.create("Admin", "", "admin@beginner.codes")
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    await db.users.set_roles(admin.id, ["ADMIN"])
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge",
+        "Description",
+        now - timedelta(days=1),
+        now + timedelta(days=1),
+        admin,
+    )
+    submission = await db.challenges.create_submission(
+        "code", "https://beginner.codes", "Description", challenge, user
+    )
+    await db.challenges.add_vote_to_submission(submission, admin, "emoji-cat")
+    await db.sessions.create(1, user.id)
+    return SimpleNamespace(
+        admin=admin, user=user, challenge=challenge, submission=submission
+    )
+
+
+def repository_queries(db: Database, settings: Settings, seeded):
+    challenge_id, submission_id = seeded.challenge.id, seeded.submission.id
+    user_id = seeded.user.id
+    return {
+        "challenges.get": lambda: db.challenges.get(challenge_id),
+        "challenges.get_active": lambda: db.challenges.get_active(),
+        "challenges.get_upcoming_challenges": lambda: (
+            db.challenges.get_upcoming_challenges(2)
+        ),
+        "challenges.get_all": lambda: db.challenges.get_all(),
+        "challenges.get_summaries": lambda: db.challenges.get_summaries(),
+        "challenges.get_submission": lambda: db.challenges.get_submission(
+            submission_id
+        ),
+        "challenges.get_submissions": lambda: db.challenges.get_submissions(
+            challenge_id, Status.APPROVED
+        ),
+        "challenges.get_submission_page": lambda: db.challenges.get_submission_page(
+            seeded.challenge,
+            encode_cursor(datetime(2000, 1, 1), 0),
+            status=Status.APPROVED,
+        ),
+        "challenges.get_submission_status": lambda: (
+            db.challenges.get_submission_status(submission_id)
+        ),
+        "challenges.get_submission_created_status": lambda: (
+            db.challenges.get_submission_created_status(submission_id)
+        ),
+        "challenges.get_submission_votes": lambda: (
+            db.challenges.get_submission_votes(submission_id)
+        ),
+        "challenges.get_submission_vote_counts": lambda: (
+            db.challenges.get_submission_vote_counts(submission_id)
+        ),
+        "challenges.get_user_votes": lambda: db.challenges.get_user_votes(
+            challenge_id, user_id
+        ),
+        "challenges.hydrate": lambda: db.challenges.hydrate(
+            seeded.challenge, exclude=[Status.DISAPPROVED]
+        ),
+        "challenges.get_leaderboard": lambda: db.challenges.get_leaderboard(
+            challenge_id
+        ),
+        "challenges.count_votes": lambda: db.challenges.count_votes(challenge_id),
+        "challenges.set_submission_status": lambda: (
+            db.challenges.set_submission_status(
+                submission_id, Status.APPROVED, seeded.admin
+            )
+        ),
+        "challenges.apply_votes": lambda: db.challenges.apply_votes(
+            seeded.admin,
+            {(submission_id, "emoji-cat"): False, (submission_id, "emoji-dog"): True},
+        ),
+        "challenges.flush_votes": lambda: db.challenges.flush_votes(
+            {
+                (seeded.admin.id, submission_id, "emoji-dog"): False,
+                (user_id, submission_id, "emoji-dog"): True,
+            }
+        ),
+        "challenges.remove_vote_from_submission": lambda: (
+            db.challenges.remove_vote_from_submission(
+                submission_id, seeded.admin, "emoji-dog"
+            )
+        ),
+        "challenges.update": lambda: db.challenges.update(challenge_id, title="New"),
+        "challenges.update_submission": lambda: db.challenges.update_submission(
+            submission_id, "New"
+        ),
+        "challenges.rerender_markdown": lambda: db.challenges.rerender_markdown(),
+        "standings.freeze": lambda: db.standings.freeze(challenge_id),
+        "standings.freeze_ended_challenges": lambda: (
+            db.standings.freeze_ended_challenges()
+        ),
+        "standings.get_season": lambda: db.standings.get_season(),
+        "standings.get_snapshot": lambda: db.standings.get_snapshot(challenge_id),
+        "users.get_all": lambda: db.users.get_all(0, 10),
+        "users.get_page": lambda: db.users.get_page(encode_cursor(0), 10),
+        "users.get_page(filtered)": lambda: db.users.get_page(
+            limit=10, banned=False, role="MOD"
+        ),
+        "users.get_page(banned)": lambda: db.users.get_page(limit=10, banned=True),
+        "users.get_by_id": lambda: db.users.get_by_id(user_id),
+        "users.get_by_email": lambda: db.users.get_by_email("bob@beginner.codes"),
+        "users.get_by_name": lambda: db.users.get_by_name("Bob"),
+        "users.get_roles": lambda: db.users.get_roles(user_id),
+        "users.get_roles_for": lambda: db.users.get_roles_for([user_id, 999]),
+        "users.set_roles": lambda: db.users.set_roles(user_id, ["MOD"]),
+        "users.ban": lambda: db.users.ban(user_id),
+        "sessions.get": lambda: db.sessions.get(1),
+        "sessions.set_user": lambda: db.sessions.set_user(1, user_id),
+        "sessions.update": lambda: db.sessions.update(1, username="Bob"),
+        "sessions.revoke": lambda: db.sessions.revoke(1),
+        "sessions.compact": lambda: db.sessions.compact(
+            datetime.utcnow() - timedelta(days=1),
+            datetime.utcnow() - timedelta(days=7),
+        ),
+        "sessions.get_revoked_ids": lambda: db.sessions.get_revoked_ids(
+            datetime.utcnow() - timedelta(days=7)
+        ),
+        "settings.get": lambda: settings.get("announcement_webhooks"),
+        "unit_of_work.commit": lambda: save_entities(db, seeded),
+    }
+
+
+async def save_entities(db: Database, seeded):
+    seeded.challenge.title = "New"
+    await seeded.challenge.sync()
+    seeded.submission.description = "New"
+    seeded.submission.status = SubmissionStatus(
+        Status.APPROVED, seeded.admin.id, seeded.submission.id
+    )
+    await seeded.submission.sync()
+    session = await db.sessions.get(1)
+    session["username"] = "Bob"
+    session.revoked = True
+    await session.sync()
+
+
+async def get_query_plan(engine: AsyncEngine, statement: str, parameters) -> str:
+    async with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            return "\n".join(row[0] for row in result)
+
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        return "\n".join(row[-1] for row in result)
+
+
+def is_full_scan(dialect: str, plan: str) -> bool:
+    if dialect == "postgresql":
+        return "Seq Scan" in plan
+
+    return any(
+        line.startswith("SCAN ")
+        and " USING " not in line
+        and not line.startswith(("SCAN CONSTANT ROW", "SCAN (subquery"))
+        for line in map(str.strip, plan.splitlines())
+    )
+
+
+@pytest.mark.asyncio
+async def test_repository_queries_use_indexes(context, seeded):
+    engine = context.get(AsyncEngine)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    queries = repository_queries(context.get(Database), context.get(Settings), seeded)
+    full_scans = []
+    for name, run_query in queries.items():
+        statements.clear()
+        await run_query()
+        for statement, parameters in list(statements):
+            plan = await get_query_plan(engine, statement, parameters)
+            if is_full_scan(engine.dialect.name, plan):
+                full_scans.append(f"{name}:\n{statement}\n{plan}")
+
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    unexpected = [
+        scan for scan in full_scans if scan.split(":", 1)[0] not in ALLOWED_FULL_SCANS
+    ]
+    assert not unexpected, "\n\n".join(unexpected)
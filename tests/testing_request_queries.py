@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from bevy import Context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import soc.auth_helpers
+from soc.apps.admin_api import admin_api
+from soc.apps.admin_app import admin_app
+from soc.apps.api import api_app
+from soc.apps.site import site
+from soc.config.models.authentication import AuthenticationSettings, JWTSettings
+from soc.config.models.config import DatabaseSettings
+from soc.context import create_context
+from soc.controllers.authentication import Authentication
+from soc.database import Database
+from soc.database.challenge_cache import ChallengeCache
+from soc.database.models.base import BaseModel
+from soc.database.role_cache import RoleCache
+from soc.database.session_cache import SessionCache
+from soc.serialization import Serializer
+
+APPS = (site, api_app, admin_app, admin_api)
+
+
+@pytest.fixture()
+async def context(tmp_path):
+    # The rate limiting middleware gets its settings from the global context
+    create_context().add(
+        AuthenticationSettings(jwt=JWTSettings(private_key="TOP SECRET TEST KEY")),
+        use_as=AuthenticationSettings,
+    )
+    context = create_context().branch()
+    context.add(
+        SimpleNamespace(uri=f"sqlite+aiosqlite:///{tmp_path / 'soc.db'}"),
+        use_as=DatabaseSettings,
+    )
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.drop_all)
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    for service in (ChallengeCache, RoleCache, Serializer, SessionCache):
+        context.create(service, cache=True)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def token(context: Context):
+    db = context.get(Database)
+    admin = await db.users.create("Admin", "", "admin@beginner.codes")
+    await db.users.set_roles(admin.id, ["ADMIN"])
+    now = datetime.utcnow()
+    await db.challenges.create(
+        "Challenge",
+        "Description",
+        now - timedelta(days=1),
+        now + timedelta(days=1),
+        admin,
+    )
+    token, _ = await context.get(Authentication).create_user_session(admin)
+    return token
+
+
+@pytest.fixture()
+async def client(context: Context):
+    for app in APPS:
+        app.dependency_overrides[create_context] = lambda: context
+
+    async with httpx.AsyncClient(app=site, base_url="http://localhost") as client:
+        yield client
+
+    for app in APPS:
+        app.dependency_overrides.pop(create_context)
+
+
+@pytest.fixture()
+def counts(context: Context, monkeypatch):
+    counts = SimpleNamespace(decodes=0, session_loads=0)
+    parse_token = soc.auth_helpers.parse_token
+
+    def count_decodes(*args):
+        counts.decodes += 1
+        return parse_token(*args)
+
+    def count_session_loads(conn, cursor, statement, *args):
+        counts.session_loads += 'FROM "Sessions"' in statement
+
+    monkeypatch.setattr(soc.auth_helpers, "parse_token", count_decodes)
+    engine = context.get(AsyncEngine).sync_engine
+    event.listen(engine, "before_cursor_execute", count_session_loads)
+    yield counts
+    event.remove(engine, "before_cursor_execute", count_session_loads)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "method, path, payload",
+    [
+        ("GET", "/v1/challenges/active", None),
+        ("GET", "/v1/standings", None),
+        ("POST", "/admin/api/v1/users/ban", {"ids": []}),
+    ],
+)
+async def test_bearer_requests_load_session_once(
+    client, token, counts, method, path, payload
+):
+    response = await client.request(
+        method, path, json=payload, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200, response.text
+    assert counts.decodes == 1
+    assert counts.session_loads <= 1
+
+
+@pytest.mark.asyncio
+async def test_cookie_requests_load_session_once(client, token, counts):
+    response = await client.get("/admin/dashboard", cookies={"sessionid": token})
+    assert response.status_code == 200, response.text
+    assert counts.decodes == 1
+    assert counts.session_loads <= 1
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from soc.config.models.authentication import AuthenticationSettings, JWTSettings
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+from soc.database.role_cache import RoleCache
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    context.add(
+        AuthenticationSettings(jwt=JWTSettings(private_key="TOP SECRET KEY")),
+        use_as=AuthenticationSettings,
+    )
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def user_ids(context: Context):
+    db = context.get(Database)
+    return [
+        (await db.users.create(name, "", f"{name}@beginner.codes")).id
+        for name in ("Alice", "Bob", "Carol")
+    ]
+
+
+@pytest.fixture()
+def statements(context: Context):
+    statements = []
+    engine = context.get(AsyncEngine).sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    yield statements
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.asyncio
+async def test_roles_are_current_after_setting_them(context, user_ids):
+    db = context.get(Database)
+    alice, bob, carol = user_ids
+    await db.users.set_roles(alice, ["ADMIN"])
+    assert await db.users.get_roles_for(user_ids) == {
+        alice: ["ADMIN"],
+        bob: [],
+        carol: [],
+    }
+
+    await db.users.set_roles(alice, ["MOD"])
+    await db.users.set_roles(bob, ["ADMIN"])
+    assert await db.users.get_roles_for(user_ids) == {
+        alice: ["MOD"],
+        bob: ["ADMIN"],
+        carol: [],
+    }
+
+    await db.users.set_roles(alice, [])
+    assert await db.users.get_roles(alice) == []
+
+
+@pytest.mark.asyncio
+async def test_roles_are_only_loaded_once(context, user_ids, statements):
+    db = context.get(Database)
+    alice, bob, _ = user_ids
+    await db.users.get_roles_for([alice])
+    await db.users.get_roles_for([alice, bob])
+    assert len(statements) == 2
+
+    roles = await db.users.get_roles_for(user_ids)
+    roles[alice].append("ADMIN")
+    assert await db.users.get_roles(alice) == []
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_roles_invalidated_while_loading_arent_cached(context, user_ids):
+    cache = RoleCache()
+    alice, *_ = user_ids
+
+    class InvalidatingSession:
+        async def execute(self, query):
+            cache.invalidate(alice)
+            async with context.get(AsyncSession) as session:
+                return await session.execute(query)
+
+    assert await cache.get([alice], InvalidatingSession()) == {alice: []}
+    assert cache._roles == {}
+
+
+@pytest.mark.asyncio
+async def test_oldest_roles_are_dropped(context, user_ids):
+    cache = RoleCache()
+    cache.size = 2
+    async with context.get(AsyncSession) as session:
+        for user_id in user_ids:
+            await cache.get([user_id], session)
+
+    assert list(cache._roles) == user_ids[1:]
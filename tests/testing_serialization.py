@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from soc.config.models.serialization import SerializationSettings
+from soc.serialization import Serializer
+
+
+@pytest.fixture()
+def serializer():
+    return Serializer(settings=SerializationSettings(concurrency=3))
+
+
+@pytest.fixture()
+def calls():
+    return SimpleNamespace(in_flight=0, peak=0)
+
+
+async def read(calls, value, delay=0.01):
+    calls.in_flight += 1
+    calls.peak = max(calls.peak, calls.in_flight)
+    await asyncio.sleep(delay)
+    calls.in_flight -= 1
+    return value
+
+
+async def serialize_entity(serializer, calls, entity_id):
+    created, votes = await serializer.gather(
+        serializer.load(read(calls, f"{entity_id}-created")),
+        serializer.load(read(calls, f"{entity_id}-votes")),
+    )
+    return {"id": entity_id, "created": created, "votes": votes}
+
+
+@pytest.mark.asyncio
+async def test_nested_gathers_share_the_limit(serializer, calls):
+    results = await serializer.gather(
+        *(serialize_entity(serializer, calls, entity_id) for entity_id in range(10))
+    )
+
+    assert calls.peak == 3
+    assert [result["id"] for result in results] == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_serializations_share_the_limit(serializer, calls):
+    await asyncio.gather(
+        *(
+            serializer.gather(
+                *(
+                    serialize_entity(serializer, calls, entity_id)
+                    for entity_id in range(5)
+                )
+            )
+            for _ in range(4)
+        )
+    )
+
+    assert calls.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_results_keep_their_order(serializer, calls):
+    results = await serializer.gather(
+        *(
+            serializer.load(read(calls, value, delay=(5 - value) / 1000))
+            for value in range(5)
+        )
+    )
+
+    assert results == list(range(5))
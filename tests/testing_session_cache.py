@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import soc.database.session_cache
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.models.sessions import SessionModel
+from soc.database.provider import DatabaseProvider
+from soc.database.session_cache import SessionCache
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(soc.database.session_cache, "monotonic", lambda: clock.now)
+    return clock
+
+
+@pytest.fixture()
+def loader():
+    loader = SimpleNamespace(loads=[])
+
+    async def load(session_id: int) -> SessionModel | None:
+        loader.loads.append(session_id)
+        return SessionModel(id=session_id) if session_id > 0 else None
+
+    loader.load = load
+    return loader
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+def statements(context: Context):
+    statements = []
+    engine = context.get(AsyncEngine).sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    yield statements
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.asyncio
+async def test_sessions_expire_after_the_ttl(clock, loader):
+    cache = SessionCache()
+    model = await cache.get(1, loader.load)
+
+    clock.now += cache.ttl - 1
+    assert await cache.get(1, loader.load) is model
+    assert loader.loads == [1]
+
+    clock.now += 1
+    assert await cache.get(1, loader.load) is not model
+    assert loader.loads == [1, 1]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_sessions_are_evicted(clock, loader):
+    cache = SessionCache()
+    cache.size = 2
+    for session_id in (1, 2, 1, 3):
+        await cache.get(session_id, loader.load)
+
+    assert list(cache._models) == [1, 3]
+    assert cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_and_stale_sessions_arent_cached(clock, loader):
+    cache = SessionCache()
+    assert await cache.get(-1, loader.load) is None
+
+    async def load_while_invalidated(session_id: int) -> SessionModel:
+        cache.invalidate(session_id)
+        return await loader.load(session_id)
+
+    assert await cache.get(1, load_while_invalidated)
+    assert len(cache._models) == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_evict_cached_sessions(context, statements):
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    await db.sessions.create(1, None)
+    await db.sessions.create(2, user.id)
+    statements.clear()
+
+    assert (await db.sessions.get(1)).user_id is None
+    assert not statements
+
+    await db.sessions.set_user(1, user.id)
+    assert (await db.sessions.get(1)).user_id == user.id
+
+    await db.sessions.revoke(1)
+    assert (await db.sessions.get(1)).revoked
+
+    await db.sessions.revoke_users([user.id])
+    assert (await db.sessions.get(2)).revoked
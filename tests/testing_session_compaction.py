@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from soc.config.models.authentication import AuthenticationSettings, JWTSettings
+from soc.config.models.config import DatabaseSettings
+from soc.config.models.sessions import SessionSettings
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.models.sessions import SessionModel
+from soc.database.provider import DatabaseProvider
+from soc.session_compaction import SessionCompactor
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def session_ids(context: Context):
+    """Creates each kind of session with its age in days, returns their IDs by kind."""
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    kinds = {
+        "old_guests": (None, False, 10, 5),
+        "new_guests": (None, False, 0, 1),
+        "old_revoked": (user.id, True, 10, 3),
+        "recent_revoked": (user.id, True, 3, 1),
+        "old_users": (user.id, False, 10, 1),
+    }
+    session_ids = {}
+    next_id = 1
+    for kind, (user_id, _, _, count) in kinds.items():
+        session_ids[kind] = list(range(next_id, next_id + count))
+        next_id += count
+        for session_id in session_ids[kind]:
+            await db.sessions.create(session_id, user_id)
+
+    now = datetime.utcnow()
+    async with context.get(AsyncEngine).begin() as conn:
+        for kind, (_, revoked, days_old, _) in kinds.items():
+            await conn.execute(
+                update(SessionModel)
+                .where(SessionModel.id.in_(session_ids[kind]))
+                .values(revoked=revoked, created=now - timedelta(days=days_old))
+            )
+
+    return session_ids
+
+
+@pytest.fixture()
+def deletes(context: Context):
+    deletes = []
+    engine = context.get(AsyncEngine).sync_engine
+
+    def listener(conn, cursor, statement, *args):
+        if statement.startswith("DELETE"):
+            deletes.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    yield deletes
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+async def get_remaining(context: Context) -> set[int]:
+    async with context.get(AsyncSession) as session:
+        return set((await session.execute(select(SessionModel.id))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_compaction_deletes_in_batches(context, session_ids, deletes):
+    now = datetime.utcnow()
+    deleted = await context.get(Database).sessions.compact(
+        now - timedelta(days=1), now - timedelta(days=7), batch_size=2, pause=0
+    )
+
+    assert deleted == 8
+    # 5 old guests take 3 batches, 3 old revoked sessions take 2
+    assert len(deletes) == 5
+    assert await get_remaining(context) == {
+        *session_ids["new_guests"],
+        *session_ids["recent_revoked"],
+        *session_ids["old_users"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_revoked_sessions_are_kept_for_the_session_lifetime(context, session_ids):
+    context.add(
+        SessionSettings(compaction_interval=0, guest_lifetime=DAY, revoked_retention=0),
+        use_as=SessionSettings,
+    )
+    context.add(
+        AuthenticationSettings(
+            jwt=JWTSettings(private_key="TOP SECRET KEY"), session_lifetime=7 * DAY
+        ),
+        use_as=AuthenticationSettings,
+    )
+    compactor = context.create(SessionCompactor)
+
+    assert await compactor.compact() == 8
+    assert compactor.reclaimed == 8
+    assert set(session_ids["recent_revoked"]) <= await get_remaining(context)
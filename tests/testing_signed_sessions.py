@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from bevy import Context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.apps.admin_api import admin_api
+from soc.apps.admin_app import admin_app
+from soc.apps.api import api_app
+from soc.apps.site import site
+from soc.auth_helpers import parse_token
+from soc.config.models.authentication import AuthenticationSettings, JWTSettings
+from soc.config.models.config import DatabaseSettings
+from soc.context import create_context
+from soc.controllers.authentication import Authentication
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.revoked_sessions import RevokedSessions
+
+APPS = (site, api_app, admin_app, admin_api)
+ADMIN_ENDPOINT = "/admin/api/v1/users/ban"
+
+
+@pytest.fixture()
+async def context(tmp_path):
+    settings = AuthenticationSettings(
+        jwt=JWTSettings(private_key="TOP SECRET TEST KEY"), signed_sessions=True
+    )
+    create_context().add(settings, use_as=AuthenticationSettings)
+    context = create_context().branch()
+    context.add(settings, use_as=AuthenticationSettings)
+    context.add(
+        SimpleNamespace(uri=f"sqlite+aiosqlite:///{tmp_path / 'soc.db'}"),
+        use_as=DatabaseSettings,
+    )
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    context.create(RevokedSessions, cache=True).load([])
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def admin(context: Context):
+    db = context.get(Database)
+    admin = await db.users.create("Admin", "", "admin@beginner.codes")
+    await db.users.set_roles(admin.id, ["ADMIN"])
+    return admin
+
+
+@pytest.fixture()
+async def token(context: Context, admin):
+    token, _ = await context.get(Authentication).create_user_session(admin)
+    return token
+
+
+@pytest.fixture()
+async def client(context: Context):
+    for app in APPS:
+        app.dependency_overrides[create_context] = lambda: context
+
+    async with httpx.AsyncClient(app=site, base_url="http://localhost") as client:
+        yield client
+
+    for app in APPS:
+        app.dependency_overrides.pop(create_context)
+
+
+async def request_admin_endpoint(client: httpx.AsyncClient, token: str) -> int:
+    response = await client.post(
+        ADMIN_ENDPOINT, json={"ids": []}, headers={"Authorization": f"Bearer {token}"}
+    )
+    return response.status_code
+
+
+@pytest.mark.asyncio
+async def test_signed_sessions_are_not_loaded(context, client, token):
+    statements = []
+    engine = context.get(AsyncEngine).sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert await request_admin_endpoint(client, token) == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert not any('FROM "Sessions"' in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_removing_roles_revokes_signed_sessions(context, client, admin, token):
+    assert await request_admin_endpoint(client, token) == 200
+
+    await context.get(Database).users.set_roles(admin.id, [])
+
+    assert await request_admin_endpoint(client, token) == 403
+
+
+@pytest.mark.asyncio
+async def test_unchanged_roles_keep_signed_sessions(context, client, admin, token):
+    await context.get(Database).users.set_roles(admin.id, ["ADMIN"])
+
+    assert await request_admin_endpoint(client, token) == 200
+
+
+@pytest.mark.asyncio
+async def test_banning_revokes_sessions(context, client, admin, token):
+    await context.get(Database).users.ban(admin.id)
+
+    assert await request_admin_endpoint(client, token) == 403
+    session_info = parse_token(token, context.get(AuthenticationSettings))
+    assert session_info["session_id"] in context.get(RevokedSessions)
+
+
+@pytest.mark.asyncio
+async def test_banning_keeps_unsigned_sessions(context, admin):
+    context.add(
+        AuthenticationSettings(jwt=JWTSettings(private_key="TOP SECRET TEST KEY")),
+        use_as=AuthenticationSettings,
+    )
+    db = context.get(Database)
+    await db.sessions.create(1, admin.id)
+
+    await db.users.ban(admin.id)
+
+    assert not (await db.sessions.get(1)).revoked
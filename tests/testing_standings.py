@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+from soc.entities.challenges import LeaderboardEntry, SeasonStanding
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def seeded(context: Context):
+    db = context.get(Database)
+    author = await db.users.create("Author", "", "author@beginner.codes")
+    voter = await db.users.create("Voter", "", "voter@beginner.codes")
+    now = datetime.utcnow()
+    challenges = []
+    for days_ago, votes in ((10, ("cat", "dog")), (5, ("cat",)), (-5, ("cat",))):
+        start = now - timedelta(days=days_ago + 3)
+        challenge = await db.challenges.create(
+            "Challenge", "", start, start + timedelta(days=2), author
+        )
+        submission = await db.challenges.create_submission(
+            "code", "https://beginner.codes", "", challenge, author
+        )
+        for emoji in votes:
+            await db.challenges.add_vote_to_submission(submission.id, voter, emoji)
+
+        challenges.append(challenge)
+
+    return SimpleNamespace(author=author, challenges=challenges)
+
+
+@pytest.mark.asyncio
+async def test_ended_challenges_are_frozen_once(context, seeded):
+    db = context.get(Database)
+    first, second, ongoing = seeded.challenges
+
+    assert await db.standings.freeze_ended_challenges() == [first.id, second.id]
+    assert await db.standings.freeze_ended_challenges() == []
+    assert not await db.standings.freeze(first.id)
+
+    assert await db.standings.get_snapshot(first.id) == [LeaderboardEntry("Author", 2)]
+    assert await db.standings.get_snapshot(ongoing.id) == []
+    assert await db.standings.get_season() == [SeasonStanding("Author", 3, 2)]
+
+
+@pytest.mark.asyncio
+async def test_deleting_frozen_challenges_updates_the_season(context, seeded):
+    db = context.get(Database)
+    first, second, _ = seeded.challenges
+    await db.standings.freeze_ended_challenges()
+
+    await db.challenges.delete_challenge(first.id)
+    assert await db.standings.get_season() == [SeasonStanding("Author", 1, 1)]
+
+    await db.challenges.delete_challenge(second.id)
+    assert await db.standings.get_season() == []
+
+
+@pytest.mark.asyncio
+async def test_season_standings_are_cached_until_they_change(context, seeded):
+    db = context.get(Database)
+    first, second, _ = seeded.challenges
+    await db.standings.freeze(first.id)
+    assert await db.standings.get_season() == [SeasonStanding("Author", 2, 1)]
+
+    statements = []
+    engine = context.get(AsyncEngine).sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert await db.standings.get_season() == [SeasonStanding("Author", 2, 1)]
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert statements == []
+
+    await db.standings.freeze(second.id)
+    assert await db.standings.get_season() == [SeasonStanding("Author", 3, 2)]
+
+    await db.challenges.delete_challenge(first.id)
+    assert await db.standings.get_season() == [SeasonStanding("Author", 1, 1)]
@@ -0,0 +1,56 @@
+import gc
+from datetime import datetime
+
+from bevy import Context
+
+import soc.database  # Imported first to avoid the entities circular import
+from soc.entities.challenges import Challenge
+from soc.state_property import state_property, StateTracked
+
+
+class Parent(StateTracked):
+    __slots__ = ("_a", "_b")
+
+    a, _a_state = state_property(int, "_a")
+    b, _b_state = state_property(int, "_b")
+
+
+class Child(Parent):
+    __slots__ = ("_c",)
+
+    c, _c_state = state_property(int, "_c")
+    a, _a_state = state_property(int, "_a")
+
+
+def test_subclasses_use_their_own_bits():
+    bits = {
+        Parent._a_state.bit,
+        Parent._b_state.bit,
+        Child._c_state.bit,
+        Child._a_state.bit,
+    }
+    assert len(bits) == 4
+
+    child = Child()
+    child.c = 1
+    assert child._c_state.changed
+    assert not child._a_state.changed
+    assert not child._b_state.changed
+
+    child.b = 1
+    child._c_state.changed = False
+    assert child._b_state.changed
+    assert not child._c_state.changed
+
+
+def test_bound_entities_dont_create_a_dict():
+    now = datetime.utcnow()
+    challenge = Context.factory().bind(Challenge)(1, "", "", now, now, now, 1)
+    challenge.title = "Title"
+
+    assert challenge.changed
+    slots = [getattr(challenge, slot) for slot in Challenge.__slots__]
+    assert not any(
+        type(referent) is dict and all(referent is not value for value in slots)
+        for referent in gc.get_referents(challenge)
+    )
@@ -0,0 +1,136 @@
+import base64
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from bevy import Context
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.apps.admin_api import admin_api
+from soc.apps.admin_app import admin_app
+from soc.apps.api import api_app
+from soc.apps.site import site
+from soc.config.models.authentication import AuthenticationSettings, JWTSettings
+from soc.config.models.config import DatabaseSettings
+from soc.context import create_context
+from soc.controllers.authentication import Authentication
+from soc.database import Database
+from soc.database.cursors import encode_cursor
+from soc.database.models.base import BaseModel
+from soc.database.models.submissions import SubmissionModel
+
+APPS = (site, api_app, admin_app, admin_api)
+
+
+@pytest.fixture()
+async def context(tmp_path):
+    settings = AuthenticationSettings(jwt=JWTSettings(private_key="TOP SECRET KEY"))
+    create_context().add(settings, use_as=AuthenticationSettings)
+    context = create_context().branch()
+    context.add(
+        SimpleNamespace(uri=f"sqlite+aiosqlite:///{tmp_path / 'soc.db'}"),
+        use_as=DatabaseSettings,
+    )
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def seeded(context: Context):
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), user
+    )
+    submission_ids = [
+        (
+            await db.challenges.create_submission(
+                "code", "https://beginner.codes", "", challenge, user
+            )
+        ).id
+        for _ in range(5)
+    ]
+    token, _ = await context.get(Authentication).create_user_session(user)
+    return SimpleNamespace(
+        challenge=challenge,
+        submission_ids=submission_ids,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+@pytest.fixture()
+async def client(context: Context):
+    for app in APPS:
+        app.dependency_overrides[create_context] = lambda: context
+
+    async with httpx.AsyncClient(app=site, base_url="http://localhost") as client:
+        yield client
+
+    for app in APPS:
+        app.dependency_overrides.pop(create_context)
+
+
+async def get_pages(client, seeded, limit: int) -> list[list[int]]:
+    pages, params = [], {"limit": limit}
+    while True:
+        response = await client.get(
+            f"/v1/challenges/{seeded.challenge.id}/submissions",
+            params=params,
+            headers=seeded.headers,
+        )
+        assert response.status_code == 200
+        page = response.json()
+        pages.append([submission["id"] for submission in page["submissions"]])
+        if not page["next_cursor"]:
+            return pages
+
+        params["cursor"] = page["next_cursor"]
+
+
+@pytest.mark.asyncio
+async def test_pages_break_ties_on_created_by_id(context, client, seeded):
+    async with context.get(AsyncEngine).begin() as conn:
+        await conn.execute(
+            update(SubmissionModel).values(created=datetime(2022, 7, 4, 12))
+        )
+
+    pages = await get_pages(client, seeded, limit=2)
+
+    ids = seeded.submission_ids
+    assert pages == [ids[:2], ids[2:4], ids[4:]]
+
+
+@pytest.mark.asyncio
+async def test_full_last_page_has_no_next_cursor(client, seeded):
+    pages = await get_pages(client, seeded, limit=5)
+
+    assert pages == [seeded.submission_ids]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        base64.urlsafe_b64encode(b"{}").decode(),
+        base64.urlsafe_b64encode(b"\xff").decode(),
+        encode_cursor("yesterday", 1),
+        encode_cursor(datetime(2022, 7, 4), "1"),
+        encode_cursor(datetime(2022, 7, 4)),
+    ],
+)
+async def test_tampered_cursors_are_rejected(client, seeded, cursor):
+    response = await client.get(
+        f"/v1/challenges/{seeded.challenge.id}/submissions",
+        params={"cursor": cursor},
+        headers=seeded.headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.config.models.config import DatabaseSettings
+from soc.database import Database
+from soc.database.challenges import Challenges
+from soc.database.models.base import BaseModel
+from soc.database.provider import DatabaseProvider
+from soc.database.unit_of_work import UnitOfWork
+
+
+@pytest.fixture()
+async def context():
+    context = Context.factory()
+    context.add_provider(DatabaseProvider)
+    context.add(SimpleNamespace(uri="sqlite+aiosqlite://"), use_as=DatabaseSettings)
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def entities(context: Context):
+    db = context.get(Database)
+    user = await db.users.create("Bob", "", "bob@beginner.codes")
+    now = datetime.utcnow()
+    challenges = [
+        await db.challenges.create(
+            f"Challenge {i}", "", now - timedelta(days=1), now + timedelta(days=1), user
+        )
+        for i in range(2)
+    ]
+    submission = await db.challenges.create_submission(
+        "code", "https://beginner.codes", "Old", challenges[0], user
+    )
+    return [*challenges, submission]
+
+
+async def change_all(context: Context, entities) -> UnitOfWork:
+    unit_of_work = context.create(UnitOfWork)
+    with unit_of_work.activate():
+        for entity in entities:
+            if hasattr(entity, "title"):
+                entity.title = "Changed"
+            else:
+                entity.description = "Changed"
+
+            await entity.sync()
+
+    return unit_of_work
+
+
+async def load_all(context: Context, entities) -> list[str]:
+    db = context.get(Database)
+    *challenges, _ = entities
+    titles = [(await db.challenges.get(challenge.id)).title for challenge in challenges]
+    (submission,) = await db.challenges.get_submissions(challenges[0].id)
+    return [*titles, submission.description]
+
+
+@pytest.mark.asyncio
+async def test_commit_writes_every_entity(context, entities):
+    unit_of_work = await change_all(context, entities)
+    assert await load_all(context, entities) == ["Challenge 0", "Challenge 1", "Old"]
+
+    await unit_of_work.commit()
+
+    assert await load_all(context, entities) == ["Changed"] * 3
+    assert not any(entity.changed for entity in entities)
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_writes_nothing(context, entities, monkeypatch):
+    async def fail(self, changes, db_session):
+        raise RuntimeError("Database unavailable")
+
+    monkeypatch.setattr(Challenges, "save_submissions", fail)
+    unit_of_work = await change_all(context, entities)
+    with pytest.raises(RuntimeError):
+        await unit_of_work.commit()
+
+    assert await load_all(context, entities) == ["Challenge 0", "Challenge 1", "Old"]
+    assert all(entity.changed for entity in entities)
@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from soc.apps.admin_api import admin_api
+from soc.apps.admin_app import admin_app
+from soc.apps.api import api_app
+from soc.apps.site import site
+from soc.config.models.authentication import AuthenticationSettings, JWTSettings
+from soc.config.models.config import DatabaseSettings
+from soc.context import create_context
+from soc.controllers.authentication import Authentication
+from soc.database import Database
+from soc.database.cursors import encode_cursor
+from soc.database.models.base import BaseModel
+
+APPS = (site, api_app, admin_app, admin_api)
+
+
+@pytest.fixture()
+async def context(tmp_path):
+    settings = AuthenticationSettings(jwt=JWTSettings(private_key="TOP SECRET KEY"))
+    create_context().add(settings, use_as=AuthenticationSettings)
+    context = create_context().branch()
+    context.add(
+        SimpleNamespace(uri=f"sqlite+aiosqlite:///{tmp_path / 'soc.db'}"),
+        use_as=DatabaseSettings,
+    )
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    yield context
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def seeded(context: Context):
+    db = context.get(Database)
+    users = [
+        await db.users.create(name, "", f"{name}@beginner.codes")
+        for name in ("Admin", "Mod", "Alice", "Bob", "Carol")
+    ]
+    admin, mod, _, bob, _ = users
+    await db.users.set_roles(admin.id, ["ADMIN"])
+    await db.users.set_roles(mod.id, ["MOD"])
+    await db.users.ban(bob.id)
+    token, _ = await context.get(Authentication).create_user_session(admin)
+    return SimpleNamespace(
+        ids=[user.id for user in users], cookies={"sessionid": token}
+    )
+
+
+@pytest.fixture()
+async def client(context: Context):
+    for app in APPS:
+        app.dependency_overrides[create_context] = lambda: context
+
+    async with httpx.AsyncClient(app=site, base_url="http://localhost") as client:
+        yield client
+
+    for app in APPS:
+        app.dependency_overrides.pop(create_context)
+
+
+async def get_pages(db: Database, limit: int, **filters) -> list[list[int]]:
+    pages, cursor = [], None
+    while True:
+        page = await db.users.get_page(cursor, limit, **filters)
+        pages.append([user.id for user in page.users])
+        if not page.next_cursor:
+            return pages
+
+        cursor = page.next_cursor
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_user(context, seeded):
+    db = context.get(Database)
+    ids = seeded.ids
+
+    assert await get_pages(db, 2) == [ids[:2], ids[2:4], ids[4:]]
+    assert await get_pages(db, 5) == [ids]
+
+
+@pytest.mark.asyncio
+async def test_pages_filter_users(context, seeded):
+    db = context.get(Database)
+    admin, mod, alice, bob, carol = seeded.ids
+
+    assert await get_pages(db, 2, banned=True) == [[bob]]
+    assert await get_pages(db, 2, banned=False) == [[admin, mod], [alice, carol]]
+    assert await get_pages(db, 2, role="MOD") == [[mod]]
+    assert await get_pages(db, 2, role="ADMIN", banned=True) == [[]]
+
+
+@pytest.mark.asyncio
+async def test_totals_are_counted_without_statistics(context, seeded):
+    db = context.get(Database)
+    first_page = await db.users.get_page(limit=1)
+    last_page = await db.users.get_page(encode_cursor(seeded.ids[-2]), limit=1)
+
+    assert first_page.total == last_page.total == 5
+    assert (await db.users.get_page(banned=False)).total == 4
+    assert (await db.users.get_page(role="ADMIN")).total == 1
+
+
+@pytest.mark.asyncio
+async def test_dashboard_filters_users(client, seeded):
+    response = await client.get(
+        "/admin/dashboard", params={"role": "MOD"}, cookies=seeded.cookies
+    )
+    assert response.status_code == 200
+    assert "Mod" in response.text
+    assert "Alice" not in response.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor("1")])
+async def test_dashboard_rejects_tampered_cursors(client, seeded, cursor):
+    response = await client.get(
+        "/admin/dashboard", params={"cursor": cursor}, cookies=seeded.cookies
+    )
+    assert response.status_code == 400
@@ -0,0 +1,359 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from bevy import Context
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from soc.apps.admin_api import admin_api
+from soc.apps.admin_app import admin_app
+from soc.apps.api import api_app
+from soc.apps.site import site
+from soc.config.models.authentication import AuthenticationSettings, JWTSettings
+from soc.config.models.config import DatabaseSettings
+from soc.config.models.votes import VoteSettings
+from soc.context import create_context
+from soc.controllers.authentication import Authentication
+from soc.database import Database
+from soc.database.challenges import Challenges
+from soc.database.models.base import BaseModel
+from soc.database.models.vote_totals import VoteTotalModel
+from soc.vote_buffer import VoteBuffer
+
+APPS = (site, api_app, admin_app, admin_api)
+
+
+@pytest.fixture()
+async def context(request, tmp_path):
+    settings = AuthenticationSettings(jwt=JWTSettings(private_key="TOP SECRET KEY"))
+    create_context().add(settings, use_as=AuthenticationSettings)
+    context = create_context().branch()
+    context.add(
+        SimpleNamespace(uri=f"sqlite+aiosqlite:///{tmp_path / 'soc.db'}"),
+        use_as=DatabaseSettings,
+    )
+    engine = context.create(AsyncEngine, cache=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+
+    write_behind = getattr(request, "param", False)
+    context.add(
+        VoteSettings(write_behind=write_behind, flush_interval=60_000),
+        use_as=VoteSettings,
+    )
+    context.create(VoteBuffer, cache=True)
+    yield context
+    await context.get(VoteBuffer).close()
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def seeded(context: Context):
+    db = context.get(Database)
+    author = await db.users.create("Author", "", "author@beginner.codes")
+    voter = await db.users.create("Voter", "", "voter@beginner.codes")
+    now = datetime.utcnow()
+    challenge = await db.challenges.create(
+        "Challenge", "", now - timedelta(days=1), now + timedelta(days=1), author
+    )
+    submission = await db.challenges.create_submission(
+        "code", "https://beginner.codes", "", challenge, author
+    )
+    token, _ = await context.get(Authentication).create_user_session(voter)
+    author_token, _ = await context.get(Authentication).create_user_session(author)
+    return SimpleNamespace(
+        author=author,
+        voter=voter,
+        challenge=challenge,
+        submission=submission,
+        headers={"Authorization": f"Bearer {token}"},
+        author_headers={"Authorization": f"Bearer {author_token}"},
+    )
+
+
+@pytest.fixture()
+async def client(context: Context):
+    for app in APPS:
+        app.dependency_overrides[create_context] = lambda: context
+
+    async with httpx.AsyncClient(app=site, base_url="http://localhost") as client:
+        yield client
+
+    for app in APPS:
+        app.dependency_overrides.pop(create_context)
+
+
+async def get_total(context: Context, challenge_id: int, user_id: int) -> int:
+    async with context.get(AsyncSession) as session:
+        return await session.scalar(
+            select(VoteTotalModel.votes).filter_by(
+                challenge_id=challenge_id, user_id=user_id
+            )
+        )
+
+
+def batch(*votes: tuple[int, str, str]) -> dict:
+    return {
+        "votes": [
+            {"submission_id": submission_id, "emoji": emoji, "op": op}
+            for submission_id, emoji, op in votes
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_adds_and_removes_votes(context, client, seeded):
+    submission_id = seeded.submission.id
+    response = await client.post(
+        "/v1/votes/batch",
+        json=batch((submission_id, "cat", "add"), (submission_id, "dog", "add")),
+        headers=seeded.headers,
+    )
+    assert response.json() == {"added": 2, "removed": 0}
+
+    response = await client.post(
+        "/v1/votes/batch",
+        json=batch((submission_id, "cat", "remove"), (submission_id, "dog", "add")),
+        headers=seeded.headers,
+    )
+    assert response.json() == {"added": 0, "removed": 1}
+
+    db = context.get(Database)
+    assert await db.challenges.get_submission_vote_counts(submission_id) == {"dog": 1}
+    assert await get_total(context, seeded.challenge.id, seeded.author.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_the_last_duplicate_operation(context, client, seeded):
+    submission_id = seeded.submission.id
+    response = await client.post(
+        "/v1/votes/batch",
+        json=batch(
+            (submission_id, "cat", "add"),
+            (submission_id, "cat", "remove"),
+            (submission_id, "cat", "add"),
+        ),
+        headers=seeded.headers,
+    )
+    assert response.json() == {"added": 1, "removed": 0}
+
+    db = context.get(Database)
+    assert await db.challenges.get_submission_vote_counts(submission_id) == {"cat": 1}
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_unknown_submissions(context, client, seeded):
+    response = await client.post(
+        "/v1/votes/batch",
+        json=batch((seeded.submission.id, "cat", "add"), (404, "cat", "add")),
+        headers=seeded.headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No such submissions [404]"
+
+    db = context.get(Database)
+    assert await db.challenges.get_submission_vote_counts(seeded.submission.id) == {}
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_self_votes(client, seeded):
+    response = await client.post(
+        "/v1/votes/batch",
+        json=batch((seeded.submission.id, "cat", "add")),
+        headers=seeded.author_headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_api_lists_voters_and_vote_counts(context, client, seeded):
+    db = context.get(Database)
+    await db.challenges.add_vote_to_submission(
+        seeded.submission.id, seeded.voter, "cat"
+    )
+
+    response = await client.get("/v1/challenges/active", headers=seeded.headers)
+    (submission,) = response.json()["challenge"]["submissions"]
+    assert submission["votes"] == {"cat": [seeded.voter.id]}
+    assert submission["vote_counts"] == {"cat": 1}
+
+    response = await client.get(
+        f"/challenges/{seeded.challenge.id}/submissions", params={"cursor": ""}
+    )
+    assert "<span>1x</span>" in response.text
+
+
+@pytest.mark.asyncio
+async def test_stale_reads_dont_change_counters(context, seeded, monkeypatch):
+    db = context.get(Database)
+    submission_id = seeded.submission.id
+    await db.challenges.add_vote_to_submission(submission_id, seeded.voter, "cat")
+
+    # Another transaction added the cat vote & removed the dog vote after they were
+    # looked up
+    async def get_stale_votes(self, keys, db_session):
+        return {(seeded.voter.id, submission_id, "dog")}
+
+    monkeypatch.setattr(Challenges, "_get_existing_votes", get_stale_votes)
+    added, removed = await db.challenges.apply_votes(
+        seeded.voter, {(submission_id, "cat"): True, (submission_id, "dog"): False}
+    )
+
+    assert (added, removed) == (0, 0)
+    assert await db.challenges.get_submission_vote_counts(submission_id) == {"cat": 1}
+    assert await get_total(context, seeded.challenge.id, seeded.author.id) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context", [True], indirect=True)
+async def test_buffer_coalesces_votes(context, seeded):
+    buffer = context.get(VoteBuffer)
+    submission_id, voter_id = seeded.submission.id, seeded.voter.id
+    buffer.add(submission_id, voter_id, "cat")
+    buffer.remove(submission_id, voter_id, "cat")
+    buffer.add(submission_id, voter_id, "dog")
+    assert buffer.get_pending(voter_id) == {
+        (submission_id, "cat"): False,
+        (submission_id, "dog"): True,
+    }
+
+    await buffer.flush()
+
+    db = context.get(Database)
+    assert buffer.get_pending(voter_id) == {}
+    assert await db.challenges.get_submission_vote_counts(submission_id) == {"dog": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context", [True], indirect=True)
+async def test_failed_flushes_keep_newer_votes(context, seeded, monkeypatch):
+    buffer = context.get(VoteBuffer)
+    submission_id, voter_id = seeded.submission.id, seeded.voter.id
+    buffer.add(submission_id, voter_id, "cat")
+
+    async def fail(self, votes):
+        buffer.remove(submission_id, voter_id, "cat")
+        raise RuntimeError("Database unavailable")
+
+    monkeypatch.setattr(Challenges, "flush_votes", fail)
+    with pytest.raises(RuntimeError):
+        await buffer.flush()
+
+    assert buffer.get_pending(voter_id) == {(submission_id, "cat"): False}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context", [True], indirect=True)
+@pytest.mark.parametrize(
+    "method, path, payload",
+    [
+        ("POST", "/v1/challenges/1/submissions/404/vote", {"emoji": "cat"}),
+        ("DELETE", "/v1/challenges/1/submissions/404/vote", {"emoji": "cat"}),
+        ("POST", "/v1/votes/batch", batch((404, "cat", "add"))),
+    ],
+)
+async def test_buffered_votes_for_unknown_submissions_are_rejected(
+    context, client, seeded, method, path, payload
+):
+    response = await client.request(method, path, json=payload, headers=seeded.headers)
+    assert response.status_code == 400
+    assert context.get(VoteBuffer).get_pending(seeded.voter.id) == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context", [True], indirect=True)
+async def test_buffered_self_votes_are_rejected(context, client, seeded):
+    response = await client.post(
+        f"/v1/challenges/1/submissions/{seeded.submission.id}/vote",
+        json={"emoji": "cat"},
+        headers=seeded.author_headers,
+    )
+    assert response.status_code == 400
+    assert context.get(VoteBuffer).get_pending(seeded.author.id) == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context", [True], indirect=True)
+async def test_buffered_votes_are_queued(context, client, seeded):
+    response = await client.post(
+        f"/v1/challenges/1/submissions/{seeded.submission.id}/vote",
+        json={"emoji": "cat"},
+        headers=seeded.headers,
+    )
+    assert response.status_code == 200
+    assert context.get(VoteBuffer).get_pending(seeded.voter.id) == {
+        (seeded.submission.id, "cat"): True
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context", [True], indirect=True)
+async def test_cancelled_flushes_keep_their_votes(context, seeded, monkeypatch):
+    buffer = context.get(VoteBuffer)
+    submission_id, voter_id = seeded.submission.id, seeded.voter.id
+    buffer.add(submission_id, voter_id, "cat")
+    flushing = asyncio.Event()
+
+    async def slow_flush(self, votes):
+        flushing.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(Challenges, "flush_votes", slow_flush)
+    task = asyncio.create_task(buffer.flush())
+    await flushing.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert buffer.get_pending(voter_id) == {(submission_id, "cat"): True}
+
+
+@pytest.mark.asyncio
+async def test_closing_waits_for_the_flush_in_progress(context, seeded, monkeypatch):
+    settings = VoteSettings(write_behind=True, flush_interval=60_000, flush_size=1)
+    buffer = context.create(VoteBuffer, settings=settings)
+    submission_id, voter_id = seeded.submission.id, seeded.voter.id
+    flushing, flushed = asyncio.Event(), []
+
+    async def slow_flush(self, votes):
+        flushing.set()
+        await asyncio.sleep(0.1)
+        flushed.append(dict(votes))
+
+    monkeypatch.setattr(Challenges, "flush_votes", slow_flush)
+    buffer.add(submission_id, voter_id, "cat")
+    await flushing.wait()
+    buffer.add(submission_id, voter_id, "dog")
+    await buffer.close()
+
+    assert flushed == [
+        {(voter_id, submission_id, "cat"): True},
+        {(voter_id, submission_id, "dog"): True},
+    ]
+    assert buffer.get_pending(voter_id) == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("context", [True], indirect=True)
+async def test_votes_are_dropped_after_repeated_failures(context, seeded, monkeypatch):
+    buffer = context.get(VoteBuffer)
+    submission_id, voter_id = seeded.submission.id, seeded.voter.id
+    buffer.add(submission_id, voter_id, "cat")
+
+    async def fail(self, votes):
+        raise RuntimeError("Database unavailable")
+
+    monkeypatch.setattr(Challenges, "flush_votes", fail)
+    for _ in range(buffer._settings.flush_retries):
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+
+        assert buffer.get_pending(voter_id) == {(submission_id, "cat"): True}
+
+    with pytest.raises(RuntimeError):
+        await buffer.flush()
+
+    assert buffer.get_pending(voter_id) == {}